@@ -1,13 +1,43 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.patches import Circle, Wedge, FancyBboxPatch, Arc
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
 from plotly.subplots import make_subplots
 import pandas as pd
 from datetime import datetime
 import io
+import os
+import sys
+import json
+import time
+import inspect
+import logging
+import tracemalloc
 import base64
+import gzip
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd export
+    zstandard = None
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    import numexpr
+except ImportError:  # optional: fused compute backend
+    numexpr = None
 
 # ============================================================================
 # PHYSICAL CONSTANTS
@@ -21,11 +51,36 @@ PARSEC = 3.086e16  # Parsec (m)
 HBAR = 1.054571817e-34  # Reduced Planck constant
 K_B = 1.380649e-23  # Boltzmann constant
 STEFAN_BOLTZMANN = 5.670374419e-8  # Stefan-Boltzmann constant
+H_PLANCK = 6.62607015e-34  # Planck constant
+PROTON_MASS = 1.67262192e-27  # Proton mass (kg)
+THOMSON_CROSS_SECTION = 6.6524587e-29  # Thomson cross section (m^2)
+
+# ============================================================================
+# PRESET SCENARIOS
+# ============================================================================
+# Slider defaults per scenario; "Custom" is what a fresh session starts on
+PRESET_SCENARIOS = {
+    "Custom": {"mass": 100.0, "distance_log": 3.0, "spin": 0.0, "velocity": 0.0},
+    "Miller's Planet (Interstellar)": {"mass": 100.0, "distance_log": 3.5, "spin": 0.998, "velocity": 0.0},
+    "Sagittarius A*": {"mass": 4.3, "distance_log": 8.0, "spin": 0.5, "velocity": 0.0},
+    "M87*": {"mass": 6500.0, "distance_log": 10.0, "spin": 0.9, "velocity": 0.0},
+    "Stellar Black Hole": {"mass": 0.01, "distance_log": 5.0, "spin": 0.7, "velocity": 0.0},
+    "Maximum Spin Test": {"mass": 100.0, "distance_log": 2.0, "spin": 0.998, "velocity": 0.0},
+}
+PRESET_THETA = np.pi/2  # Presets are evaluated in the equatorial plane
+# Sidebar slider ranges (min, max); the compute service validates against the same
+INPUT_RANGES = {
+    "mass": (0.001, 10000.0),
+    "distance_log": (-5.0, 10.0),
+    "spin": (0.0, 0.998),
+    "velocity": (0.0, 0.99),
+    "theta": (0.0, np.pi),
+}
 
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
-st.set_page_config(
+PAGE_CONFIG = dict(
     page_title="⚛️ Relativistic Spacetime Analyzer",
     page_icon="⚛️",
     layout="wide",
@@ -35,7 +90,7 @@ st.set_page_config(
 # ============================================================================
 # CUSTOM CSS - ULTIMATE CYBERPUNK DARK MODE
 # ============================================================================
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Share+Tech+Mono&display=swap');
     
@@ -319,54 +374,440 @@ st.markdown("""
         letter-spacing: 3px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def apply_page_style():
+    """Set page config and inject the theme (must run on every full rerun)"""
+    st.set_page_config(**PAGE_CONFIG)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# ============================================================================
+# COMPUTE BACKENDS
+# ============================================================================
+# Physics kernels are elementwise over their broadcast inputs, so splitting
+# a grid into pieces gives the same bits; backends differ only in scheduling.
+BACKEND_CHUNK_SIZE = 16_384  # elements per task: one float64 operand (128 KiB) stays in L2
+BACKEND_THREADS = int(os.environ.get("SPACETIME_THREADS", 0)) or os.cpu_count() or 1
+BACKEND_THREAD_PREFIX = "spacetime-backend"
+
+def fusable(expression):
+    """Attach an equivalent numexpr expression to an elementwise kernel"""
+    def decorate(kernel):
+        kernel.expression = expression
+        return kernel
+    return decorate
+
+@st.cache_resource(show_spinner=False)
+def get_backend_pool(threads):
+    """Process-wide worker pool shared by every session"""
+    return ThreadPoolExecutor(max_workers=threads, thread_name_prefix=BACKEND_THREAD_PREFIX)
+
+def on_backend_thread():
+    """True on a worker of the shared pool"""
+    return threading.current_thread().name.startswith(BACKEND_THREAD_PREFIX)
+
+def backend_map(function, items, threads=BACKEND_THREADS):
+    """list(map(function, items)) on the shared pool
+    
+    Runs inline when called from one of the pool's own workers: waiting on
+    the pool from inside it can deadlock once every worker is waiting.
+    """
+    if on_backend_thread():
+        return list(map(function, items))
+    return list(get_backend_pool(threads).map(function, items))
+
+def merge_chunks(chunks, lengths, shape):
+    """Reassemble per-chunk kernel results (arrays or dicts of arrays) into the grid shape"""
+    if isinstance(chunks[0], dict):
+        return {key: merge_chunks([chunk[key] for chunk in chunks], lengths, shape) for key in chunks[0]}
+    return np.concatenate([np.broadcast_to(chunk, (n,)) for chunk, n in zip(chunks, lengths)]).reshape(shape)
+
+class NumpyBackend:
+    """Plain NumPy on the calling thread"""
+    name = "numpy"
+    
+    def map(self, kernel, *args):
+        """kernel(*args) for an elementwise kernel"""
+        return kernel(*args)
+
+class ThreadedBackend(NumpyBackend):
+    """Cache-sized chunks of the flattened inputs on a shared thread pool
+    
+    NumPy ufuncs release the GIL, so the chunks run in parallel. Small
+    grids, and calls made from inside a worker, run inline.
+    """
+    name = "threaded"
+    
+    def __init__(self, threads=BACKEND_THREADS, chunk_size=BACKEND_CHUNK_SIZE):
+        self.threads = threads
+        self.chunk_size = chunk_size
+    
+    def map(self, kernel, *args):
+        arrays = np.broadcast_arrays(*args)
+        shape = arrays[0].shape
+        size = int(np.prod(shape))
+        if size < 2 * self.chunk_size or self.threads < 2 or on_backend_thread():
+            return kernel(*args)
+        flat = [array.reshape(-1) for array in arrays]
+        starts = range(0, size, self.chunk_size)
+        chunks = backend_map(lambda start: kernel(*(column[start:start + self.chunk_size] for column in flat)),
+                             starts, self.threads)
+        return merge_chunks(chunks, [min(self.chunk_size, size - start) for start in starts], shape)
+
+class NumexprBackend(ThreadedBackend):
+    """Fused single-pass evaluation of kernels that carry a numexpr expression
+    
+    numexpr streams blocks through its own threads without full-size
+    temporaries. Kernels without an expression fall back to threaded NumPy.
+    Transcendentals come from a different math library, so fused results
+    agree to rounding rather than bit for bit.
+    """
+    name = "numexpr"
+    
+    def map(self, kernel, *args):
+        expression = getattr(kernel, "expression", None)
+        if expression is None:
+            return super().map(kernel, *args)
+        bound = inspect.signature(kernel).bind(*args)
+        bound.apply_defaults()
+        return numexpr.evaluate(expression, local_dict={name: np.asarray(value)
+                                                        for name, value in bound.arguments.items()})
+
+BACKENDS = {"numpy": NumpyBackend(), "threaded": ThreadedBackend()}
+if numexpr is not None:
+    BACKENDS["numexpr"] = NumexprBackend()
+# Sessions start on SPACETIME_BACKEND; the sidebar can switch per session
+DEFAULT_BACKEND = os.environ.get("SPACETIME_BACKEND", "numpy")
+if DEFAULT_BACKEND not in BACKENDS:
+    DEFAULT_BACKEND = "numpy"
+
+def get_backend(name=None):
+    """Backend by name, falling back to the configured default"""
+    return BACKENDS.get(name or DEFAULT_BACKEND, BACKENDS[DEFAULT_BACKEND])
+
+# ============================================================================
+# KERR OBSERVERS
+# ============================================================================
+# Observer types whose clock rate total_dilation reports
+OBSERVER_TYPES = {
+    "static": "Static (hovering)",
+    "zamo": "ZAMO (zero angular momentum)",
+    "prograde": "Prograde circular orbit",
+    "retrograde": "Retrograde circular orbit",
+}
+ORBITING_OBSERVERS = ("prograde", "retrograde")
+
+@fusable("where(x**2 - 2*x + a**2 > 0, sqrt(where(1 - 2*x / (x**2 + (a*cos(theta))**2) > 0, "
+         "1 - 2*x / (x**2 + (a*cos(theta))**2), 0)), 0)")
+def kerr_static_dilation(x, a, theta=np.pi/2):
+    """dτ/dt of a static observer, radii in units of r_g; 0 inside the ergoregion"""
+    delta = x**2 - 2*x + a**2
+    sigma = x**2 + (a * np.cos(theta))**2
+    return np.where(delta > 0, np.sqrt(np.maximum(1 - 2*x / sigma, 0)), 0.0)
+
+@fusable("sqrt(where(x**2 - 2*x + a**2 > 0, x**2 - 2*x + a**2, 0) * (x**2 + (a*cos(theta))**2)"
+         " / ((x**2 + a**2)**2 - a**2 * (x**2 - 2*x + a**2) * sin(theta)**2))")
+def kerr_zamo_dilation(x, a, theta=np.pi/2):
+    """ZAMO lapse α = √(ΔΣ/A), radii in units of r_g; 0 at and inside the horizon"""
+    delta = x**2 - 2*x + a**2
+    sigma = x**2 + (a * np.cos(theta))**2
+    big_a = (x**2 + a**2)**2 - a**2 * delta * np.sin(theta)**2
+    return np.sqrt(np.maximum(delta, 0) * sigma / big_a)
+
+@fusable("where(x**1.5 - 3*x**0.5 + 2*where(prograde, a, -a) > 0, x**0.75 * "
+         "sqrt(x**1.5 - 3*x**0.5 + 2*where(prograde, a, -a)) / (x**1.5 + where(prograde, a, -a)), 0)")
+def kerr_circular_orbit_dilation(x, a, prograde=True):
+    """dτ/dt on an equatorial circular geodesic (Bardeen, Press & Teukolsky 1972)
+    
+    Radii in units of r_g. Zero where no timelike circular orbit exists
+    (inside the photon orbit for that direction).
+    """
+    s = np.where(prograde, a, -np.asarray(a))
+    energy_term = x**1.5 - 3 * x**0.5 + 2 * s
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = x**0.75 * np.sqrt(np.maximum(energy_term, 0)) / (x**1.5 + s)
+    return np.where(energy_term > 0, rate, 0.0)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def observer_dilation_curves(spin, theta, x_max=100.0, n_radii=600, backend=None):
+    """dτ/dt of every observer type on a log-spaced radius grid (units of r_g)
+    
+    Mass independent. Starts just outside the outer horizon; orbiting
+    observers are equatorial whatever θ is.
+    """
+    x = np.geomspace((1 + np.sqrt(1 - spin**2)) * (1 + 1e-6), x_max, n_radii)
+    compute = get_backend(backend)
+    return x, {
+        "static": compute.map(kerr_static_dilation, x, spin, theta),
+        "zamo": compute.map(kerr_zamo_dilation, x, spin, theta),
+        "prograde": compute.map(kerr_circular_orbit_dilation, x, spin, True),
+        "retrograde": compute.map(kerr_circular_orbit_dilation, x, spin, False),
+    }
+
+# ============================================================================
+# HORIZON TABLES
+# ============================================================================
+# Dimensionless cumulative integrals from the outer horizon, equatorial Kerr:
+# proper radial distance ∫√(g_rr) dr and the proper time of a radial free fall
+# from rest at infinity (E = 1, L = 0). Rows are spins, uniform in √(1 - a²);
+# columns are u = ln(x - x₊) with x = r/r_g. The tables hold the excess over
+# the flat-space growth so they interpolate well at any radius.
+TABLE_DIR = os.environ.get("SPACETIME_TABLE_DIR", os.path.join(tempfile.gettempdir(), "spacetime_tables"))
+HORIZON_TABLE_VERSION = 1
+HORIZON_TABLE_SPINS = 129
+HORIZON_TABLE_U = (np.log(1e-12), np.log(1e6))
+HORIZON_TABLE_POINTS = 4096
+HORIZON_TABLE_MIN_ROOT = np.sqrt(1 - 0.998**2)  # √(1 - a²) at the top of the spin range
+
+def cumulative_simpson(f, h):
+    """Running integral of samples f on a uniform grid of spacing h (last axis, starts at 0)
+    
+    Simpson's rule over node pairs; the odd nodes use the matching
+    quadratic interpolant. Needs an odd number of samples.
+    """
+    cumulative = np.zeros_like(f)
+    cumulative[..., 2::2] = np.cumsum(h / 3 * (f[..., :-2:2] + 4 * f[..., 1:-1:2] + f[..., 2::2]), axis=-1)
+    cumulative[..., 1::2] = (cumulative[..., :-1:2]
+                             + h / 12 * (5 * f[..., :-1:2] + 8 * f[..., 1::2] - f[..., 2::2]))
+    return cumulative
+
+def horizon_table_grid():
+    """Spin roots √(1 - a²) and u nodes of the horizon tables"""
+    roots = np.linspace(HORIZON_TABLE_MIN_ROOT, 1.0, HORIZON_TABLE_SPINS)
+    u = np.linspace(*HORIZON_TABLE_U, HORIZON_TABLE_POINTS + 1)
+    return roots, u
+
+def build_horizon_tables():
+    """Excess proper distance and excess free-fall time, shape (2, spins, points)"""
+    roots, u = horizon_table_grid()
+    x_plus, x_minus = 1 + roots[:, None], 1 - roots[:, None]
+    a2 = 1 - roots[:, None]**2
+    offset = np.exp(u)
+    x = x_plus + offset
+    # dl/du = x e^u/√Δ = x e^(u/2)/√(x - x₋); dτ/du = e^u x^(3/2)/√(2(x² + a²))
+    distance = x * np.sqrt(offset) / np.sqrt(x - x_minus) - offset
+    fall = offset * (x**1.5 / np.sqrt(2 * (x**2 + a2)) - np.sqrt(x / 2))
+    h = u[1] - u[0]
+    # Analytic start at u₀: L ≈ 2x₊√(x - x₊)/√(x₊ - x₋), τ ≈ (x₊/2)(x - x₊)
+    start_distance = 2 * x_plus * np.sqrt(offset[0]) / np.sqrt(x_plus - x_minus) - offset[0]
+    start_fall = x_plus / 2 * offset[0] - np.sqrt(2) / 3 * (x[:, :1]**1.5 - x_plus**1.5)
+    return np.stack([start_distance + cumulative_simpson(distance, h),
+                     start_fall + cumulative_simpson(fall, h)])
+
+@st.cache_resource(show_spinner=False)
+def horizon_tables():
+    """The horizon tables memory-mapped from TABLE_DIR, built and saved on first use
+    
+    Every process maps the same file, so the pages are shared. If the
+    directory is not writable the tables are built in memory instead.
+    """
+    path = os.path.join(TABLE_DIR, f"horizon_v{HORIZON_TABLE_VERSION}_"
+                                   f"{HORIZON_TABLE_SPINS}x{HORIZON_TABLE_POINTS + 1}.npy")
+    try:
+        if not os.path.exists(path):
+            os.makedirs(TABLE_DIR, exist_ok=True)
+            # Write then rename so concurrent processes never map a partial file
+            fd, partial = tempfile.mkstemp(dir=TABLE_DIR, suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, build_horizon_tables())
+            os.chmod(partial, 0o644)
+            os.replace(partial, path)
+        return np.load(path, mmap_mode="r")
+    except OSError:
+        tables = build_horizon_tables()
+        tables.flags.writeable = False
+        return tables
+
+def horizon_table_lookup(x, a, kind):
+    """Bilinear lookup of table kind (0 distance, 1 free fall) at radii x (units of r_g)
+    
+    Returns the excess at u clipped to the table, with x₊, x₋ and u.
+    """
+    table = horizon_tables()[kind]
+    roots, u_nodes = horizon_table_grid()
+    root = np.sqrt(1 - np.minimum(np.asarray(a, dtype=float), 0.998)**2)
+    x_plus, x_minus = 1 + root, 1 - root
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = np.log(np.asarray(x, dtype=float) - x_plus)
+    spin_index = np.clip((root - roots[0]) / (roots[1] - roots[0]), 0, len(roots) - 1)
+    u_index = np.clip(np.nan_to_num((u - u_nodes[0]) / (u_nodes[1] - u_nodes[0]), nan=0.0), 0, len(u_nodes) - 1)
+    j = np.minimum(spin_index.astype(int), len(roots) - 2)
+    k = np.minimum(u_index.astype(int), len(u_nodes) - 2)
+    wj, wk = spin_index - j, u_index - k
+    excess = ((1 - wj) * ((1 - wk) * table[j, k] + wk * table[j, k + 1])
+              + wj * ((1 - wk) * table[j + 1, k] + wk * table[j + 1, k + 1]))
+    return excess, x_plus, x_minus, u
+
+def proper_horizon_distance(x, a):
+    """Proper radial distance (units of r_g) from radius x down to the outer horizon, equatorial"""
+    x = np.asarray(x, dtype=float)
+    excess, x_plus, x_minus, u = horizon_table_lookup(x, a, 0)
+    u_min, u_max = HORIZON_TABLE_U
+    x_max = x_plus + np.exp(u_max)
+    a2 = np.asarray(a, dtype=float)**2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inner = 2 * x_plus * np.sqrt(np.maximum(x - x_plus, 0)) / np.sqrt(x_plus - x_minus)
+        # Far away dl/dx = 1 + 1/x + (3 - a²)/(2x²) + O(x⁻³)
+        outer = (excess + (x_max - x_plus) + (x - x_max) + np.log(x / x_max)
+                 + (3 - a2) / 2 * (1 / x_max - 1 / x))
+    return np.where(x <= x_plus, 0.0,
+                    np.where(u < u_min, inner, np.where(u > u_max, outer, excess + (x - x_plus))))
+
+def infall_proper_time(x, a):
+    """Proper time (units of r_g/c) to fall from radius x to the outer horizon, from rest at infinity"""
+    x = np.asarray(x, dtype=float)
+    excess, x_plus, _, u = horizon_table_lookup(x, a, 1)
+    u_min, u_max = HORIZON_TABLE_U
+    x_max = x_plus + np.exp(u_max)
+    a2 = np.asarray(a, dtype=float)**2
+    flat = lambda x_end: np.sqrt(2) / 3 * (x_end**1.5 - x_plus**1.5)
+    with np.errstate(invalid='ignore'):
+        inner = x_plus / 2 * np.maximum(x - x_plus, 0)
+        # Far away dτ/dx = √(x/2) - a²/(2√2) x^(-3/2) + O(x^(-7/2))
+        outer = excess + flat(x) + a2 / np.sqrt(2) * (1 / np.sqrt(x) - 1 / np.sqrt(x_max))
+    return np.where(x <= x_plus, 0.0,
+                    np.where(u < u_min, inner, np.where(u > u_max, outer, excess + flat(x))))
 
 # ============================================================================
 # RELATIVISTIC CALCULATOR CLASS
 # ============================================================================
+def as_output(value):
+    """Unwrap 0-d arrays so scalar inputs keep giving scalar outputs"""
+    value = np.asarray(value)
+    return value[()] if value.ndim == 0 else value
+
 class RelativisticCalculator:
-    def __init__(self, mass_multiplier, distance_offset_log, spin_param=0, observer_velocity=0, theta=np.pi/2):
-        self.M = mass_multiplier * 1e6 * SOLAR_MASS
-        self.a = spin_param  # Dimensionless spin parameter (0 to 0.998)
-        self.v_obs = observer_velocity * C
+    """Lazy, memoized evaluation of the dependency graph below
+    
+    Every quantity is computed on first access and cached on the instance.
+    set_inputs() invalidates only the nodes downstream of the changed inputs.
+    Inputs may be scalars or broadcastable NumPy arrays (batch mode).
+    """
+    INPUTS = ("mass_multiplier", "distance_offset_log", "spin_param", "observer_velocity", "theta",
+              "observer_type")
+    
+    # node: (method, dependencies)
+    GRAPH = {
+        "M": ("calc_mass", ("mass_multiplier",)),
+        "a": ("calc_spin", ("spin_param",)),
+        "v_obs": ("calc_observer_velocity", ("observer_velocity",)),
+        "Rs": ("calc_schwarzschild_radius", ("M",)),
+        "r_g": ("calc_gravitational_radius", ("M",)),
+        "a_kerr": ("calc_kerr_spin_length", ("a", "r_g")),
+        "r_isco": ("calculate_isco", ("a", "r_g")),
+        "r_photon": ("calculate_photon_sphere", ("a", "r_g")),
+        "r_ergosphere": ("calculate_ergosphere", ("a", "r_g", "theta")),
+        "r": ("calc_distance", ("Rs", "distance_offset_log")),
+        "Sigma": ("calc_sigma", ("r", "a_kerr", "theta")),
+        "Delta": ("calc_delta", ("r", "Rs", "a_kerr")),
+        "rho": ("calc_rho", ("Sigma",)),
+        "gravitational_dilation": ("calc_gravitational_dilation", ("r", "Rs")),
+        "kerr_time_dilation": ("calc_kerr_time_dilation", ("Delta", "Sigma", "Rs", "r")),
+        "frame_dragging": ("calc_frame_dragging", ("a_kerr", "M", "r")),
+        "zamo_dilation": ("calc_zamo_dilation", ("r", "r_g", "a", "theta")),
+        "prograde_orbit_dilation": ("calc_prograde_orbit_dilation", ("r", "r_g", "a")),
+        "retrograde_orbit_dilation": ("calc_retrograde_orbit_dilation", ("r", "r_g", "a")),
+        "doppler_shift": ("calc_doppler_effect", ("v_obs",)),
+        "total_dilation": ("calc_total_dilation", ("observer_type", "kerr_time_dilation", "zamo_dilation",
+                                                   "prograde_orbit_dilation", "retrograde_orbit_dilation",
+                                                   "doppler_shift")),
+        "tidal_force": ("calc_tidal_forces", ("M", "r")),
+        "escape_velocity": ("calc_escape_velocity", ("M", "r")),
+        "proper_horizon_distance": ("calc_proper_horizon_distance", ("r", "r_g", "a")),
+        "infall_proper_time": ("calc_infall_proper_time", ("r", "r_g", "a")),
+        "orbital_velocity": ("calc_orbital_velocity", ("M", "r")),
+        "hawking_temp": ("calc_hawking_temperature", ("M",)),
+        "bekenstein_hawking_entropy": ("calc_bekenstein_entropy", ("Rs", "a")),
+        "gravitational_redshift": ("calc_gravitational_redshift", ("gravitational_dilation",)),
+        "geodesic_precession": ("calc_geodesic_precession", ("M", "r")),
+        "kretschmann_scalar": ("calc_kretschmann_scalar", ("M", "r")),
+        "luminosity": ("calc_luminosity", ("Rs", "hawking_temp")),
+    }
+    
+    # Physical results (everything except the intermediate metric functions)
+    OUTPUTS = (
+        "Rs", "r_isco", "r_photon", "r_ergosphere", "r",
+        "gravitational_dilation", "kerr_time_dilation", "zamo_dilation", "prograde_orbit_dilation",
+        "retrograde_orbit_dilation", "frame_dragging", "doppler_shift", "total_dilation", "tidal_force", "escape_velocity", "orbital_velocity",
+        "proper_horizon_distance", "infall_proper_time",
+        "hawking_temp", "bekenstein_hawking_entropy", "gravitational_redshift",
+        "geodesic_precession", "kretschmann_scalar", "luminosity",
+    )
+    
+    def __init__(self, mass_multiplier, distance_offset_log, spin_param=0, observer_velocity=0, theta=np.pi/2,
+                 observer_type="static"):
+        self.mass_multiplier = mass_multiplier
+        self.distance_offset_log = distance_offset_log
+        self.spin_param = spin_param  # Dimensionless spin parameter (0 to 0.998)
+        self.observer_velocity = observer_velocity  # Fraction of c
         self.theta = theta  # Polar angle for Kerr metric
-        
-        # Schwarzschild radius
-        self.Rs = (2 * G * self.M) / (C**2)
-        
-        # Kerr metric parameters
-        self.r_g = G * self.M / (C**2)
-        self.a_kerr = self.a * self.r_g  # Spin parameter in meters
-        
-        # Critical radii
-        self.r_isco = self.calculate_isco()
-        self.r_photon = self.calculate_photon_sphere()
-        self.r_ergosphere = self.calculate_ergosphere()
-        
-        # Distance from center
-        self.r = self.Rs + (10**distance_offset_log)
-        
-        # Kerr metric functions
-        self.Sigma = self.r**2 + (self.a_kerr * np.cos(self.theta))**2
-        self.Delta = self.r**2 - self.Rs * self.r + self.a_kerr**2
-        self.rho = np.sqrt(self.Sigma)
-        
-        # Calculate all effects
-        self.gravitational_dilation = self.calc_gravitational_dilation()
-        self.kerr_time_dilation = self.calc_kerr_time_dilation()
-        self.frame_dragging = self.calc_frame_dragging()
-        self.doppler_shift = self.calc_doppler_effect()
-        self.total_dilation = self.calc_total_dilation()
-        self.tidal_force = self.calc_tidal_forces()
-        self.escape_velocity = self.calc_escape_velocity()
-        self.orbital_velocity = self.calc_orbital_velocity()
-        self.hawking_temp = self.calc_hawking_temperature()
-        self.bekenstein_hawking_entropy = self.calc_bekenstein_entropy()
-        self.gravitational_redshift = self.calc_gravitational_redshift()
-        self.geodesic_precession = self.calc_geodesic_precession()
-        self.kretschmann_scalar = self.calc_kretschmann_scalar()
-        self.luminosity = self.calc_luminosity()
-        
+        self.observer_type = observer_type  # Key of OBSERVER_TYPES (or an array of keys)
+    
+    def __getattr__(self, name):
+        # Only reached when the node is not cached in __dict__ yet
+        node = type(self).GRAPH.get(name)
+        if node is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        value = getattr(self, node[0])()
+        self.__dict__[name] = value
+        return value
+    
+    @classmethod
+    def dependents(cls, names):
+        """All nodes downstream of the given inputs/nodes"""
+        children = {}
+        for node, (_, deps) in cls.GRAPH.items():
+            for dep in deps:
+                children.setdefault(dep, []).append(node)
+        stale, stack = set(), list(names)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in stale:
+                    stale.add(child)
+                    stack.append(child)
+        return stale
+    
+    def set_inputs(self, **inputs):
+        """Change inputs and invalidate only the affected nodes"""
+        changed = []
+        for name, value in inputs.items():
+            if name not in self.INPUTS:
+                raise TypeError(f"Unknown calculator input: {name!r}")
+            if not np.array_equal(getattr(self, name), value):
+                setattr(self, name, value)
+                changed.append(name)
+        for node in self.dependents(changed):
+            self.__dict__.pop(node, None)
+        return changed
+    
+    def evaluate(self, names=None):
+        """Dict of the requested nodes (default: all OUTPUTS)"""
+        return {name: getattr(self, name) for name in (names or self.OUTPUTS)}
+    
+    def calc_mass(self):
+        """Black hole mass in kg"""
+        return as_output(np.multiply(self.mass_multiplier, 1e6) * SOLAR_MASS)
+    
+    def calc_spin(self):
+        """Dimensionless spin parameter"""
+        return as_output(self.spin_param)
+    
+    def calc_observer_velocity(self):
+        """Observer velocity in m/s"""
+        return as_output(np.multiply(self.observer_velocity, C))
+    
+    def calc_schwarzschild_radius(self):
+        """Schwarzschild radius"""
+        return (2 * G * self.M) / (C**2)
+    
+    def calc_gravitational_radius(self):
+        """Gravitational radius GM/c²"""
+        return G * self.M / (C**2)
+    
+    def calc_kerr_spin_length(self):
+        """Spin parameter in meters"""
+        return self.a * self.r_g
+    
     def calculate_isco(self):
         """Calculate ISCO for Kerr black hole (prograde orbit)"""
         a = self.a
@@ -383,20 +824,55 @@ class RelativisticCalculator:
         """Calculate ergosphere radius at given theta"""
         return self.r_g * (1 + np.sqrt(1 - self.a**2 * np.cos(self.theta)**2))
     
+    def calc_distance(self):
+        """Distance from center"""
+        if np.ndim(self.distance_offset_log) == 0:
+            # Python's pow, as in the scalar original (NumPy's differs by 1 ulp on some inputs)
+            return self.Rs + 10**float(self.distance_offset_log)
+        return self.Rs + (10**np.asarray(self.distance_offset_log, dtype=float))
+    
+    def calc_sigma(self):
+        """Kerr Σ = r² + a²cos²θ"""
+        return self.r**2 + (self.a_kerr * np.cos(self.theta))**2
+    
+    def calc_delta(self):
+        """Kerr Δ = r² - Rs·r + a²"""
+        return self.r**2 - self.Rs * self.r + self.a_kerr**2
+    
+    def calc_rho(self):
+        """Kerr ρ = √Σ"""
+        return np.sqrt(self.Sigma)
+    
     def calc_gravitational_dilation(self):
         """Schwarzschild time dilation"""
-        if self.r <= self.Rs:
-            return 0
-        return np.sqrt(1 - (self.Rs / self.r))
+        # Clipping gives 0 at and inside the horizon
+        return np.sqrt(np.maximum(1 - (self.Rs / self.r), 0))
     
     def calc_kerr_time_dilation(self):
         """Full Kerr metric time dilation"""
-        if self.Delta <= 0:
-            return 0
-        g_tt = -(1 - self.Rs * self.r / self.Sigma)
-        if g_tt >= 0:
-            return 0
-        return np.sqrt(-g_tt)
+        # Zero inside the horizon (Δ <= 0) or the ergoregion (g_tt >= 0)
+        minus_g_tt = 1 - self.Rs * self.r / self.Sigma
+        return as_output(np.where(self.Delta > 0, np.sqrt(np.maximum(minus_g_tt, 0)), 0.0))
+    
+    def calc_zamo_dilation(self):
+        """Zero-angular-momentum observer time dilation (the lapse)"""
+        return as_output(kerr_zamo_dilation(self.r / self.r_g, self.a, self.theta))
+    
+    def calc_prograde_orbit_dilation(self):
+        """Time dilation on a prograde equatorial circular orbit"""
+        return as_output(kerr_circular_orbit_dilation(self.r / self.r_g, self.a, True))
+    
+    def calc_retrograde_orbit_dilation(self):
+        """Time dilation on a retrograde equatorial circular orbit"""
+        return as_output(kerr_circular_orbit_dilation(self.r / self.r_g, self.a, False))
+    
+    def calc_proper_horizon_distance(self):
+        """Proper radial distance down to the outer horizon (equatorial)"""
+        return as_output(proper_horizon_distance(self.r / self.r_g, self.a) * self.r_g)
+    
+    def calc_infall_proper_time(self):
+        """Proper time of a free fall from rest at infinity, from r to the outer horizon"""
+        return as_output(infall_proper_time(self.r / self.r_g, self.a) * self.r_g / C)
     
     def calc_frame_dragging(self):
         """Frame dragging angular velocity (Lense-Thirring effect)"""
@@ -405,16 +881,29 @@ class RelativisticCalculator:
     
     def calc_doppler_effect(self):
         """Special relativistic time dilation"""
-        if self.v_obs >= C:
-            return 0
-        gamma = 1 / np.sqrt(1 - (self.v_obs / C)**2)
+        # 1/γ, 0 for v >= c; the double reciprocal keeps scalars bit-identical to the original
+        with np.errstate(divide='ignore'):
+            gamma = 1 / np.sqrt(np.maximum(1 - (self.v_obs / C)**2, 0))
         return 1 / gamma
     
     def calc_total_dilation(self):
-        """Combined gravitational and kinematic dilation"""
-        if self.kerr_time_dilation == 0:
-            return 0
-        return self.kerr_time_dilation * self.doppler_shift
+        """Clock rate of the selected observer type relative to infinity"""
+        # Static observers and ZAMOs move at v_obs through their local frame
+        # (exactly so for the ZAMO's orthonormal frame); an orbit fixes its own velocity
+        rates = {
+            "static": lambda: self.kerr_time_dilation * self.doppler_shift,
+            "zamo": lambda: self.zamo_dilation * self.doppler_shift,
+            "prograde": lambda: self.prograde_orbit_dilation,
+            "retrograde": lambda: self.retrograde_orbit_dilation,
+        }
+        kinds = np.asarray(self.observer_type)
+        present = np.unique(kinds).tolist()
+        unknown = set(present) - set(OBSERVER_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown observer type: {sorted(unknown)}")
+        if kinds.ndim == 0:
+            return rates[present[0]]()
+        return as_output(np.select([kinds == kind for kind in present], [rates[kind]() for kind in present]))
     
     def calc_tidal_forces(self):
         """Tidal acceleration gradient"""
@@ -423,12 +912,12 @@ class RelativisticCalculator:
     def calc_escape_velocity(self):
         """Escape velocity at distance r"""
         v_esc = np.sqrt(2 * G * self.M / self.r)
-        return min(v_esc / C, 1.0)
+        return np.minimum(v_esc / C, 1.0)
     
     def calc_orbital_velocity(self):
         """Circular orbital velocity"""
         v_orb = np.sqrt(G * self.M / self.r)
-        return min(v_orb / C, 1.0)
+        return np.minimum(v_orb / C, 1.0)
     
     def calc_hawking_temperature(self):
         """Hawking temperature"""
@@ -441,9 +930,10 @@ class RelativisticCalculator:
     
     def calc_gravitational_redshift(self):
         """Gravitational redshift factor"""
-        if self.gravitational_dilation == 0:
-            return float('inf')
-        return 1 / self.gravitational_dilation - 1
+        # Infinite at the horizon, where the dilation factor is 0
+        dilation = np.asarray(self.gravitational_dilation, dtype=float)
+        inverse = np.divide(1, dilation, out=np.full_like(dilation, np.inf), where=dilation > 0)
+        return as_output(inverse - 1)
     
     def calc_geodesic_precession(self):
         """Geodesic precession rate"""
@@ -460,196 +950,1476 @@ class RelativisticCalculator:
     
     def calc_energy_extraction_efficiency(self):
         """Penrose process efficiency"""
-        if self.a == 0:
-            return 0.0
         return (1 - np.sqrt(1 - self.a**2)) * 100
     
     def calc_orbital_frequency(self):
         """Orbital frequency in Hz"""
-        if self.orbital_velocity == 0:
-            return 0
         return (self.orbital_velocity * C) / (2 * np.pi * self.r)
     
     def calc_specific_angular_momentum(self):
         """Specific angular momentum for circular orbit"""
         return self.r * self.orbital_velocity * C
 
+def evaluate_batch(mass, distance_log, spin, velocity, theta, observer_type="static", names=None, backend=None):
+    """calc.evaluate(names) over broadcastable input grids, scheduled by a compute backend
+    
+    Every output is broadcast to the full grid shape whichever backend runs it.
+    """
+    def kernel(*inputs):
+        return RelativisticCalculator(*inputs).evaluate(names)
+    shape = np.broadcast(mass, distance_log, spin, velocity, theta, observer_type).shape
+    evaluated = get_backend(backend).map(kernel, mass, distance_log, spin, velocity, theta, observer_type)
+    return {name: np.broadcast_to(value, shape) for name, value in evaluated.items()}
+
+# ============================================================================
+# ACCRETION DISK (NOVIKOV-THORNE)
+# ============================================================================
+def novikov_thorne_flux_shape(x, a, x0):
+    """Dimensionless Page-Thorne flux f(x), x = sqrt(r/r_g), zero at the ISCO"""
+    # The x2 root and its coefficient both vanish as a -> 0; the limit is finite
+    a = np.clip(a, 1e-9, 0.9999)
+    phi = np.arccos(a)
+    x1 = 2 * np.cos((phi - np.pi) / 3)
+    x2 = 2 * np.cos((phi + np.pi) / 3)
+    x3 = -2 * np.cos(phi / 3)
+    bracket = x - x0 - 1.5 * a * np.log(x / x0)
+    for xi, xj, xk in ((x1, x2, x3), (x2, x1, x3), (x3, x1, x2)):
+        coeff = 3 * (xi - a)**2 / (xi * (xi - xj) * (xi - xk))
+        bracket = bracket - coeff * np.log((x - xi) / (x0 - xi))
+    return np.maximum(bracket, 0) / (x**4 * (x**3 - 3*x + 2*a))
+
+def disk_accretion_rate(M, x0, eddington_ratio):
+    """Mass accretion rate (kg/s) for a given fraction of the Eddington luminosity"""
+    L_edd = 4 * np.pi * G * M * PROTON_MASS * C / THOMSON_CROSS_SECTION
+    efficiency = 1 - np.sqrt(1 - 2 / (3 * x0**2))  # 1 - E_ISCO
+    return eddington_ratio * L_edd / (efficiency * C**2)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def disk_radial_profile(mass, spin, eddington_ratio=0.1, n_radii=400, r_out_rg=1e4):
+    """Radial grid (m), flux (W/m²) and temperature (K) from the ISCO outward"""
+    calc = RelativisticCalculator(mass, 0, spin)
+    x0 = np.sqrt(calc.r_isco / calc.r_g)
+    r = np.geomspace(calc.r_isco, r_out_rg * calc.r_g, n_radii)
+    x = np.sqrt(r / calc.r_g)
+    mdot = disk_accretion_rate(calc.M, x0, eddington_ratio)
+    flux = 3 * mdot * C**6 / (8 * np.pi * G**2 * calc.M**2) * novikov_thorne_flux_shape(x, spin, x0)
+    temperature = (flux / STEFAN_BOLTZMANN)**0.25
+    return r, flux, temperature
+
+def disk_spectrum(mass, spin, nu, eddington_ratio=0.1):
+    """Multi-temperature blackbody L_ν (W/Hz) over an array of frequencies"""
+    r, _, temperature = disk_radial_profile(mass, spin, eddington_ratio)
+    # Trapezoid weights in ln r: L_ν = 4π² ∫ B_ν(T(r)) r² d(ln r), both faces
+    dlnr = np.diff(np.log(r))
+    weights = np.zeros_like(r)
+    weights[:-1] += dlnr / 2
+    weights[1:] += dlnr / 2
+    nu = np.asarray(nu, dtype=float)
+    with np.errstate(divide='ignore', over='ignore'):
+        exponent = H_PLANCK * nu[..., None] / (K_B * temperature)
+        planck = 2 * H_PLANCK * nu[..., None]**3 / C**2 / np.expm1(exponent)
+    return 4 * np.pi**2 * (planck @ (r**2 * weights))
+
+def disk_ring_radii(mass, spin, n_rings=8):
+    """Radii enclosing equal luminosity fractions, with relative local flux"""
+    r, flux, _ = disk_radial_profile(mass, spin)
+    dL = flux * r**2  # dL/d(ln r) up to constants
+    cumulative = np.concatenate([[0], np.cumsum((dL[1:] + dL[:-1]) / 2 * np.diff(np.log(r)))])
+    fractions = np.arange(1, n_rings + 1) / (n_rings + 2)
+    radii = np.interp(fractions * cumulative[-1], cumulative, r)
+    return radii, np.interp(radii, r, flux) / flux.max()
+
+# ============================================================================
+# GRAVITATIONAL WAVES (INSPIRAL)
+# ============================================================================
+def chirp_mass(m1, m2):
+    """Chirp mass of a binary (same units as the inputs)"""
+    return (m1 * m2)**0.6 / (m1 + m2)**0.2
+
+def kerr_gw_frequency(M, a, r):
+    """GW frequency (2× prograde Kerr orbital frequency) at radius r"""
+    r_g = G * M / C**2
+    omega = C / r_g / ((r / r_g)**1.5 + a)
+    return omega / np.pi
+
+def gw_time_to_coalescence(f, Mc):
+    """Leading-order time left before coalescence at GW frequency f"""
+    return 5/256 * (G * Mc / C**3)**(-5/3) * (np.pi * f)**(-8/3)
+
+class InspiralWaveform:
+    """Quadrupole-order (leading PN) inspiral of a companion down to the ISCO
+    
+    The phase is closed-form in τ (time to coalescence), so any sample range
+    can be synthesized independently and long signals are streamed in chunks.
+    """
+    def __init__(self, mass_multiplier, spin_param, mass_ratio, r_start_isco=5.0,
+                 distance_mpc=100.0, inclination=0.0, samples_per_cycle=32):
+        calc = RelativisticCalculator(mass_multiplier, 0, spin_param)
+        self.m1 = calc.M
+        self.m2 = mass_ratio * calc.M
+        self.Mc = chirp_mass(self.m1, self.m2)
+        self.distance = distance_mpc * 1e6 * PARSEC
+        self.inclination = inclination
+        self.f_start = kerr_gw_frequency(calc.M, spin_param, r_start_isco * calc.r_isco)
+        self.f_isco = kerr_gw_frequency(calc.M, spin_param, calc.r_isco)
+        self.tau_start = gw_time_to_coalescence(self.f_start, self.Mc)
+        self.tau_isco = gw_time_to_coalescence(self.f_isco, self.Mc)
+        self.duration = self.tau_start - self.tau_isco
+        self.sample_rate = samples_per_cycle * self.f_isco
+        self.n_samples = int(self.duration * self.sample_rate)
+    
+    def frequency(self, tau):
+        """GW frequency at time-to-coalescence τ"""
+        return (5 / (256 * tau))**(3/8) * (G * self.Mc / C**3)**(-5/8) / np.pi
+    
+    def strain(self, start, stop):
+        """Time, h+ and h× for samples [start, stop)"""
+        t = np.arange(start, stop) / self.sample_rate
+        tau = self.tau_start - t
+        phase = -2 * (tau / (5 * G * self.Mc / C**3))**(5/8)
+        amplitude = 4 / self.distance * (G * self.Mc / C**2)**(5/3) * (np.pi * self.frequency(tau) / C)**(2/3)
+        cos_i = np.cos(self.inclination)
+        h_plus = amplitude * (1 + cos_i**2) / 2 * np.cos(phase)
+        h_cross = amplitude * cos_i * np.sin(phase)
+        return t, h_plus, h_cross
+    
+    def iter_chunks(self, chunk_size=65536, start=0, stop=None):
+        """Stream (t, h+, h×) in fixed-size chunks; memory is O(chunk_size)"""
+        stop = self.n_samples if stop is None else min(stop, self.n_samples)
+        for chunk_start in range(start, stop, chunk_size):
+            yield self.strain(chunk_start, min(chunk_start + chunk_size, stop))
+    
+    def spectrum(self, segment_size=8192, max_samples=2**22, chunk_size=65536):
+        """Welch-averaged one-sided ASD of h+ over the final max_samples samples
+        
+        Chunks are consumed as they are produced; only one chunk, one segment
+        carry-over and the PSD accumulator are held at any time.
+        """
+        start = max(self.n_samples - max_samples, 0)
+        # Short signals get a single segment of the largest power of two that fits
+        segment_size = min(segment_size, 2**int(np.log2(max(self.n_samples - start, 2))))
+        window = np.hanning(segment_size)
+        norm = self.sample_rate * np.sum(window**2)
+        psd = np.zeros(segment_size // 2 + 1)
+        n_segments = 0
+        carry = np.empty(0)
+        for _, h_plus, _ in self.iter_chunks(chunk_size, start):
+            data = np.concatenate([carry, h_plus])
+            n_full = len(data) // segment_size
+            if n_full:
+                segments = data[:n_full * segment_size].reshape(n_full, segment_size)
+                psd += np.sum(np.abs(np.fft.rfft(segments * window, axis=1))**2, axis=0)
+                n_segments += n_full
+            carry = data[n_full * segment_size:]
+        freqs = np.fft.rfftfreq(segment_size, 1 / self.sample_rate)
+        if n_segments == 0:
+            return freqs, np.zeros_like(freqs)
+        psd = 2 * psd / (n_segments * norm)
+        return freqs, np.sqrt(psd)
+
+# ============================================================================
+# RINGDOWN (QUASI-NORMAL MODES)
+# ============================================================================
+# Berti, Cardoso & Will (2006) fits per (l, m, n):
+# Mω = f1 + f2(1 - a)^f3, Q = q1 + q2(1 - a)^q3, with ω in units of c³/GM
+QNM_FITS = {
+    (2, 2, 0): (1.5251, -1.1568, 0.1292, 0.7000, 1.4187, -0.4990),
+    (2, 2, 1): (1.3673, -1.0260, 0.1628, 0.1000, 0.5436, -0.4731),
+    (2, 1, 0): (0.6000, -0.2339, 0.4175, -0.3000, 2.3561, -0.2277),
+    (3, 3, 0): (1.8956, -1.3043, 0.1818, 0.9000, 2.3430, -0.4810),
+    (4, 4, 0): (2.3000, -1.5056, 0.2244, 1.1929, 3.1191, -0.4825),
+}
+QNM_MODES = tuple(QNM_FITS)
+QNM_SPIN_POINTS = 2001  # 5×10⁻⁴ spacing over [0, 0.998]
+# Amplitudes relative to (2,2,0); illustrative values for an unequal-mass merger
+RINGDOWN_RELATIVE_AMPLITUDES = {(2, 2, 0): 1.0, (2, 2, 1): 0.5, (2, 1, 0): 0.1, (3, 3, 0): 0.2, (4, 4, 0): 0.1}
+
+def qnm_fit(a, modes=QNM_MODES):
+    """Dimensionless Mω and quality factor Q, shape a.shape + (n_modes,)"""
+    f1, f2, f3, q1, q2, q3 = np.array([QNM_FITS[mode] for mode in modes]).T
+    one_minus_a = (1 - np.asarray(a, dtype=float))[..., None]
+    return f1 + f2 * one_minus_a**f3, q1 + q2 * one_minus_a**q3
+
+@st.cache_resource(show_spinner=False)
+def qnm_spin_table(n_spins=QNM_SPIN_POINTS):
+    """Mω and Q of every fitted mode on a spin grid over [0, 0.998], built once per process"""
+    spins = np.linspace(0, 0.998, n_spins)
+    m_omega, quality = qnm_fit(spins)
+    for table in (spins, m_omega, quality):
+        table.flags.writeable = False
+    return spins, m_omega, quality
+
+def qnm_spectrum(M, a, modes=QNM_MODES):
+    """Frequency (Hz) and e-folding damping time (s) of each mode
+    
+    M (kg) and a broadcast together; results have shape
+    broadcast(M, a) + (n_modes,). Values are interpolated from the cached
+    spin table.
+    """
+    spins, m_omega_table, quality_table = qnm_spin_table()
+    a = np.asarray(a, dtype=float)
+    columns = [QNM_MODES.index(mode) for mode in modes]
+    m_omega = np.stack([np.interp(a, spins, m_omega_table[:, k]) for k in columns], axis=-1)
+    quality = np.stack([np.interp(a, spins, quality_table[:, k]) for k in columns], axis=-1)
+    omega = m_omega * C**3 / (G * np.asarray(M, dtype=float)[..., None])
+    return omega / (2 * np.pi), 2 * quality / omega
+
+def ringdown_waveform(t, M, a, amplitude=1.0, modes=QNM_MODES, phases=None):
+    """h+ and h× of the summed damped sinusoids at times t ≥ 0 after the peak
+    
+    Batched over M, a and amplitude (broadcast together into shape B); the
+    outputs have shape B + t.shape. The mode sum is held as
+    B + (n_modes,) + t.shape, so batch × modes × samples must fit in memory.
+    """
+    frequency, tau = qnm_spectrum(M, a, modes)
+    relative = np.array([RINGDOWN_RELATIVE_AMPLITUDES.get(mode, 1.0) for mode in modes])
+    phases = np.zeros(len(modes)) if phases is None else np.asarray(phases, dtype=float)
+    t = np.asarray(t, dtype=float)
+    extra = (None,) * t.ndim
+    envelope = relative[(...,) + extra] * np.exp(-t / tau[(...,) + extra])
+    phase = 2 * np.pi * frequency[(...,) + extra] * t + phases[(...,) + extra]
+    scale = np.asarray(amplitude, dtype=float)[(...,) + extra]
+    h_plus = scale * np.sum(envelope * np.cos(phase), axis=-1 - t.ndim)
+    h_cross = scale * np.sum(envelope * np.sin(phase), axis=-1 - t.ndim)
+    return h_plus, h_cross
+
+# ============================================================================
+# GRAVITATIONAL LENSING
+# ============================================================================
+# Bozza (2002) strong-deflection coefficient b̄ for Schwarzschild (ā = 1)
+STRONG_DEFLECTION_B = np.log(216 * (7 - 4*np.sqrt(3))) - np.pi
+LENSING_TILE_ROWS = 64
+
+def kerr_critical_impact(a):
+    """Prograde and retrograde critical impact parameters (units of r_g)"""
+    prograde = -a + 6 * np.cos(np.arccos(-a) / 3)
+    retrograde = a + 6 * np.cos(np.arccos(a) / 3)
+    return prograde, retrograde
+
+def deflection_angle(b, b_c, spin_term=0.0):
+    """Light deflection (rad) at impact parameter b (units of r_g); NaN if captured"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        strong = -np.log(b / b_c - 1) + STRONG_DEFLECTION_B
+        weak = 4 / b + 15 * np.pi / (4 * b**2) - 4 * spin_term / b**2
+    # The strong-deflection limit diverges at b_c but turns negative far out;
+    # the weak-field series does the opposite, so take the larger of the two
+    return np.where(b > b_c, np.maximum(strong, weak), np.nan)
+
+def lensing_tile(x, y, r_obs, spin, theta_obs):
+    """Source direction (lon, lat) and magnification for a block of pixels
+    
+    x, y are image-plane angles (rad) from the hole; r_obs is in units of r_g.
+    The local viewing angle is converted to b exactly; the deflection itself
+    is the full infinity-to-infinity value (distant-observer approximation).
+    """
+    view = np.hypot(x, y)
+    psi = np.arctan2(y, x)
+    lapse = np.sqrt(1 - 2 / r_obs)
+    b = r_obs * np.sin(view) / lapse
+    # Frame dragging shifts the shadow: the prograde side (cos ψ > 0) is flattened
+    b_pro, b_retro = kerr_critical_impact(spin)
+    projection = np.cos(psi) * np.sin(theta_obs)
+    b_c = (b_pro + b_retro) / 2 - (b_retro - b_pro) / 2 * projection
+    alpha = deflection_angle(b, b_c, spin * projection)
+    source = view - alpha
+    
+    # Magnification μ = (sin θ / sin β) / (dβ/dθ), derivative by a relative step in θ
+    step = 1e-4
+    b_step = r_obs * np.sin(view * (1 + step)) / lapse
+    alpha_step = deflection_angle(b_step, b_c, spin * projection)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dbeta_dtheta = 1 - (alpha_step - alpha) / (view * step)
+        magnification = np.abs(np.sin(view) / (np.sin(source) * dbeta_dtheta))
+    
+    # Direction on the sky with the hole on the equator at lon = 0
+    nx = np.sin(source) * np.cos(psi)
+    ny = np.sin(source) * np.sin(psi)
+    nz = np.cos(source)
+    return np.arctan2(nx, nz), np.arcsin(np.clip(ny, -1, 1)), magnification
+
+@st.cache_resource(show_spinner=False)
+def starfield_texture(width=2048, height=1024, seed=7):
+    """Equirectangular background sky: stars, a Milky Way band and a 15° grid"""
+    rng = np.random.default_rng(seed)
+    lat = np.linspace(np.pi/2, -np.pi/2, height)[:, None]
+    lon = np.linspace(-np.pi, np.pi, width)[None, :]
+    band = np.exp(-((lat - 0.3 * np.sin(lon)) / 0.12)**2)
+    sky = np.zeros((height, width, 3))
+    sky += band[..., None] * np.array([40, 30, 60])
+    grid = (np.abs(np.mod(np.degrees(lat) + 7.5, 15) - 7.5) < 0.15) | \
+           (np.abs(np.mod(np.degrees(lon) + 7.5, 15) - 7.5) < 0.15)
+    sky[grid] += np.array([0, 60, 50])
+    n_stars = 12000
+    rows = rng.integers(0, height, n_stars)
+    cols = rng.integers(0, width, n_stars)
+    brightness = 255 * rng.power(0.3, n_stars)[:, None]
+    tint = rng.choice(np.array([[1.0, 0.85, 0.7], [1.0, 1.0, 1.0], [0.7, 0.85, 1.0]]), n_stars)
+    sky[rows, cols] = np.maximum(sky[rows, cols], brightness * tint)
+    return np.clip(sky, 0, 255).astype(np.uint8)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def lensed_starfield(mass, spin, distance_log, theta, resolution=256, fov_shadow=4.0):
+    """Lensed starfield image and log10 magnification map for the current hole
+    
+    Row tiles are evaluated on the shared worker pool (NumPy releases the
+    GIL); the result is cached per (M, a, observer distance, view) combination.
+    """
+    calc = RelativisticCalculator(mass, distance_log, spin, 0, theta)
+    r_obs = calc.r / calc.r_g
+    b_shadow = np.mean(kerr_critical_impact(spin))
+    half_fov = fov_shadow * np.arcsin(min(b_shadow * np.sqrt(1 - 2 / r_obs) / r_obs, 1.0))
+    half_fov = min(half_fov, np.radians(89))  # Keep the view in the hemisphere facing the hole
+    axis = np.linspace(-half_fov, half_fov, resolution)
+    x, y = np.meshgrid(axis, axis[::-1])
+    
+    tiles = [(x[i:i + LENSING_TILE_ROWS], y[i:i + LENSING_TILE_ROWS])
+             for i in range(0, resolution, LENSING_TILE_ROWS)]
+    results = backend_map(lambda tile: lensing_tile(*tile, r_obs, spin, theta), tiles)
+    lon = np.concatenate([res[0] for res in results])
+    lat = np.concatenate([res[1] for res in results])
+    magnification = np.concatenate([res[2] for res in results])
+    
+    texture = starfield_texture()
+    height, width, _ = texture.shape
+    captured = np.isnan(lon)
+    rows = np.clip(((np.pi/2 - np.nan_to_num(lat)) / np.pi * (height - 1)).astype(int), 0, height - 1)
+    cols = np.clip(((np.nan_to_num(lon) + np.pi) / (2*np.pi) * (width - 1)).astype(int), 0, width - 1)
+    image = texture[rows, cols]
+    image[captured] = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_mu = np.where(captured, np.nan, np.log10(magnification))
+    return image, log_mu, np.degrees(half_fov)
+
+# ============================================================================
+# RELATIVISTIC EMISSION LINE
+# ============================================================================
+FE_K_ALPHA_KEV = 6.4  # Rest energy of the iron Kα line
+LINE_CHUNK_SIZE = 2**18
+
+def disk_emitter_shift(x, a, sin_phi, sin_incl):
+    """Photon energy ratio g = E_obs/E_emit for equatorial circular emitters
+    
+    x = r/r_g. Combines gravitational redshift and transverse Doppler (via u^t)
+    with the line-of-sight Doppler term; photons travel in straight lines.
+    """
+    u_t = (x**1.5 + a) / (x**0.75 * np.sqrt(x**1.5 - 3*x**0.5 + 2*a))
+    omega = 1 / (x**1.5 + a)  # Keplerian angular velocity in units of c/r_g
+    return 1 / (u_t * (1 - omega * x * sin_incl * sin_phi))
+
+def sample_disk_radii(u, x_in, x_out, emissivity_index):
+    """Inverse-CDF radii for emissivity r^-q times the area element r dr"""
+    k = 2 - emissivity_index
+    if abs(k) < 1e-9:
+        return x_in * (x_out / x_in)**u
+    return (x_in**k + u * (x_out**k - x_in**k))**(1 / k)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def emission_line_profile(spin, inclination_deg, emissivity_index=3.0, r_out_rg=400.0,
+                          n_emitters=1_000_000, n_bins=300, seed=0):
+    """Line profile F(E/E0) from Monte Carlo disk emitters, binned in chunks
+    
+    Emitters are drawn LINE_CHUNK_SIZE at a time and histogrammed into fixed
+    bins (weight g³), so memory does not grow with n_emitters. Returns bin
+    centres, the relativistic profile and a Newtonian-Doppler reference.
+    """
+    calc = RelativisticCalculator(1.0, 0, spin)
+    x_in = calc.r_isco / calc.r_g
+    sin_incl = np.sin(np.radians(inclination_deg))
+    edges = np.linspace(0.0, 1.8, n_bins + 1)
+    profile = np.zeros(n_bins)
+    newtonian = np.zeros(n_bins)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_emitters, LINE_CHUNK_SIZE):
+        n = min(LINE_CHUNK_SIZE, n_emitters - start)
+        x = sample_disk_radii(rng.random(n), x_in, r_out_rg, emissivity_index)
+        sin_phi = np.sin(rng.uniform(0, 2*np.pi, n))
+        g = disk_emitter_shift(x, spin, sin_phi, sin_incl)
+        profile += np.histogram(g, edges, weights=g**3)[0]
+        g_newton = 1 + sin_incl * sin_phi / np.sqrt(x)
+        newtonian += np.histogram(g_newton, edges)[0]
+    centres = (edges[1:] + edges[:-1]) / 2
+    return centres, profile / profile.max(), newtonian / newtonian.max()
+
+# ============================================================================
+# TIDAL DISRUPTION
+# ============================================================================
+SOLAR_RADIUS = 6.957e8  # Nominal solar radius (m)
+TDE_CHUNK_SIZE = 1_000_000
+# Kroupa (2001) IMF: (m_low, m_high, α) with dN/dm ∝ m^-α, masses in M☉
+KROUPA_SEGMENTS = ((0.08, 0.5, 1.3), (0.5, np.inf, 2.3))
+# Histogram of log10 s, s = R★ m★^(-1/3) c²/G (kg^(2/3)); 0.002 dex bins
+TDE_LOG_S_EDGES = np.linspace(24.0, 28.0, 2001)
+TDE_INCLINATION_NODES = 64  # Gauss-Legendre nodes over cos i for isotropic orbits
+
+def sample_kroupa_masses(rng, n, m_max=1.0):
+    """Stellar masses (M☉) from the Kroupa IMF truncated at m_max, by inverse CDF"""
+    segments = [(low, min(high, m_max), alpha) for low, high, alpha in KROUPA_SEGMENTS if low < m_max]
+    lows, highs, alphas = (np.array(column) for column in zip(*segments))
+    # Continuity of dN/dm at the break points fixes each segment's normalisation
+    scale = np.ones(len(segments))
+    for k in range(1, len(segments)):
+        scale[k] = scale[k-1] * lows[k]**(alphas[k] - alphas[k-1])
+    power = 1 - alphas
+    weights = scale * (highs**power - lows**power) / power
+    segment = np.searchsorted(np.cumsum(weights) / weights.sum(), rng.random(n), side="right")
+    segment = np.minimum(segment, len(segments) - 1)
+    u = rng.random(n)
+    lo, hi, pw = lows[segment]**power[segment], highs[segment]**power[segment], power[segment]
+    return (lo + u * (hi - lo))**(1 / pw)
+
+def main_sequence_radius(m_star, rng=None, scatter_dex=0.0):
+    """Radius (R☉) from R ∝ m^0.8 below 1 M☉ and m^0.57 above, with optional log-normal scatter"""
+    radius = np.where(m_star < 1, m_star**0.8, m_star**0.57)
+    if rng is not None and scatter_dex > 0:
+        radius = radius * 10**rng.normal(0, scatter_dex, np.shape(m_star))
+    return radius
+
+def tidal_disruption_radius(M, m_star, r_star):
+    """r_t = R★ (M/m★)^(1/3); masses in kg, radius in m"""
+    return r_star * (M / m_star)**(1/3)
+
+def marginally_bound_radius(chi):
+    """Periapsis (units of r_g) of the marginally bound orbit for signed spin χ = a cos i
+    
+    Exact for equatorial orbits (χ = ±a); inclined orbits use the projected
+    spin as an approximation. Stars with a smaller periapsis are swallowed.
+    """
+    return 2 - chi + 2 * np.sqrt(1 - chi)
+
+def tde_population_chunk(seed, n, m_max, scatter_dex):
+    """Histogram counts of log10 s for one chunk of sampled stars"""
+    rng = np.random.default_rng(seed)
+    m_star = sample_kroupa_masses(rng, n, m_max)
+    r_star = main_sequence_radius(m_star, rng, scatter_dex)
+    log_s = (np.log10(r_star * SOLAR_RADIUS) - np.log10(m_star * SOLAR_MASS) / 3 + np.log10(C**2 / G))
+    bins = np.clip(np.searchsorted(TDE_LOG_S_EDGES, log_s, side="right") - 1, 0, len(TDE_LOG_S_EDGES) - 2)
+    return np.bincount(bins, minlength=len(TDE_LOG_S_EDGES) - 1)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def tde_population(n_stars=10_000_000, m_max=1.0, scatter_dex=0.05, seed=0):
+    """Survival function of log10 s over a sampled stellar population
+    
+    A star is disrupted outside the capture radius of a hole of mass M (kg)
+    iff log10 s > (2/3) log10 M + log10 r_mb, so this one histogram serves
+    every (M, a). Chunks draw from independent child seeds on the backend
+    pool; the result does not depend on the thread count.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_stars // TDE_CHUNK_SIZE))
+    sizes = [min(TDE_CHUNK_SIZE, n_stars - k * TDE_CHUNK_SIZE) for k in range(len(seeds))]
+    counts = sum(backend_map(lambda job: tde_population_chunk(*job, m_max, scatter_dex), zip(seeds, sizes)))
+    survival = 1 - np.concatenate([[0], np.cumsum(counts)]) / n_stars
+    return TDE_LOG_S_EDGES, survival, counts
+
+def disrupted_fraction(M, a, population):
+    """Fraction of an isotropic population disrupted outside the capture radius
+    
+    M (kg) and a broadcast together; the rest are swallowed whole.
+    """
+    edges, survival, _ = population
+    nodes, weights = np.polynomial.legendre.leggauss(TDE_INCLINATION_NODES)
+    threshold = (2/3 * np.log10(np.asarray(M, dtype=float))[..., None]
+                 + np.log10(marginally_bound_radius(np.asarray(a, dtype=float)[..., None] * nodes)))
+    return np.sum(np.interp(threshold, edges, survival) * weights, axis=-1) / 2
+
+def hills_mass(m_star, r_star, a=0.0, prograde=True):
+    """Largest hole (kg) that disrupts a star outside capture on an equatorial orbit"""
+    s = r_star * SOLAR_RADIUS * (m_star * SOLAR_MASS)**(-1/3) * C**2 / G
+    return (s / marginally_bound_radius(np.where(prograde, a, -np.asarray(a))))**1.5
+
+# ============================================================================
+# SIGNAL PROPAGATION
+# ============================================================================
+# Radial tables run over u = ln(x - x₊) (x = r/r_g); the mass scales out, so
+# one table per spin serves every M
+SIGNAL_TABLE_U = (np.log(1e-12), np.log(1e6))
+SIGNAL_TABLE_POINTS = 8192
+
+def kerr_horizons(a):
+    """Outer and inner horizon radii in units of r_g"""
+    root = np.sqrt(1 - np.asarray(a, dtype=float)**2)
+    return 1 + root, 1 - root
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def radial_travel_table(spin):
+    """Cumulative excess coordinate time (units of r_g/c) of an outgoing equatorial radial null ray
+    
+    Integrates dt/dx - 1 = (x² + a²)/Δ - 1 along the principal null
+    direction, so the table holds only the delay and interpolates well at
+    any radius. With x = x₊ + e^u the integrand becomes
+    (x² + a²)/(x - x₋) - e^u, smooth down to the horizon, and a cumulative
+    Simpson rule on a uniform u grid is accurate. Built once per spin.
+    """
+    x_plus, x_minus = kerr_horizons(spin)
+    u = np.linspace(*SIGNAL_TABLE_U, SIGNAL_TABLE_POINTS + 1)
+    x = x_plus + np.exp(u)
+    f = (x**2 + spin**2) / (x - x_minus) - np.exp(u)
+    cumulative = cumulative_simpson(f, u[1] - u[0])
+    for table in (u, x, cumulative):
+        table.flags.writeable = False
+    return u, x, cumulative
+
+def radial_coordinate_time(x, spin):
+    """Coordinate time to radii x (units of r_g) up to a constant, extended analytically past the table"""
+    u, x_table, cumulative = radial_travel_table(spin)
+    x_plus, x_minus = kerr_horizons(spin)
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_offset = np.log(x - x_plus)
+        # Near the horizon the u-integrand tends to 2x₊/(x₊ - x₋): linear in u
+        inner = cumulative[0] + 2 * x_plus / (x_plus - x_minus) * (log_offset - u[0])
+        # Far away dt/dx - 1 = 2/x + 4/x² + O(x⁻³)
+        x_max = x_table[-1]
+        outer = cumulative[-1] + 2 * np.log(x / x_max) + 4 * (1 / x_max - 1 / x)
+    excess = np.where(log_offset < u[0], inner,
+                      np.where(x > x_max, outer, np.interp(log_offset, u, cumulative)))
+    return excess + (x - x_plus)
+
+def radial_signal_delay(M, spin, r_emit, r_receive):
+    """Coordinate travel time and Shapiro delay (s) of a radial outgoing signal
+    
+    Exact for equatorial emitters in Kerr (principal null ray) and for any θ
+    when a = 0. r_emit and r_receive (m) broadcast; the delay is the travel
+    time minus the flat-space (r_receive - r_emit)/c.
+    """
+    r_g = G * M / C**2
+    x_e, x_r = np.asarray(r_emit) / r_g, np.asarray(r_receive) / r_g
+    travel = (radial_coordinate_time(x_r, spin) - radial_coordinate_time(x_e, spin)) * r_g / C
+    return travel, travel - (np.asarray(r_receive) - np.asarray(r_emit)) / C
+
+def weak_field_shapiro_delay(M, r_emit, r_receive, psi):
+    """Shapiro delay (s) along the straight path between radii r_emit and r_receive at angle ψ
+    
+    Weak-field (1 + γ = 2) result; accurate while the path's closest
+    approach stays many r_g from the hole. Inputs broadcast.
+    """
+    r_emit, r_receive = np.asarray(r_emit, dtype=float), np.asarray(r_receive, dtype=float)
+    separation = np.sqrt(r_emit**2 + r_receive**2 - 2 * r_emit * r_receive * np.cos(psi))
+    return 2 * G * M / C**3 * np.log((r_emit + r_receive + separation) / (r_emit + r_receive - separation))
+
+def path_closest_approach(r_emit, r_receive, psi):
+    """Closest approach to the hole of the straight segment between the two points"""
+    r_emit, r_receive = np.asarray(r_emit, dtype=float), np.asarray(r_receive, dtype=float)
+    separation = np.sqrt(r_emit**2 + r_receive**2 - 2 * r_emit * r_receive * np.cos(psi))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        b = r_emit * r_receive * np.abs(np.sin(psi)) / separation
+    # The perpendicular foot lies inside the segment only if both end angles are acute
+    inside = ((r_emit**2 + separation**2 >= r_receive**2) & (r_receive**2 + separation**2 >= r_emit**2))
+    return np.where(inside, b, np.minimum(r_emit, r_receive))
+
+# ============================================================================
+# UNCERTAINTY PROPAGATION
+# ============================================================================
+UNCERTAINTY_CHUNK_SIZE = 250_000
+UNCERTAINTY_QUANTILES = (0.025, 0.16, 0.5, 0.84, 0.975)
+
+class QuantileSketch:
+    """Streaming quantiles of positive values with bounded memory
+    
+    Values fall into log-spaced buckets of ratio γ = (1+α)/(1-α), so every
+    quantile is returned to within relative accuracy α however many samples
+    are added. Zeros and infinities are counted separately.
+    """
+    def __init__(self, relative_accuracy=0.005, min_value=1e-300, max_value=1e300):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.offset = int(np.floor(np.log(min_value) / self.log_gamma))
+        self.counts = np.zeros(int(np.ceil(np.log(max_value) / self.log_gamma)) - self.offset + 1, dtype=np.int64)
+        self.n_zero = 0
+        self.n_inf = 0
+    
+    @property
+    def count(self):
+        return self.n_zero + int(self.counts.sum()) + self.n_inf
+    
+    def update(self, values):
+        """Add an array of samples"""
+        values = np.asarray(values, dtype=float).ravel()
+        finite = np.isfinite(values) & (values > 0)
+        self.n_zero += int(np.count_nonzero(values <= 0))
+        self.n_inf += int(np.count_nonzero(~np.isfinite(values)))
+        index = np.ceil(np.log(values[finite]) / self.log_gamma).astype(np.int64) - self.offset
+        index = np.clip(index, 0, len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+    
+    def bucket_value(self, index):
+        """Representative value of a bucket (midpoint in the relative sense)"""
+        return 2 * self.gamma**(np.asarray(index) + self.offset) / (self.gamma + 1)
+    
+    def quantiles(self, qs):
+        """Quantiles for an iterable of probabilities"""
+        cumulative = self.n_zero + np.cumsum(self.counts)
+        total = self.count
+        result = []
+        for q in qs:
+            rank = q * (total - 1)
+            if rank < self.n_zero:
+                result.append(0.0)
+            elif rank >= cumulative[-1]:
+                result.append(float('inf'))
+            else:
+                result.append(float(self.bucket_value(np.searchsorted(cumulative, rank, side='right'))))
+        return result
+    
+    def histogram(self, n_bins=60):
+        """Log-spaced histogram (edges, counts) over the occupied bucket range"""
+        occupied = np.nonzero(self.counts)[0]
+        if len(occupied) == 0:
+            return np.array([]), np.array([])
+        group = max(int(np.ceil((occupied[-1] - occupied[0] + 1) / n_bins)), 1)
+        counts = self.counts[occupied[0]:occupied[-1] + 1]
+        counts = np.pad(counts, (0, -len(counts) % group)).reshape(-1, group).sum(axis=1)
+        edges = self.gamma**(occupied[0] - 1 + self.offset + group * np.arange(len(counts) + 1))
+        return edges, counts
+
+def sample_black_hole_inputs(rng, n, params, sigmas):
+    """Draw n input sets around the current point
+    
+    Mass is log-normal with relative width; spin, distance_log and θ are
+    normal and clipped to the slider ranges.
+    """
+    mass = params["mass"] * np.exp(rng.normal(0, sigmas["mass"], n))
+    spin = np.clip(rng.normal(params["spin"], sigmas["spin"], n), 0, 0.998)
+    distance_log = rng.normal(params["distance_log"], sigmas["distance_log"], n)
+    theta = np.clip(rng.normal(params["theta"], sigmas["theta"], n), 0, np.pi)
+    return mass, distance_log, spin, theta
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def propagate_uncertainty(params, sigmas, n_samples=1_000_000, seed=0):
+    """Quantiles and histograms of key outputs under input uncertainty
+    
+    Samples are pushed through the batch calculator UNCERTAINTY_CHUNK_SIZE
+    at a time and folded into QuantileSketch instances; no chunk is kept.
+    """
+    sketches = {
+        "Time Dilation Factor": QuantileSketch(),
+        "Tidal Gradient (m/s²/m)": QuantileSketch(),
+        "ISCO Radius (km)": QuantileSketch(),
+    }
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_samples, UNCERTAINTY_CHUNK_SIZE):
+        n = min(UNCERTAINTY_CHUNK_SIZE, n_samples - start)
+        mass, distance_log, spin, theta = sample_black_hole_inputs(rng, n, params, sigmas)
+        outputs = evaluate_batch(mass, distance_log, spin, params["velocity"], theta, params["observer"],
+                                 ("total_dilation", "tidal_force", "r_isco"), params["backend"])
+        with np.errstate(divide='ignore'):
+            sketches["Time Dilation Factor"].update(1 / outputs["total_dilation"])
+        sketches["Tidal Gradient (m/s²/m)"].update(outputs["tidal_force"])
+        sketches["ISCO Radius (km)"].update(outputs["r_isco"] / 1e3)
+    return {name: {"quantiles": sketch.quantiles(UNCERTAINTY_QUANTILES),
+                   "histogram": sketch.histogram(),
+                   "count": sketch.count}
+            for name, sketch in sketches.items()}
+
+# ============================================================================
+# SENSITIVITY ANALYSIS
+# ============================================================================
+# input: (central-difference step, lower bound, upper bound); mass enters as log10
+SENSITIVITY_INPUTS = {
+    "log10_mass": (1e-4, -np.inf, np.inf),
+    "distance_log": (1e-4, -np.inf, np.inf),
+    "spin": (1e-4, 0.0, 0.998),
+    "theta": (1e-4, 0.0, np.pi),
+}
+
+def sensitivity_jacobian(mass, distance_log, spin, theta, velocity=0.0, outputs=None, observer_type="static",
+                         backend=None):
+    """Values and ∂output/∂input for calculator outputs, in one batched evaluation
+    
+    Inputs may be scalars or broadcastable grids. The base point and both
+    central-difference neighbours of every input are stacked along a new
+    leading axis and pushed through one batched evaluation on the given
+    compute backend; steps are made one-sided at the spin and θ bounds.
+    """
+    base = {"log10_mass": np.log10(mass), "distance_log": distance_log, "spin": spin, "theta": theta}
+    shape = np.broadcast(*base.values()).shape
+    n_points = 1 + 2 * len(SENSITIVITY_INPUTS)
+    stacked = {name: np.repeat(np.broadcast_to(np.asarray(value, dtype=float), shape)[None], n_points, axis=0)
+               for name, value in base.items()}
+    spacing = {}
+    for i, (name, (step, lower, upper)) in enumerate(SENSITIVITY_INPUTS.items()):
+        x = stacked[name][0]
+        stacked[name][1 + 2*i] = np.minimum(x + step, upper)
+        stacked[name][2 + 2*i] = np.maximum(x - step, lower)
+        spacing[name] = stacked[name][1 + 2*i] - stacked[name][2 + 2*i]
+    evaluated = evaluate_batch(10**stacked["log10_mass"], stacked["distance_log"], stacked["spin"],
+                               velocity, stacked["theta"], observer_type, outputs, backend)
+    values, jacobian = {}, {}
+    for output, value in evaluated.items():
+        values[output] = value[0]
+        with np.errstate(invalid='ignore'):
+            jacobian[output] = {name: (value[1 + 2*i] - value[2 + 2*i]) / spacing[name]
+                                for i, name in enumerate(SENSITIVITY_INPUTS)}
+    return values, jacobian
+
+def log_sensitivity(values, jacobian):
+    """Convert ∂y/∂x to ∂log₁₀|y|/∂x (dex per unit input)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {output: {name: d / (values[output] * np.log(10)) for name, d in partials.items()}
+                for output, partials in jacobian.items()}
+
+# ============================================================================
+# MISSION PLANNER (TWIN PARADOX)
+# ============================================================================
+# Searched mission parameters and their bounds; candidates live in the unit
+# cube and are decoded per generation. The dwell radius is searched as
+# log10(r/Rs - 1) so the bounds suit any mass, dwell time as log10(hours).
+MISSION_BOUNDS = {
+    "log10_offset_rs": (-6.0, 3.0),
+    "log10_hours": (0.0, 4.0),
+    "velocity": (0.0, 0.99),
+    "spin": (0.0, 0.998),
+}
+MISSION_TIDAL_LIMIT = 100.0  # m/s² across a 2 m body: the dashboard's danger threshold
+MISSION_ISLANDS = 4
+MISSION_MIGRATION_INTERVAL = 5  # generations between migrations
+MISSION_ELITE_FRACTION = 0.125
+MISSION_MIGRANTS = 16
+MISSION_MUTATION_SCALE = (0.15, 0.005)  # unit-cube step at the first and last epoch
+
+def decode_missions(population, max_hours):
+    """Unit-cube candidates to a dict of mission parameter arrays"""
+    bounds = dict(MISSION_BOUNDS, log10_hours=(MISSION_BOUNDS["log10_hours"][0], np.log10(max_hours)))
+    return {name: low + population[:, i] * (high - low) for i, (name, (low, high)) in enumerate(bounds.items())}
+
+def score_missions(missions, mass, theta, observer, tidal_limit, max_escape, backend=None):
+    """Earth time gained and constraint violation for each candidate, in one batched evaluation
+    
+    Violation is 0 for feasible missions; otherwise it grows with how far
+    the tidal stretch and escape velocity exceed their limits.
+    """
+    distance_log = np.log10(RelativisticCalculator(mass, 0).Rs) + missions["log10_offset_rs"]
+    outputs = evaluate_batch(mass, distance_log, missions["spin"], missions["velocity"], theta,
+                             observer, ("total_dilation", "tidal_force", "escape_velocity"), backend)
+    rate = outputs["total_dilation"]
+    dwell = 3600 * 10**missions["log10_hours"]
+    stretch = 2 * outputs["tidal_force"]  # 2 m body, as on the dashboard
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gain = np.where(rate > 0, dwell / rate - dwell, 0.0)
+        violation = (np.maximum(np.log10(stretch / tidal_limit), 0)
+                     + np.maximum(np.log10(outputs["escape_velocity"] / max_escape), 0)
+                     + 10.0 * (rate <= 0))
+    return {"gain": gain, "stretch": stretch, "escape_velocity": outputs["escape_velocity"],
+            "violation": violation}
+
+def rank_missions(scored):
+    """Candidate indices best first: feasible by Earth time gained, then the least infeasible"""
+    return np.lexsort((-scored["gain"], scored["violation"]))
+
+def evolve_island(population, rng, generations, step, context):
+    """Run one island's generations; returns its population (elites first) and best gain per generation"""
+    n, dims = population.shape
+    n_elite = max(int(n * MISSION_ELITE_FRACTION), 2)
+    history = []
+    for _ in range(generations):
+        scored = score_missions(decode_missions(population, context["max_hours"]), **context["physics"])
+        order = rank_missions(scored)
+        best = order[0]
+        history.append(scored["gain"][best] if scored["violation"][best] == 0 else np.nan)
+        elites = population[order[:n_elite]]
+        # Uniform crossover of two elite parents plus a Gaussian step, reflected into the cube
+        parents = elites[rng.integers(0, n_elite, (n - n_elite, 2))]
+        children = np.where(rng.random((n - n_elite, dims)) < 0.5, parents[:, 0], parents[:, 1])
+        children = np.abs(children + rng.normal(0, step, children.shape))
+        children = 1 - np.abs(1 - np.minimum(children, 2.0))
+        population = np.concatenate([elites, children])
+    return population, history
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def optimize_mission(mass, theta, observer, tidal_limit=MISSION_TIDAL_LIMIT, max_escape=0.5, max_hours=1000.0,
+                     generations=40, population=2048, seed=0, backend=None):
+    """Island-model search for the dwell radius, dwell time, speed and spin that gain the most Earth time
+    
+    Each island scores its whole population in one batched calculator pass
+    per generation. Islands evolve concurrently on the shared worker pool
+    and exchange their best candidates around a ring every
+    MISSION_MIGRATION_INTERVAL generations, so results do not depend on
+    thread scheduling.
+    """
+    context = {"max_hours": max_hours,
+               "physics": {"mass": mass, "theta": theta, "observer": observer, "tidal_limit": tidal_limit,
+                           "max_escape": max_escape, "backend": backend}}
+    rngs = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(MISSION_ISLANDS)]
+    islands = [rng.random((population, len(MISSION_BOUNDS))) for rng in rngs]
+    history = [[] for _ in islands]
+    epochs = -(-generations // MISSION_MIGRATION_INTERVAL)
+    for epoch in range(epochs):
+        first, last = MISSION_MUTATION_SCALE
+        step = first * (last / first)**(epoch / max(epochs - 1, 1))
+        count = min(MISSION_MIGRATION_INTERVAL, generations - epoch * MISSION_MIGRATION_INTERVAL)
+        results = backend_map(lambda i: evolve_island(islands[i], rngs[i], count, step, context),
+                              range(MISSION_ISLANDS))
+        islands = [island for island, _ in results]
+        for i, (_, gains) in enumerate(results):
+            history[i].extend(gains)
+        # Ring migration: each island's leading elites replace the tail of the next
+        migrants = [island[:MISSION_MIGRANTS].copy() for island in islands]
+        for i, island in enumerate(islands):
+            island[-MISSION_MIGRANTS:] = migrants[i - 1]
+    
+    final = np.concatenate(islands)
+    missions = decode_missions(final, max_hours)
+    scored = score_missions(missions, **context["physics"])
+    order = rank_missions(scored)
+    columns = {**missions, **scored}
+    return {
+        "best": {name: float(values[order[0]]) for name, values in columns.items()},
+        "history": np.array(history),
+        "population": {name: values[order] for name, values in columns.items()},
+        "evaluated": MISSION_ISLANDS * population * (generations + 1),
+    }
+
+# ============================================================================
+# BLACK HOLE CATALOG
+# ============================================================================
+# SPACETIME_CATALOG replaces the default (bundled known black holes plus a
+# synthetic population) with a CSV of the same columns
+CATALOG_FILE = os.environ.get("SPACETIME_CATALOG")
+KNOWN_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog", "known_black_holes.csv")
+CATALOG_SYNTHETIC_SIZE = int(os.environ.get("SPACETIME_CATALOG_SYNTHETIC", 200_000))
+CATALOG_DISPLAY_ROWS = 200
+# column: default when missing (None = required)
+CATALOG_COLUMNS = {
+    "name": "",
+    "mass_msun": None,
+    "mass_err_msun": np.nan,
+    "spin": None,
+    "spin_err": np.nan,
+    "distance_mpc": np.nan,
+    "distance_err_mpc": np.nan,
+}
+# label: (calculator output, transform)
+CATALOG_METRICS = {
+    "Rs (km)": ("Rs", lambda v: v / 1e3),
+    "ISCO (km)": ("r_isco", lambda v: v / 1e3),
+    "Time Dilation Factor": ("total_dilation", lambda v: 1 / v),
+    "Tidal Gradient (m/s²/m)": ("tidal_force", None),
+    "Hawking Temperature (K)": ("hawking_temp", None),
+}
+
+class BlackHoleCatalog:
+    """Read-only column store with sorted indexes on mass and spin
+    
+    A range query binary-searches the more selective index and filters the
+    other column over that slice only; nothing loops in Python per row.
+    """
+    INDEXED = ("mass_msun", "spin")
+    
+    def __init__(self, columns):
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            values.flags.writeable = False
+            self.columns[name] = values
+        self.size = len(self.columns["mass_msun"])
+        self.order = {key: np.argsort(self.columns[key], kind="stable") for key in self.INDEXED}
+        self.sorted = {key: self.columns[key][self.order[key]] for key in self.INDEXED}
+    
+    @classmethod
+    def from_frame(cls, frame):
+        """Validate a catalog table; spins are clipped to the slider range [0, 0.998]"""
+        missing = [name for name, default in CATALOG_COLUMNS.items() if default is None and name not in frame]
+        if missing:
+            raise ValueError(f"catalog is missing required columns: {', '.join(missing)}")
+        columns = {}
+        for name, default in CATALOG_COLUMNS.items():
+            if name == "name":
+                values = frame[name].fillna("").astype(str) if name in frame else pd.Series(np.arange(len(frame)).astype(str))
+                columns[name] = values.to_numpy(dtype=str)
+            else:
+                values = frame[name].to_numpy(dtype=float) if name in frame else np.full(len(frame), default)
+                columns[name] = values
+        if not (np.all(np.isfinite(columns["mass_msun"])) and np.all(columns["mass_msun"] > 0)):
+            raise ValueError("catalog masses must be positive and finite")
+        columns["spin"] = np.clip(np.nan_to_num(columns["spin"]), 0.0, 0.998)
+        return cls(columns)
+    
+    def span(self, key, low, high):
+        """[start, stop) of the closed range [low, high] in the sorted index"""
+        keys = self.sorted[key]
+        return np.searchsorted(keys, low, side="left"), np.searchsorted(keys, high, side="right")
+    
+    def query(self, mass_range=None, spin_range=None):
+        """Row ids with mass (M☉) and spin inside the closed ranges, ascending"""
+        ranges = {"mass_msun": mass_range, "spin": spin_range}
+        spans = {key: self.span(key, *bounds) if bounds else (0, self.size) for key, bounds in ranges.items()}
+        key = min(spans, key=lambda name: spans[name][1] - spans[name][0])
+        rows = self.order[key][slice(*spans[key])]
+        other = "spin" if key == "mass_msun" else "mass_msun"
+        if ranges[other]:
+            values = self.columns[other][rows]
+            rows = rows[(values >= ranges[other][0]) & (values <= ranges[other][1])]
+        return np.sort(rows)
+
+def synthetic_catalog(n, seed=2024):
+    """Mock population: 30% Galactic stellar-mass, 70% extragalactic supermassive"""
+    rng = np.random.default_rng(seed)
+    stellar = rng.random(n) < 0.3
+    log_mass = np.where(stellar, rng.uniform(np.log10(5), np.log10(50), n), rng.uniform(5, 10, n))
+    log_distance = np.where(stellar, rng.uniform(-4, np.log10(0.03), n), rng.uniform(0, 3, n))
+    mass = 10**log_mass
+    distance = 10**log_distance
+    return pd.DataFrame({
+        "name": np.char.add("SYN-", np.char.zfill(np.arange(n).astype(str), 7)),
+        "mass_msun": mass,
+        "mass_err_msun": mass * rng.uniform(0.05, 0.3, n),
+        "spin": np.where(stellar, rng.uniform(0, 0.998, n), 0.998 * rng.beta(3, 1, n)),
+        "spin_err": rng.uniform(0.02, 0.2, n),
+        "distance_mpc": distance,
+        "distance_err_mpc": distance * rng.uniform(0.05, 0.2, n),
+    })
+
+@st.cache_resource(show_spinner=False)
+def load_catalog():
+    """The process-wide catalog (shared read-only by every session)"""
+    if CATALOG_FILE:
+        frame = pd.read_csv(CATALOG_FILE, comment="#", skipinitialspace=True)
+    else:
+        frame = pd.concat([pd.read_csv(KNOWN_CATALOG, comment="#", skipinitialspace=True),
+                           synthetic_catalog(CATALOG_SYNTHETIC_SIZE)], ignore_index=True)
+    return BlackHoleCatalog.from_frame(frame)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def catalog_metrics(distance_log, velocity, theta, observer, backend=None):
+    """CATALOG_METRICS for every catalog entry at the current probe position, one batch"""
+    catalog = load_catalog()
+    outputs = evaluate_batch(catalog.columns["mass_msun"] / 1e6, distance_log, catalog.columns["spin"],
+                             velocity, theta, observer, tuple(name for name, _ in CATALOG_METRICS.values()),
+                             backend)
+    metrics = {}
+    with np.errstate(divide='ignore'):
+        for label, (name, transform) in CATALOG_METRICS.items():
+            values = transform(outputs[name]) if transform else np.array(outputs[name])
+            values.flags.writeable = False
+            metrics[label] = values
+    return metrics
+
+def top_rows(values, rows, count, descending=True):
+    """The count rows with the largest (or smallest) values, in order; NaN last"""
+    key = values[rows]
+    key = -key if descending else key
+    if count < len(rows):
+        part = np.argpartition(key, count)[:count]
+        return rows[part[np.argsort(key[part], kind="stable")]]
+    return rows[np.argsort(key, kind="stable")]
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+SMALL_INT_STRINGS = np.arange(1000).astype(str)  # lookup for calendar components
+
+def _digit_codes(ints, width):
+    """Zero-padded decimal digits of non-negative ints as a (n, width) codepoint array"""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (48 + (ints[:, None] // powers) % 10).astype(np.uint32)
+
+def _codes_to_strings(codes):
+    """(n, width) codepoint array -> length-n unicode array"""
+    return np.ascontiguousarray(codes).view(f"U{codes.shape[1]}").ravel()
+
+def _join_strings(*parts):
+    """Element-wise concatenation of string arrays/scalars"""
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = np.char.add(joined, part)
+    return joined
+
+def _format_fixed(values, decimals):
+    """Bulk f"{v:.{decimals}f}" for finite non-negative values below 1e12"""
+    product = values * 10.0**decimals
+    scaled = np.rint(product).astype(np.int64)
+    whole = (scaled // 10**decimals).astype(str)
+    if decimals > 0:
+        whole = _join_strings(whole, ".", _codes_to_strings(_digit_codes(scaled % 10**decimals, decimals)))
+    # The multiplication rounds, so values within rounding error of a half can
+    # land on the wrong side; those are formatted exactly, per value
+    uncertain = np.abs(product - np.floor(product) - 0.5) <= product * 1e-15
+    if uncertain.any():
+        whole = whole.astype(f"U{max(whole.dtype.itemsize // 4, 1) + 1}")  # room for a carry digit
+        whole[uncertain] = [f"{v:.{decimals}f}" for v in values[uncertain]]
+    return whole
+
+def _scientific_parts(magnitude, precision):
+    """Integer mantissa (precision + 1 digits) and decimal exponent of positive values"""
+    exponent = np.floor(np.log10(magnitude)).astype(np.int64)
+    # log10 can land one off near powers of ten, and rounding can carry into
+    # a new decade; settle the exponent on the rounded mantissa. Values within
+    # rounding error of a half can round either way; they are flagged so the
+    # caller formats them exactly.
+    uncertain = np.zeros(magnitude.shape, dtype=bool)
+    for _ in range(3):
+        shift = precision - exponent
+        power = 10.0 ** np.abs(shift)  # exact up to 1e22, so a single rounding step
+        scaled = np.where(shift >= 0, magnitude * power, magnitude / power)
+        mantissa = np.rint(scaled).astype(np.int64)
+        uncertain |= np.abs(scaled - np.floor(scaled) - 0.5) <= scaled * 1e-15
+        exponent = exponent + (mantissa >= 10**(precision + 1)) - (mantissa < 10**precision)
+    return mantissa, exponent, uncertain
+
+def _scientific_strings(mantissa, exponent, precision, exp_digits):
+    """Assemble "d.ddde+XX" strings from mantissa/exponent arrays"""
+    digits = _digit_codes(mantissa, precision + 1)
+    n = len(mantissa)
+    columns = [digits[:, :1]]
+    if precision > 0:
+        columns += [np.full((n, 1), ord('.'), np.uint32), digits[:, 1:]]
+    columns += [np.full((n, 1), ord('e'), np.uint32),
+                np.where(exponent < 0, ord('-'), ord('+')).astype(np.uint32)[:, None],
+                _digit_codes(np.abs(exponent), exp_digits)]
+    return _codes_to_strings(np.hstack(columns))
+
 def format_time_elapsed(seconds):
-    """Convert seconds to human-readable format"""
-    years = seconds / (365.25 * 24 * 3600)
-    
-    if years >= 1e12:
-        return f"{years/1e12:.3f} Trillion Years"
-    elif years >= 1e9:
-        return f"{years/1e9:.3f} Billion Years"
-    elif years >= 1e6:
-        return f"{years/1e6:.3f} Million Years"
-    elif years >= 1000:
-        return f"{years/1000:.3f} Thousand Years"
-    elif years >= 1:
-        days = (years % 1) * 365.25
-        hours = (days % 1) * 24
-        return f"{int(years)} Years, {int(days)} Days, {int(hours)} Hours"
-    else:
-        days = years * 365.25
-        if days >= 1:
-            hours = (days % 1) * 24
-            minutes = (hours % 1) * 60
-            return f"{int(days)} Days, {int(hours)} Hours, {int(minutes)} Minutes"
-        else:
-            hours = days * 24
-            if hours >= 1:
-                minutes = (hours % 1) * 60
-                seconds_rem = (minutes % 1) * 60
-                return f"{int(hours)} Hours, {int(minutes)} Minutes, {int(seconds_rem)} Seconds"
-            else:
-                minutes = hours * 60
-                seconds_rem = (minutes % 1) * 60
-                return f"{int(minutes)} Minutes, {int(seconds_rem)} Seconds"
+    """Convert seconds to human-readable format (arrays are formatted in bulk)
+
+    Scalars format exactly as f-strings would and raise on NaN/-inf like
+    int() does; in arrays those entries read "N/A".
+    """
+    if np.ndim(seconds) == 0:
+        if not np.isfinite(seconds) and not seconds > 0:
+            int(seconds)  # ValueError for NaN, OverflowError for -inf
+        return str(format_time_elapsed(np.array([seconds], dtype=float))[0])
+    
+    years = np.asarray(seconds, dtype=float) / SECONDS_PER_YEAR
+    days = years * 365.25
+    hours = days * 24
+    minutes = hours * 60
+    out = np.full(years.shape, "N/A", dtype="U64")
+    
+    def put(mask, strings):
+        nonlocal out
+        strings = np.asarray(strings, dtype=str)
+        if strings.dtype.itemsize > out.dtype.itemsize:  # extreme magnitudes outgrow U64
+            out = out.astype(strings.dtype)
+        out[mask] = strings
+    
+    # Magnitude buckets, largest first; each is formatted with a few array ops
+    for low, high, scale, unit in ((1e12, 1e18, 1e12, "Trillion"), (1e9, 1e12, 1e9, "Billion"),
+                                   (1e6, 1e9, 1e6, "Million"), (1000, 1e6, 1000, "Thousand")):
+        mask = (years >= low) & (years < high)
+        if mask.any():
+            put(mask, _join_strings(_format_fixed(years[mask] / scale, 3), f" {unit} Years"))
+    mask = years >= 1e18  # where float fixed point loses digits (and inf): per value
+    put(mask, [f"{value/1e12:.3f} Trillion Years" for value in years[mask]])
+    
+    def whole(values):
+        if not np.all(np.abs(values) < 2.0**63):  # beyond int64: per value
+            return np.array([str(int(v)) for v in values])
+        ints = np.trunc(values).astype(np.int64)
+        if ints.min() >= 0 and ints.max() < len(SMALL_INT_STRINGS):
+            return SMALL_INT_STRINGS[ints]
+        return ints.astype(str)
+    
+    mask = (years >= 1) & (years < 1000)
+    if mask.any():
+        rem_days = (years[mask] % 1) * 365.25
+        put(mask, _join_strings(whole(years[mask]), " Years, ", whole(rem_days), " Days, ",
+                                  whole((rem_days % 1) * 24), " Hours"))
+    mask = (years < 1) & (days >= 1)
+    if mask.any():
+        rem_hours = (days[mask] % 1) * 24
+        put(mask, _join_strings(whole(days[mask]), " Days, ", whole(rem_hours), " Hours, ",
+                                  whole((rem_hours % 1) * 60), " Minutes"))
+    mask = (days < 1) & (hours >= 1)
+    if mask.any():
+        rem_minutes = (hours[mask] % 1) * 60
+        put(mask, _join_strings(whole(hours[mask]), " Hours, ", whole(rem_minutes), " Minutes, ",
+                                  whole((rem_minutes % 1) * 60), " Seconds"))
+    mask = (hours < 1) & np.isfinite(hours)
+    if mask.any():
+        put(mask, _join_strings(whole(minutes[mask]), " Minutes, ",
+                                  whole((minutes[mask] % 1) * 60), " Seconds"))
+    return out
 
 def format_scientific(value, precision=3):
-    """Format number in scientific notation"""
-    return f"{value:.{precision}e}"
+    """Format number in scientific notation (arrays are formatted in bulk)"""
+    if np.ndim(value) == 0:
+        return f"{value:.{precision}e}"
+    
+    values = np.asarray(value, dtype=float)
+    flat = values.ravel()
+    out = np.empty(flat.shape, dtype=f"U{precision + 8}")
+    magnitude = np.abs(flat)
+    # Zero, inf, nan and extreme exponents (where 10**shift overflows) go
+    # through the f-string per value; everything else is formatted in bulk
+    bulk = (magnitude > 1e-290) & (magnitude < 1e290) & (precision <= 15)  # int64 mantissa
+    mantissa, exponent, uncertain = _scientific_parts(magnitude[bulk], precision)
+    bulk[np.flatnonzero(bulk)[uncertain]] = False
+    mantissa, exponent = mantissa[~uncertain], exponent[~uncertain]
+    strings = np.empty(len(mantissa), dtype=out.dtype)
+    # Buckets by exponent width: e±XX and e±XXX
+    for mask, exp_digits in ((np.abs(exponent) < 100, 2), (np.abs(exponent) >= 100, 3)):
+        if mask.any():
+            strings[mask] = _scientific_strings(mantissa[mask], exponent[mask], precision, exp_digits)
+    negative = flat[bulk] < 0
+    strings[negative] = np.char.add("-", strings[negative])
+    out[bulk] = strings
+    out[~bulk] = [f"{v:.{precision}e}" for v in flat[~bulk]]
+    return out.reshape(values.shape)
+
+# (name, unit, value, display format) for every Advanced Metrics row; values
+# work on scalar and batch calculators, with inf where a dilation factor
+# diverges (shown as ∞) and NaN where a quantity does not exist (shown as N/A)
+METRIC_DEFINITIONS = (
+    ("Black Hole Mass", "kg", lambda calc: calc.M, "{:.6e} kg"),
+    ("Schwarzschild Radius", "m", lambda calc: calc.Rs, "{:.6e} m"),
+    ("ISCO Radius", "m", lambda calc: calc.r_isco, "{:.6e} m"),
+    ("Photon Sphere Radius", "m", lambda calc: calc.r_photon, "{:.6e} m"),
+    ("Ergosphere Radius (θ=π/2)", "m", lambda calc: calc.r_ergosphere, "{:.6e} m"),
+    ("Observer Distance", "m", lambda calc: calc.r, "{:.6e} m"),
+    ("Distance in Rs", "Rs", lambda calc: calc.r / calc.Rs, "{:.8f}"),
+    ("Proximity to Horizon", "m", lambda calc: calc.r - calc.Rs, "{:.6e} m"),
+    ("Proper Distance to Horizon", "m", lambda calc: calc.proper_horizon_distance, "{:.6e} m"),
+    ("Free-Fall Time to Horizon", "s", lambda calc: calc.infall_proper_time, "{:.6e} s"),
+    ("Gravitational Time Dilation", "dimensionless", lambda calc: np.divide(1.0, calc.gravitational_dilation), "{:.6e}×"),
+    ("Kerr Time Dilation", "dimensionless", lambda calc: np.divide(1.0, calc.kerr_time_dilation), "{:.6e}×"),
+    ("Total Time Dilation", "dimensionless", lambda calc: np.divide(1.0, calc.total_dilation), "{:.6e}×"),
+    ("Gravitational Redshift", "dimensionless", lambda calc: calc.gravitational_redshift, "{:.6e}"),
+    ("Frame Dragging Frequency", "rad/s", lambda calc: calc.frame_dragging, "{:.6e} rad/s"),
+    ("Geodesic Precession", "rad/orbit", lambda calc: calc.geodesic_precession, "{:.6e} rad/orbit"),
+    ("Escape Velocity", "c", lambda calc: calc.escape_velocity, "{:.8f} c"),
+    ("Orbital Velocity", "c", lambda calc: calc.orbital_velocity, "{:.8f} c"),
+    ("Orbital Period", "s", lambda calc: np.where(calc.orbital_velocity > 0,
+                                                  2*np.pi*calc.r / (calc.orbital_velocity*C), np.nan), "{:.6e} s"),
+    ("Orbital Frequency", "Hz", lambda calc: calc.calc_orbital_frequency(), "{:.6e} Hz"),
+    ("Tidal Gradient", "m/s²/m", lambda calc: calc.tidal_force, "{:.6e} m/s²/m"),
+    ("Kretschmann Scalar", "m⁻⁴", lambda calc: calc.kretschmann_scalar, "{:.6e} m⁻⁴"),
+    ("Hawking Temperature", "K", lambda calc: calc.hawking_temp, "{:.6e} K"),
+    ("Bekenstein-Hawking Entropy", "J/K", lambda calc: calc.bekenstein_hawking_entropy, "{:.6e} J/K"),
+    ("Hawking Luminosity", "W", lambda calc: calc.luminosity, "{:.6e} W"),
+    ("Specific Angular Momentum", "m²/s", lambda calc: calc.calc_specific_angular_momentum(), "{:.6e} m²/s"),
+)
+
+def format_metric(template, value):
+    """Display string for one Advanced Metrics value"""
+    if np.isnan(value):
+        return "N/A"
+    return template.format(value) if np.isfinite(value) else "∞"
+
+def build_metrics_table(calc):
+    """Build the Advanced Metrics table for a calculator"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = [format_metric(template, value(calc)) for _, _, value, template in METRIC_DEFINITIONS]
+    return pd.DataFrame({
+        "Metric": [name for name, _, _, _ in METRIC_DEFINITIONS],
+        "Value": values,
+        "Unit": [unit for _, unit, _, _ in METRIC_DEFINITIONS],
+    })
+
+def render_figure_png(fig, bbox_inches='tight', dpi=200):
+    """Render a matplotlib figure to PNG bytes (same options as st.pyplot)"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches=bbox_inches)
+    return buf.getvalue()
 
 # ============================================================================
-# VISUALIZATION FUNCTIONS
+# METRIC EXPORT
 # ============================================================================
-def create_matplotlib_visualization(calc):
-    """Create comprehensive matplotlib visualization"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 14))
-    fig.patch.set_facecolor('#0e1117')
-    
-    # Plot 1: Schwarzschild Geometry
-    ax1.set_facecolor('#1a1c24')
-    theta = np.linspace(0, 2*np.pi, 1000)
-    
-    # Event horizon
-    eh_x = calc.Rs/1e9 * np.cos(theta)
-    eh_y = calc.Rs/1e9 * np.sin(theta)
-    ax1.fill(eh_x, eh_y, color='black', alpha=1)
-    ax1.plot(eh_x, eh_y, color='#ff3366', linewidth=3, label='Event Horizon')
-    
-    # Ergosphere
-    if calc.a > 0:
-        erg_x = calc.r_ergosphere/1e9 * np.cos(theta)
-        erg_y = calc.r_ergosphere/1e9 * np.sin(theta)
-        ax1.plot(erg_x, erg_y, '-.', color='#ff3366', linewidth=2, label='Ergosphere', alpha=0.5)
-    
-    # Photon sphere
-    ps_x = calc.r_photon/1e9 * np.cos(theta)
-    ps_y = calc.r_photon/1e9 * np.sin(theta)
-    ax1.plot(ps_x, ps_y, '--', color='#ffcc00', linewidth=2, label='Photon Sphere', alpha=0.7)
-    
-    # ISCO
-    isco_x = calc.r_isco/1e9 * np.cos(theta)
-    isco_y = calc.r_isco/1e9 * np.sin(theta)
-    ax1.plot(isco_x, isco_y, '--', color='#00ffcc', linewidth=2, label='ISCO', alpha=0.7)
-    
-    # Observer position
-    pos_angle = np.pi/4
-    pos_x = calc.r/1e9 * np.cos(pos_angle)
-    pos_y = calc.r/1e9 * np.sin(pos_angle)
-    ax1.plot(pos_x, pos_y, 'o', color='#00ff00', markersize=15, label='Observer', zorder=5)
-    
-    # Accretion disk rings
-    for i in range(8):
-        radius = calc.r_isco/1e9 + i * calc.Rs/1e9 * 0.3
-        alpha_val = 0.4 - i*0.04
-        circle = Circle((0, 0), radius, fill=False, color='#ff9933', 
-                       alpha=max(alpha_val, 0.05), linewidth=1.5)
-        ax1.add_patch(circle)
-    
-    max_radius = max(calc.r/1e9*1.5, calc.r_isco/1e9*2)
-    ax1.set_xlim(-max_radius, max_radius)
-    ax1.set_ylim(-max_radius, max_radius)
-    ax1.set_xlabel('Distance (million km)', color='white', fontsize=11)
-    ax1.set_ylabel('Distance (million km)', color='white', fontsize=11)
-    ax1.set_title('Schwarzschild Geometry & Critical Radii', color='#00ffcc', 
-                 fontsize=13, fontweight='bold')
-    ax1.tick_params(colors='white')
-    ax1.legend(loc='upper right', facecolor='#1a1c24', edgecolor='#00ffcc', 
-              labelcolor='white', fontsize=9)
-    ax1.grid(True, alpha=0.2, color='#444')
-    ax1.set_aspect('equal')
-    
-    # Plot 2: Time Dilation Profile
-    ax2.set_facecolor('#1a1c24')
-    r_range = np.linspace(calc.Rs * 1.001, calc.Rs * 20, 2000)
-    dilation_curve = []
-    for r_val in r_range:
-        if r_val > calc.Rs:
-            dil = 1 / np.sqrt(1 - calc.Rs / r_val)
-            dilation_curve.append(dil)
+EXPORT_CHUNK_ROWS = 10_000
+EXPORT_MAX_ROWS = 1_000_000
+EXPORT_PRECISION = 9  # digits after the point: 10 significant figures
+
+# codec: (file suffix, mime type); zstd only when zstandard is installed
+EXPORT_CODECS = {"gzip": (".csv.gz", "application/gzip")}
+if zstandard is not None:
+    EXPORT_CODECS["zstd"] = (".csv.zst", "application/zstd")
+
+# Input columns leading every export row: (header, calculator attribute)
+EXPORT_INPUT_COLUMNS = (
+    ("Mass [×10⁶ M☉]", "mass_multiplier"),
+    ("Distance Offset [log₁₀ m]", "distance_offset_log"),
+    ("Spin [a/M]", "spin_param"),
+    ("Observer Velocity [c]", "observer_velocity"),
+    ("Polar Angle θ [rad]", "theta"),
+)
+
+# Sweepable inputs: params key -> (label, low, high, log spaced); ranges match the sidebar
+EXPORT_SWEEPS = {
+    "mass": ("Black Hole Mass (×10⁶ M☉)", 0.001, 10000.0, True),
+    "distance_log": ("Distance Offset (log₁₀ meters)", -5.0, 10.0, False),
+    "spin": ("Spin Parameter (a/M)", 0.0, 0.998, False),
+    "velocity": ("Observer Velocity (fraction of c)", 0.0, 0.99, False),
+    "theta": ("Polar Angle θ (radians)", 0.0, float(np.pi), False),
+}
+
+def metrics_frame(calc):
+    """Inputs plus every Advanced Metrics value (with units) as numeric columns"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        columns = [getattr(calc, attr) for _, attr in EXPORT_INPUT_COLUMNS]
+        columns += [value(calc) for _, _, value, _ in METRIC_DEFINITIONS]
+    headers = [header for header, _ in EXPORT_INPUT_COLUMNS]
+    headers += [f"{name} [{unit}]" for name, unit, _, _ in METRIC_DEFINITIONS]
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(column, dtype=float)) for column in columns))
+    return pd.DataFrame(dict(zip(headers, columns)))
+
+def metrics_csv(frame, header=True):
+    """CSV text for a metrics frame, formatted in bulk by format_scientific"""
+    cells = format_scientific(frame.to_numpy(), EXPORT_PRECISION)
+    rows = cells[:, 0]
+    for column in range(1, cells.shape[1]):
+        rows = _join_strings(rows, ",", cells[:, column])
+    lines = rows.tolist()
+    if header:
+        lines.insert(0, ",".join(frame.columns))
+    return "\n".join(lines) + "\n"
+
+def sweep_calculators(params, name, start, stop, n_points, log_spaced=False, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Batch calculators over one swept input, chunk_rows points at a time
+    
+    The other inputs stay at params. Sweep values are generated per chunk,
+    so no array ever spans the whole sweep.
+    """
+    for first in range(0, n_points, chunk_rows):
+        fraction = np.arange(first, min(first + chunk_rows, n_points)) / max(n_points - 1, 1)
+        if log_spaced:
+            values = start * (stop / start) ** fraction
         else:
-            dilation_curve.append(np.nan)
-    
-    ax2.plot(r_range/calc.Rs, dilation_curve, color='#00ffcc', linewidth=3)
-    ax2.axvline(calc.r/calc.Rs, color='#ff3366', linestyle='--', linewidth=2, 
-               label=f'Current: {calc.r/calc.Rs:.4f} Rs')
-    if calc.gravitational_dilation > 0:
-        ax2.axhline(1/calc.gravitational_dilation, color='#ff3366', linestyle='--', 
-                   linewidth=2, alpha=0.5)
-    
-    ax2.set_xlabel('Distance (Schwarzschild Radii)', color='white', fontsize=11)
-    ax2.set_ylabel('Time Dilation Factor', color='white', fontsize=11)
-    ax2.set_title('Gravitational Time Dilation Profile', color='#00ffcc', 
-                 fontsize=13, fontweight='bold')
-    ax2.set_xlim(1, 20)
-    ax2.tick_params(colors='white')
-    ax2.legend(facecolor='#1a1c24', edgecolor='#00ffcc', labelcolor='white', fontsize=9)
-    ax2.grid(True, alpha=0.2, color='#444')
-    ax2.set_yscale('log')
-    
-    # Plot 3: Tidal Forces
-    ax3.set_facecolor('#1a1c24')
-    r_range_tidal = np.linspace(calc.Rs * 1.001, calc.Rs * 50, 2000)
-    tidal_forces = (2 * G * calc.M) / (r_range_tidal**3)
-    
-    ax3.plot(r_range_tidal/calc.Rs, tidal_forces, color='#ff3366', linewidth=3)
-    ax3.axvline(calc.r/calc.Rs, color='#00ffcc', linestyle='--', linewidth=2, 
-               label=f'Current: {calc.tidal_force:.2e} m/s²/m')
-    ax3.axhline(10, color='#ffcc00', linestyle=':', linewidth=2, 
-               label='Human tolerance (~10 m/s²/m)', alpha=0.7)
-    
-    ax3.set_xlabel('Distance (Schwarzschild Radii)', color='white', fontsize=11)
-    ax3.set_ylabel('Tidal Gradient (m/s²/m)', color='white', fontsize=11)
-    ax3.set_title('Tidal Force Gradient (Spaghettification)', color='#00ffcc', 
-                 fontsize=13, fontweight='bold')
-    ax3.tick_params(colors='white')
-    ax3.legend(facecolor='#1a1c24', edgecolor='#00ffcc', labelcolor='white', fontsize=9)
-    ax3.grid(True, alpha=0.2, color='#444')
-    ax3.set_yscale('log')
-    
-    # Plot 4: Effective Potential
-    ax4.set_facecolor('#1a1c24')
-    r_pot = np.linspace(calc.Rs * 1.5, calc.Rs * 30, 2000)
-    
-    L_values = [2.5, 3, 3.5, 4, 5]
-    colors = ['#ff3366', '#ff6699', '#ffcc00', '#00ffcc', '#9933ff']
-    
-    for L, color in zip(L_values, colors):
-        V_eff = -1/r_pot + L**2/(2*r_pot**2) - (calc.Rs * L**2)/(r_pot**3)
-        ax4.plot(r_pot/calc.Rs, V_eff * 1e6, color=color, linewidth=2.5, 
-                label=f'L = {L}√(GM/c)', alpha=0.8)
-    
-    ax4.axvline(calc.r/calc.Rs, color='white', linestyle='--', linewidth=2, alpha=0.5)
-    ax4.axvline(calc.r_isco/calc.Rs, color='#00ffcc', linestyle=':', linewidth=2, 
-               label='ISCO', alpha=0.7)
-    
-    ax4.set_xlabel('Distance (Schwarzschild Radii)', color='white', fontsize=11)
-    ax4.set_ylabel('Effective Potential (×10⁻⁶)', color='white', fontsize=11)
-    ax4.set_title('Effective Potential for Orbital Motion', color='#00ffcc', 
-                 fontsize=13, fontweight='bold')
-    ax4.tick_params(colors='white')
-    ax4.legend(facecolor='#1a1c24', edgecolor='#00ffcc', labelcolor='white', fontsize=8)
-    ax4.grid(True, alpha=0.2, color='#444')
-    ax4.set_ylim(-4, 1)
-    
-    plt.tight_layout()
-    return fig
+            values = start + (stop - start) * fraction
+        inputs = {**params, name: values}
+        yield RelativisticCalculator(inputs["mass"], inputs["distance_log"], inputs["spin"],
+                                     inputs["velocity"], inputs["theta"], inputs["observer"])
+
+def open_compressor(fileobj, codec):
+    """Binary write stream compressing into fileobj (left open on close)"""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).stream_writer(fileobj, closefd=False)
+    return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=1, mtime=0)
+
+def write_metrics_export(calcs, codec="gzip"):
+    """Stream metric CSV chunks through the compressor into a temporary file
+    
+    Only one chunk of rows is held as text at a time. Returns the unbuffered
+    (RawIOBase) file rewound to the start, which st.download_button accepts
+    from a deferred data callable.
+    """
+    output = tempfile.TemporaryFile(buffering=0)
+    with open_compressor(output, codec) as stream:
+        for i, calc in enumerate(calcs):
+            stream.write(metrics_csv(metrics_frame(calc), header=(i == 0)).encode("utf-8"))
+    output.seek(0)
+    return output
+
+# ============================================================================
+# VISUALIZATION FUNCTIONS
+# ============================================================================
+GEOMETRY_DPI = 100  # 1600×1400 px, wider than any column the image is shown in
+
+@st.cache_resource(show_spinner=False)
+def get_matplotlib_lock():
+    """Process-wide lock around matplotlib drawing
+    
+    Matplotlib's mathtext parser and font cache are process-global and not
+    thread-safe; sessions and the preset warm-up run on separate threads.
+    Each rerun executes a fresh __main__ module, so a module-level lock
+    would not be shared between them.
+    """
+    return threading.Lock()
+
+class GeometryFigure:
+    """Four-panel geometry figure built once and updated in place
+    
+    The figure lives on its own Agg canvas, outside pyplot's global figure
+    registry. `update` moves line data, patches and axis limits; no artists
+    are created after __init__.
+    """
+    LEGEND_STYLE = dict(facecolor='#1a1c24', edgecolor='#00ffcc', labelcolor='white')
+    N_RINGS = 8
+    L_VALUES = (2.5, 3, 3.5, 4, 5)
+    L_COLORS = ('#ff3366', '#ff6699', '#ffcc00', '#00ffcc', '#9933ff')
+    
+    def __init__(self):
+        self.figure = Figure(figsize=(16, 14), layout='tight')
+        FigureCanvasAgg(self.figure)
+        self.figure.patch.set_facecolor('#0e1117')
+        ax1, ax2, ax3, ax4 = self.figure.subplots(2, 2).flat
+        self.axes = (ax1, ax2, ax3, ax4)
+        for ax in self.axes:
+            ax.set_facecolor('#1a1c24')
+            ax.tick_params(colors='white')
+            ax.grid(True, alpha=0.2, color='#444')
+        
+        # Plot 1: Schwarzschild Geometry (radii are unit circles scaled on update)
+        self.unit_circle = np.linspace(0, 2*np.pi, 1000)
+        self.horizon_fill, = ax1.fill(np.cos(self.unit_circle), np.sin(self.unit_circle),
+                                      color='black', alpha=1)
+        self.horizon, = ax1.plot([], [], color='#ff3366', linewidth=3, label='Event Horizon')
+        self.ergosphere, = ax1.plot([], [], '-.', color='#ff3366', linewidth=2,
+                                    label='Ergosphere', alpha=0.5)
+        self.photon_sphere, = ax1.plot([], [], '--', color='#ffcc00', linewidth=2,
+                                       label='Photon Sphere', alpha=0.7)
+        self.isco, = ax1.plot([], [], '--', color='#00ffcc', linewidth=2, label='ISCO', alpha=0.7)
+        self.observer, = ax1.plot([], [], 'o', color='#00ff00', markersize=15,
+                                  label='Observer', zorder=5)
+        self.rings = [ax1.add_patch(Circle((0, 0), 1, fill=False, color='#ff9933', linewidth=1.5))
+                      for _ in range(self.N_RINGS)]
+        ax1.set_xlabel('Distance (million km)', color='white', fontsize=11)
+        ax1.set_ylabel('Distance (million km)', color='white', fontsize=11)
+        ax1.set_title('Schwarzschild Geometry & Critical Radii', color='#00ffcc', 
+                     fontsize=13, fontweight='bold')
+        ax1.set_aspect('equal')
+        # Ergosphere last, so hiding it for a = 0 only blanks the bottom row
+        self.geometry_legend = ax1.legend(handles=[self.horizon, self.photon_sphere, self.isco, self.observer,
+                                                   self.ergosphere],
+                                          loc='upper right', fontsize=9, **self.LEGEND_STYLE)
+        
+        # Plot 2: Time Dilation Profile (in units of Rs the curve is mass independent)
+        x_dilation = np.linspace(1.001, 20, 2000)
+        self.dilation_curve, = ax2.plot(x_dilation, 1 / np.sqrt(1 - 1 / x_dilation),
+                                        color='#00ffcc', linewidth=3)
+        self.dilation_position = ax2.axvline(1, color='#ff3366', linestyle='--', linewidth=2,
+                                             label='Current')
+        self.dilation_level = ax2.axhline(1, color='#ff3366', linestyle='--', 
+                                          linewidth=2, alpha=0.5)
+        ax2.set_xlabel('Distance (Schwarzschild Radii)', color='white', fontsize=11)
+        ax2.set_ylabel('Time Dilation Factor', color='white', fontsize=11)
+        ax2.set_title('Gravitational Time Dilation Profile', color='#00ffcc', 
+                     fontsize=13, fontweight='bold')
+        ax2.set_xlim(1, 20)
+        ax2.set_yscale('log')
+        self.dilation_legend = ax2.legend(fontsize=9, **self.LEGEND_STYLE)
+        
+        # Plot 3: Tidal Forces (∝ 1/M² at fixed r/Rs)
+        self.x_tidal = np.linspace(1.001, 50, 2000)
+        self.tidal, = ax3.plot(self.x_tidal, np.ones_like(self.x_tidal), color='#ff3366', linewidth=3)
+        self.tidal_position = ax3.axvline(1, color='#00ffcc', linestyle='--', linewidth=2,
+                                          label='Current')
+        ax3.axhline(10, color='#ffcc00', linestyle=':', linewidth=2, 
+                   label='Human tolerance (~10 m/s²/m)', alpha=0.7)
+        ax3.set_xlabel('Distance (Schwarzschild Radii)', color='white', fontsize=11)
+        ax3.set_ylabel('Tidal Gradient (m/s²/m)', color='white', fontsize=11)
+        ax3.set_title('Tidal Force Gradient (Spaghettification)', color='#00ffcc', 
+                     fontsize=13, fontweight='bold')
+        ax3.set_yscale('log')
+        self.tidal_legend = ax3.legend(fontsize=9, **self.LEGEND_STYLE)
+        
+        # Plot 4: Effective Potential
+        self.x_potential = np.linspace(1.5, 30, 2000)
+        self.potentials = [ax4.plot(self.x_potential, np.zeros_like(self.x_potential), color=color,
+                                    linewidth=2.5, label=f'L = {L}√(GM/c)', alpha=0.8)[0]
+                           for L, color in zip(self.L_VALUES, self.L_COLORS)]
+        self.potential_position = ax4.axvline(1, color='white', linestyle='--', linewidth=2, alpha=0.5)
+        self.potential_isco = ax4.axvline(1, color='#00ffcc', linestyle=':', linewidth=2, 
+                                          label='ISCO', alpha=0.7)
+        ax4.set_xlabel('Distance (Schwarzschild Radii)', color='white', fontsize=11)
+        ax4.set_ylabel('Effective Potential (×10⁻⁶)', color='white', fontsize=11)
+        ax4.set_title('Effective Potential for Orbital Motion', color='#00ffcc', 
+                     fontsize=13, fontweight='bold')
+        ax4.legend(fontsize=8, **self.LEGEND_STYLE)
+        ax4.set_ylim(-4, 1)
+    
+    def update(self, calc):
+        """Move every artist to the state described by calc"""
+        ax1, ax2, ax3, ax4 = self.axes
+        cos, sin = np.cos(self.unit_circle), np.sin(self.unit_circle)
+        
+        # Plot 1
+        rs = calc.Rs/1e9
+        self.horizon_fill.set_xy(np.column_stack([rs * cos, rs * sin]))
+        self.horizon.set_data(rs * cos, rs * sin)
+        self.ergosphere.set_data(calc.r_ergosphere/1e9 * cos, calc.r_ergosphere/1e9 * sin)
+        self.ergosphere.set_visible(calc.a > 0)
+        self.photon_sphere.set_data(calc.r_photon/1e9 * cos, calc.r_photon/1e9 * sin)
+        self.isco.set_data(calc.r_isco/1e9 * cos, calc.r_isco/1e9 * sin)
+        pos_angle = np.pi/4
+        self.observer.set_data([calc.r/1e9 * np.cos(pos_angle)], [calc.r/1e9 * np.sin(pos_angle)])
+        
+        # Accretion disk rings (equal-luminosity radii, opacity ∝ local flux)
+        ring_radii, ring_flux = disk_ring_radii(calc.mass_multiplier, calc.a, n_rings=self.N_RINGS)
+        for ring, radius, rel_flux in zip(self.rings, ring_radii, ring_flux):
+            ring.set_radius(radius/1e9)
+            ring.set_alpha(max(0.4 * rel_flux, 0.05))
+        
+        max_radius = max(calc.r/1e9*1.5, calc.r_isco/1e9*2)
+        ax1.set_xlim(-max_radius, max_radius)
+        ax1.set_ylim(-max_radius, max_radius)
+        self.geometry_legend.legend_handles[-1].set_visible(calc.a > 0)
+        self.geometry_legend.get_texts()[-1].set_visible(calc.a > 0)
+        
+        # Plot 2
+        x_current = calc.r/calc.Rs
+        self.dilation_position.set_xdata([x_current, x_current])
+        self.dilation_legend.get_texts()[0].set_text(f'Current: {x_current:.4f} Rs')
+        if calc.gravitational_dilation > 0:
+            level = 1/calc.gravitational_dilation
+            self.dilation_level.set_ydata([level, level])
+        self.dilation_level.set_visible(calc.gravitational_dilation > 0)
+        levels = [self.dilation_level.get_ydata()[0]] if self.dilation_level.get_visible() else []
+        self.autoscale(ax2, self.dilation_curve, levels)
+        
+        # Plot 3
+        self.tidal.set_ydata((2 * G * calc.M) / (self.x_tidal * calc.Rs)**3)
+        self.tidal_position.set_xdata([x_current, x_current])
+        self.tidal_legend.get_texts()[0].set_text(f'Current: {calc.tidal_force:.2e} m/s²/m')
+        self.autoscale(ax3, self.tidal, [10])
+        
+        # Plot 4
+        r_pot = self.x_potential * calc.Rs
+        for L, line in zip(self.L_VALUES, self.potentials):
+            V_eff = -1/r_pot + L**2/(2*r_pot**2) - (calc.Rs * L**2)/(r_pot**3)
+            line.set_ydata(V_eff * 1e6)
+        self.potential_position.set_xdata([x_current, x_current])
+        x_isco = calc.r_isco/calc.Rs
+        self.potential_isco.set_xdata([x_isco, x_isco])
+        self.autoscale(ax4, self.potentials[0])
+    
+    @staticmethod
+    def autoscale(ax, line, levels=()):
+        """Autoscale to a curve plus horizontal reference levels
+        
+        Reference lines are left out of the data limits (as when the figure
+        was rebuilt from scratch), so moving them never rescales the x axis.
+        """
+        x, y = line.get_data()
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim(np.column_stack([x, y]))
+        if len(levels):
+            ax.update_datalim(np.column_stack([np.full(len(levels), x[0]), levels]))
+        ax.autoscale_view()
+    
+    def render(self, calc):
+        """PNG bytes for calc"""
+        with get_matplotlib_lock():
+            self.update(calc)
+            # The tight layout engine already fits the axes to the canvas;
+            # a tight bbox would only cost a second full draw
+            return render_figure_png(self.figure, bbox_inches=None, dpi=GEOMETRY_DPI)
+
+@st.cache_resource(show_spinner=False)
+def get_geometry_figure():
+    """Geometry figure shared by every session (drawing is serialized by the lock anyway)"""
+    return GeometryFigure()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def geometry_figure_png(mass, distance_log, spin, theta):
+    """Geometry figure PNG, rendered once per set of inputs across sessions"""
+    return get_geometry_figure().render(RelativisticCalculator(mass, distance_log, spin, 0, theta))
+
+# Kerr surfaces as (θ, φ) meshes in units of r_g, drawn in Kerr-Schild
+# Cartesian coordinates (x + iy = √(r² + a²) sinθ e^{iφ}, z = r cosθ), so the
+# horizons are oblate spheroids. Detail levels are n_θ; n_φ = 2 n_θ.
+SURFACE_MESH_LEVELS = (12, 24, 48)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def kerr_surface_meshes(spin, n_theta):
+    """Outer/inner horizon and ergosurface meshes for one spin (units of r_g)"""
+    theta = np.linspace(0, np.pi, n_theta)[:, None]
+    phi = np.linspace(0, 2 * np.pi, 2 * n_theta)[None, :]
+    root = np.sqrt(1 - spin**2)
+    radii = {
+        "outer_horizon": np.full_like(theta, 1 + root),
+        "inner_horizon": np.full_like(theta, 1 - root),
+        "ergosurface": 1 + np.sqrt(1 - spin**2 * np.cos(theta)**2),
+    }
+    meshes = {}
+    for name, r in radii.items():
+        rho = np.sqrt(r**2 + spin**2) * np.sin(theta)
+        meshes[name] = (rho * np.cos(phi), rho * np.sin(phi), np.broadcast_to(r * np.cos(theta), (n_theta, 2 * n_theta)))
+    return meshes
+
+def surface_mesh_level(horizon_radius, view_extent):
+    """Mesh resolution for a horizon occupying horizon_radius/view_extent of the view"""
+    # A horizon filling a third of the view gets the finest level; snapped so the cache hits
+    wanted = 150 * horizon_radius / view_extent
+    return next((level for level in SURFACE_MESH_LEVELS if level >= wanted), SURFACE_MESH_LEVELS[-1])
 
 def create_plotly_3d_visualization(calc):
     """Create interactive 3D visualization of spacetime curvature"""
@@ -678,18 +2448,29 @@ def create_plotly_3d_visualization(calc):
         opacity=0.9
     )])
     
-    # Add event horizon circle
-    theta_eh = np.linspace(0, 2*np.pi, 100)
-    x_eh = calc.Rs/1e9 * np.cos(theta_eh)
-    y_eh = calc.Rs/1e9 * np.sin(theta_eh)
-    z_eh = np.zeros_like(x_eh)
-    
-    fig.add_trace(go.Scatter3d(
-        x=x_eh, y=y_eh, z=z_eh,
-        mode='lines',
-        line=dict(color='#ff3366', width=5),
-        name='Event Horizon'
-    ))
+    # Horizons and ergosurface, rescaled from the per-spin meshes
+    spin = float(calc.a)
+    n_theta = surface_mesh_level(calc.r_g * (1 + np.sqrt(1 - spin**2)), calc.r * 3)
+    meshes = kerr_surface_meshes(spin, n_theta)
+    scale = calc.r_g / 1e9
+    surfaces = [("outer_horizon", "Event Horizon", '#ff3366', 1.0, True),
+                ("ergosurface", "Ergosurface", '#9933ff', 0.25, spin > 0),
+                ("inner_horizon", "Inner Horizon", '#00ffcc', 0.6, spin > 0)]
+    for key, name, color, opacity, shown in surfaces:
+        if not shown:
+            continue
+        # float32 halves the figure payload; far below the pixel resolution anyway
+        x, y, z = (np.float32(scale) * coord.astype(np.float32) for coord in meshes[key])
+        fig.add_trace(go.Surface(
+            x=x, y=y, z=z,
+            colorscale=[[0, color], [1, color]],
+            showscale=False,
+            opacity=opacity,
+            name=name,
+            showlegend=True,
+            visible=True if key != "inner_horizon" else 'legendonly',
+            hoverinfo='name'
+        ))
     
     fig.update_layout(
         scene=dict(
@@ -699,7 +2480,8 @@ def create_plotly_3d_visualization(calc):
                       title='Y (million km)', tickfont=dict(color='#00ffcc')),
             zaxis=dict(backgroundcolor='#0e1117', gridcolor='#333', showbackground=True,
                       title='Curvature', tickfont=dict(color='#00ffcc')),
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.2))
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.2)),
+            aspectmode='data'  # keep the horizons' true oblate shape
         ),
         paper_bgcolor='#0e1117',
         plot_bgcolor='#0e1117',
@@ -715,10 +2497,1384 @@ def create_plotly_3d_visualization(calc):
     
     return fig
 
+def create_dilation_profile_figure(calc):
+    """Create interactive time dilation vs distance plot"""
+    r_range = np.linspace(calc.Rs * 1.01, calc.Rs * 50, 1000)
+    dilation_vals = []
+    for r in r_range:
+        if r > calc.Rs:
+            dilation_vals.append(1 / np.sqrt(1 - calc.Rs / r))
+        else:
+            dilation_vals.append(np.nan)
+
+    fig_dilation = go.Figure()
+    fig_dilation.add_trace(go.Scatter(
+        x=r_range/calc.Rs,
+        y=dilation_vals,
+        mode='lines',
+        name='Time Dilation',
+        line=dict(color='#00ffcc', width=3)
+    ))
+    fig_dilation.add_vline(x=calc.r/calc.Rs, line_dash="dash", line_color="#ff3366",
+                          annotation_text="Current Position")
+    fig_dilation.update_layout(
+        title="Time Dilation vs Distance",
+        xaxis_title="Distance (Schwarzschild Radii)",
+        yaxis_title="Time Dilation Factor",
+        yaxis_type="log",
+        paper_bgcolor='#0e1117',
+        plot_bgcolor='#1a1c24',
+        font=dict(color='#00ffcc'),
+        xaxis=dict(gridcolor='#333'),
+        yaxis=dict(gridcolor='#333')
+    )
+    
+    return fig_dilation
+
+# ============================================================================
+# PANEL RENDER CACHE
+# ============================================================================
+# Inputs each cached panel actually reads. A full rerun still walks every tab,
+# but a panel whose inputs did not change is served from cache instead of
+# being rebuilt (e.g. moving the velocity slider touches none of these).
+PANEL_DEPENDENCIES = {
+    "geometry_figure": ("mass", "distance_log", "spin", "theta"),
+    "embedding_3d": ("mass", "distance_log", "spin"),
+    "dilation_profile": ("mass", "distance_log"),
+    "explorer": ("mass", "velocity", "theta", "observer", "backend"),
+    "gw_inspiral": ("mass", "spin"),
+}
+
+def panel_inputs(panel, params):
+    """Pick the inputs a panel depends on, in declaration order"""
+    return tuple(params[name] for name in PANEL_DEPENDENCIES[panel])
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def embedding_figure_json(mass, distance_log, spin):
+    """3D embedding diagram as plotly JSON"""
+    calc = RelativisticCalculator(mass, distance_log, spin)
+    return create_plotly_3d_visualization(calc).to_json()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def inspiral_plot_data(mass, spin, log_q, r_start, distance_mpc, tail=4096, max_samples=2**22):
+    """Final strain samples before the ISCO (t, h+, h×) and the inspiral ASD (freqs, asd)"""
+    wave = InspiralWaveform(mass, spin, 10**log_q, r_start, distance_mpc)
+    return wave.strain(max(wave.n_samples - tail, 0), wave.n_samples), wave.spectrum(max_samples=max_samples)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def dilation_profile_json(mass, distance_log):
+    """Time dilation profile as plotly JSON"""
+    calc = RelativisticCalculator(mass, distance_log)
+    return create_dilation_profile_figure(calc).to_json()
+
+# ============================================================================
+# CLIENT-SIDE EXPLORER
+# ============================================================================
+# The explorer ships a distance_log × spin grid of dashboard metrics to the
+# browser once per (mass, velocity, θ, observer); its sliders then interpolate
+# in JavaScript without a server round trip.
+EXPLORER_DISTANCE = (-5.0, 10.0, 151)  # sidebar range, 0.1 dex
+EXPLORER_SPIN = (0.0, 0.998, 51)
+# plotly.js is inlined from the installed package so the explorer works
+# offline; SPACETIME_PLOTLY_CDN=1 loads it from cdn.plot.ly instead (4.8 MB
+# lighter pages, but the browser needs network access)
+EXPLORER_PLOTLY_CDN = os.environ.get("SPACETIME_PLOTLY_CDN", "0") not in ("", "0")
+# label: (calculator output, transform, interpolated in log10)
+EXPLORER_METRICS = {
+    "Time Dilation Factor (×)": ("total_dilation", lambda v: 1 / v, True),
+    "Gravitational Redshift (z)": ("gravitational_redshift", None, True),
+    "Tidal Gradient (m/s²/m)": ("tidal_force", None, True),
+    "Escape Velocity (c)": ("escape_velocity", None, False),
+    "Orbital Velocity (c)": ("orbital_velocity", None, False),
+}
+
+def explorer_grid(mass, velocity, theta, observer, backend=None):
+    """Dashboard metrics over the explorer grid, shaped (spin, distance_log)
+    
+    Log-interpolated metrics are stored as log10; values with no finite
+    result (e.g. no circular orbit) become NaN.
+    """
+    distance_axis = np.linspace(*EXPLORER_DISTANCE)
+    spin_axis = np.linspace(*EXPLORER_SPIN)
+    outputs = evaluate_batch(mass, distance_axis[None, :], spin_axis[:, None], velocity, theta, observer,
+                             tuple(name for name, _, _ in EXPLORER_METRICS.values()), backend)
+    grid = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for label, (name, transform, log_scale) in EXPLORER_METRICS.items():
+            values = transform(outputs[name]) if transform else outputs[name]
+            values = np.log10(values) if log_scale else values
+            grid[label] = np.where(np.isfinite(values), values, np.nan)
+    return distance_axis, spin_axis, grid
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def explorer_grid_json(mass, velocity, theta, observer, backend=None):
+    """The explorer grid as JSON, metrics encoded as base64 float32"""
+    distance_axis, spin_axis, grid = explorer_grid(mass, velocity, theta, observer, backend)
+    return json.dumps({
+        "distance": {"min": EXPLORER_DISTANCE[0], "max": EXPLORER_DISTANCE[1], "n": len(distance_axis)},
+        "spin": {"min": EXPLORER_SPIN[0], "max": EXPLORER_SPIN[1], "n": len(spin_axis)},
+        "metrics": [{"label": label, "log": EXPLORER_METRICS[label][2],
+                     "data": base64.b64encode(values.astype('<f4').tobytes()).decode()}
+                    for label, values in grid.items()],
+    })
+
+@st.cache_resource(show_spinner=False)
+def explorer_plotly_script():
+    """<script> tag loading plotly.js, inlined or from the CDN build of the installed version"""
+    if EXPLORER_PLOTLY_CDN:
+        return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+    return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+def explorer_html(params):
+    """Self-contained explorer page, opened at the sidebar's distance and spin"""
+    start = {"distance": params["distance_log"], "spin": params["spin"]}
+    return (EXPLORER_TEMPLATE
+            .replace("__GRID__", explorer_grid_json(*panel_inputs("explorer", params)))
+            .replace("__START__", json.dumps(start))
+            .replace("__PLOTLY__", explorer_plotly_script()))  # last: the bundle is 4.8 MB
+
+EXPLORER_TEMPLATE = """
+<style>
+  body { margin: 0; background: transparent; color: #e0e0e0; font-family: sans-serif; }
+  .controls { display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1.5rem; margin-bottom: 0.8rem; }
+  .controls label { font-size: 0.85rem; color: #00ffcc; }
+  .controls input, .controls select { width: 100%; margin-top: 0.3rem; }
+  .controls select { background: #1a1a2e; color: #e0e0e0; border: 1px solid #00ffcc; padding: 0.2rem; }
+  .cards { display: grid; grid-template-columns: repeat(5, 1fr); gap: 0.6rem; margin-bottom: 0.6rem; }
+  .card { border: 1px solid rgba(0, 255, 204, 0.3); border-radius: 8px; padding: 0.5rem; text-align: center; }
+  .card .label { font-size: 0.7rem; color: #999; }
+  .card .value { font-size: 1.1rem; color: #00ffcc; font-family: monospace; }
+  .plots { display: grid; grid-template-columns: 1fr 1fr; gap: 0.6rem; }
+</style>
+<div class="controls">
+  <label>Distance Offset (log₁₀ m): <b id="distance-value"></b>
+    <input type="range" id="distance" step="0.01"></label>
+  <label>Spin (a/M): <b id="spin-value"></b>
+    <input type="range" id="spin" step="0.001"></label>
+  <label>Plotted Metric <select id="metric"></select></label>
+</div>
+<div class="cards" id="cards"></div>
+<div class="plots"><div id="map"></div><div id="profile"></div></div>
+__PLOTLY__
+<script>
+const GRID = __GRID__, START = __START__;
+const D = GRID.distance, S = GRID.spin;
+const decode = b64 => new Float32Array(Uint8Array.from(atob(b64), c => c.charCodeAt(0)).buffer);
+const metrics = GRID.metrics.map(m => ({...m, values: decode(m.data)}));
+const axisValues = a => Array.from({length: a.n}, (_, k) => a.min + k * (a.max - a.min) / (a.n - 1));
+const distanceAxis = axisValues(D), spinAxis = axisValues(S);
+
+// Cell index and fraction along one axis, clamped to the grid
+function locate(a, x) {
+  const t = Math.min(Math.max((x - a.min) / (a.max - a.min) * (a.n - 1), 0), a.n - 1);
+  const k = Math.min(Math.floor(t), a.n - 2);
+  return [k, t - k];
+}
+// Bilinear interpolation; values are row-major [spin][distance], NaN propagates
+function sample(values, d, s) {
+  const [i, fi] = locate(D, d), [j, fj] = locate(S, s);
+  const at = (jj, ii) => values[jj * D.n + ii];
+  return (1 - fj) * ((1 - fi) * at(j, i) + fi * at(j, i + 1))
+       + fj * ((1 - fi) * at(j + 1, i) + fi * at(j + 1, i + 1));
+}
+const display = (m, v) => Number.isNaN(v) ? "—" : m.log ? Math.pow(10, v).toExponential(3) : v.toFixed(4);
+
+const distance = document.getElementById("distance"), spin = document.getElementById("spin");
+const select = document.getElementById("metric"), cards = document.getElementById("cards");
+distance.min = D.min; distance.max = D.max; distance.value = START.distance;
+spin.min = S.min; spin.max = S.max; spin.value = START.spin;
+metrics.forEach((m, k) => {
+  select.add(new Option(m.label, k));
+  cards.insertAdjacentHTML("beforeend",
+    `<div class="card"><div class="label">${m.label}</div><div class="value" id="card-${k}"></div></div>`);
+});
+
+const layout = (title, xTitle, yTitle) => ({
+  title: {text: title, font: {color: "#00ffcc", size: 13}},
+  paper_bgcolor: "#0e1117", plot_bgcolor: "#0e1117", font: {color: "#e0e0e0"},
+  xaxis: {title: {text: xTitle}, gridcolor: "#333"}, yaxis: {title: {text: yTitle}, gridcolor: "#333"},
+  margin: {l: 60, r: 20, t: 40, b: 45}, height: 380, showlegend: false,
+});
+const config = {displaylogo: false, responsive: true};
+
+function drawMap() {
+  const m = metrics[select.value];
+  const z = spinAxis.map((_, j) => Array.from(m.values.subarray(j * D.n, (j + 1) * D.n)));
+  Plotly.react("map", [
+    {type: "heatmap", x: distanceAxis, y: spinAxis, z: z, colorscale: "Plasma",
+     colorbar: {title: {text: m.log ? "log₁₀" : ""}}},
+    {type: "scatter", mode: "markers", x: [+distance.value], y: [+spin.value],
+     marker: {color: "#00ffcc", size: 12, symbol: "x"}},
+  ], layout(m.label, "Distance Offset (log₁₀ m)", "Spin (a/M)"), config);
+}
+
+function update() {
+  const d = +distance.value, s = +spin.value, m = metrics[select.value];
+  document.getElementById("distance-value").textContent = d.toFixed(2);
+  document.getElementById("spin-value").textContent = s.toFixed(3);
+  metrics.forEach((metric, k) => {
+    document.getElementById(`card-${k}`).textContent = display(metric, sample(metric.values, d, s));
+  });
+  Plotly.restyle("map", {x: [[d]], y: [[s]]}, [1]);
+  const profile = distanceAxis.map(x => sample(m.values, x, s));
+  const toValue = v => m.log ? Math.pow(10, v) : v;
+  Plotly.react("profile", [
+    {type: "scatter", mode: "lines", x: distanceAxis, y: profile.map(toValue), line: {color: "#ff3366", width: 2}},
+    {type: "scatter", mode: "markers", x: [d], y: [toValue(sample(m.values, d, s))],
+     marker: {color: "#00ffcc", size: 10}},
+  ], {...layout(`${m.label} at a = ${s.toFixed(3)}`, "Distance Offset (log₁₀ m)", ""),
+      yaxis: {type: m.log ? "log" : "linear", gridcolor: "#333"}}, config);
+}
+
+drawMap();
+update();
+distance.addEventListener("input", update);
+spin.addEventListener("input", update);
+select.addEventListener("change", () => { drawMap(); update(); });
+</script>
+"""
+
+# ============================================================================
+# PRESET CACHE
+# ============================================================================
+class CalculatorSnapshot(RelativisticCalculator):
+    """Fully evaluated, read-only copy of a calculator that sessions can share"""
+    def __init__(self, calc):
+        calc.evaluate(tuple(calc.GRAPH))
+        self.__dict__.update(calc.__dict__)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+def build_preset_bundle(preset, observer):
+    """Compute everything a preset scenario displays"""
+    calc = CalculatorSnapshot(RelativisticCalculator(preset["mass"], preset["distance_log"], preset["spin"],
+                                                     preset["velocity"], PRESET_THETA, observer))
+    return {
+        "calc": calc,
+        "matplotlib_png": geometry_figure_png(preset["mass"], preset["distance_log"], preset["spin"], PRESET_THETA),
+        "plotly_json": create_plotly_3d_visualization(calc).to_json(),
+        "metrics_table": build_metrics_table(calc),
+    }
+
+@st.cache_resource(show_spinner=False)
+def get_preset_registry(scenario, observer):
+    """Result bundle for one preset and observer type, built on first request
+    
+    cache_resource entries have no TTL or max_entries, so the bundles stay
+    pinned for the lifetime of the process and are shared by all sessions.
+    Nothing is built ahead of time, so unused presets cost nothing.
+    """
+    return build_preset_bundle(PRESET_SCENARIOS[scenario], observer)
+
+def get_preset_bundle(scenario, mass, distance_log, spin, velocity, theta, observer="static"):
+    """Return the cached bundle if the controls still match the scenario"""
+    preset = PRESET_SCENARIOS[scenario]
+    current = {"mass": mass, "distance_log": distance_log, "spin": spin, "velocity": velocity}
+    if current != preset or theta != PRESET_THETA:
+        return None
+    return get_preset_registry(scenario, observer)
+
+# ============================================================================
+# TAB PANELS
+# ============================================================================
+MAIN_TABS = ("📊 Dashboard", "🔬 Physics Analysis", "📈 Visualizations",
+             "🧮 Advanced Metrics", "🌊 Gravitational Waves", "📚 Education")
+# Key prefixes of the panel widgets in each tab
+TAB_WIDGET_PREFIXES = {
+    "📊 Dashboard": ("mission_",),
+    "🔬 Physics Analysis": ("signal_", "tde_"),
+    "📈 Visualizations": ("disk_", "lens_", "line_"),
+    "🧮 Advanced Metrics": ("catalog_", "mc_", "sens_"),
+    "🌊 Gravitational Waves": ("gw_",),
+}
+
+def keep_closed_tab_state(open_tab):
+    """Carry the panel widget values of closed tabs over to the next run
+    
+    Only the open tab renders, and Streamlit drops the state of widgets
+    that did not render; re-assigning the values keeps them.
+    """
+    closed = tuple(prefix for tab, prefixes in TAB_WIDGET_PREFIXES.items() if tab != open_tab
+                   for prefix in prefixes)
+    for key in list(st.session_state):
+        if key.startswith(closed):
+            st.session_state[key] = st.session_state[key]
+
+@st.fragment
+def render_dashboard_tab(calc, params):
+    """Dashboard: headline dilation, key metrics and black hole parameters"""
+    # Time displacement highlight
+    hour_on_planet = 3600
+    if calc.total_dilation > 0:
+        earth_seconds = hour_on_planet / calc.total_dilation
+        earth_time_str = format_time_elapsed(earth_seconds)
+        
+        st.markdown(f"""
+        <div class="highlight-box">
+            <div style="font-size: 1.5rem; color: #ffcc00; font-weight: 700;">
+                ⏱️ TEMPORAL DISPLACEMENT CALCULATION
+            </div>
+            <div style="margin: 1rem 0; color: white; font-size: 1.2rem;">
+                For every <span style="color: #00ffcc; font-weight: 900;">1 HOUR</span> experienced by the observer:
+            </div>
+            <div class="highlight-value">
+                {earth_time_str}
+            </div>
+            <div style="color: #ffcc00; font-size: 1.2rem; margin-top: 0.5rem;">
+                passes on Earth
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    elif calc.zamo_dilation > 0 and params["observer"] in ORBITING_OBSERVERS:
+        st.error(f"⚠️ NO {params['observer'].upper()} ORBIT: inside the photon orbit no circular orbit exists at this radius")
+    elif calc.zamo_dilation > 0 and params["observer"] == "static":
+        st.error("⚠️ INSIDE THE ERGOSPHERE: frame dragging makes it impossible to stay static here")
+    else:
+        st.error("⚠️ SINGULARITY REACHED: Inside event horizon - time dilation is infinite!")
+    
+    # Key metrics grid
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Time Dilation Factor",
+            f"{1/calc.total_dilation:,.2f}×" if calc.total_dilation > 0 else "∞",
+            delta=OBSERVER_TYPES[params["observer"]]
+        )
+    
+    with col2:
+        st.metric(
+            "Distance from Center",
+            f"{calc.r/calc.Rs:.6f} Rs",
+            delta=f"{calc.proper_horizon_distance/1e3:.2f} km proper distance to horizon"
+        )
+    
+    with col3:
+        st.metric(
+            "Escape Velocity",
+            f"{calc.escape_velocity:.6f} c",
+            delta=f"{calc.escape_velocity*C/1e3:.0f} km/s"
+        )
+    
+    with col4:
+        st.metric(
+            "Tidal Gradient",
+            f"{calc.tidal_force:.2e} m/s²/m",
+            delta="Spaghettification"
+        )
+    
+    # Danger warning
+    spaghettification = calc.tidal_force * 2  # 2m human
+    if spaghettification > 100:
+        st.markdown(f"""
+        <div class="warning-box">
+            <div class="warning-box-title">⚠️ EXTREME DANGER ZONE</div>
+            <p style="color: #ff6666; font-size: 1.1rem;">
+                Tidal forces exceed survivable limits! Structural integrity of any object would be compromised.
+                A 2-meter tall human would experience <strong>{spaghettification:.2e} m/s²</strong> differential force.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Black hole parameters
+    st.markdown("### 🌌 Black Hole Parameters")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-card-title">Total Mass</div>
+            <div class="metric-card-value">{calc.M:.3e} kg</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-card-title">Schwarzschild Radius</div>
+            <div class="metric-card-value">{calc.Rs/1e6:.4f} million km</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-card-title">ISCO Radius</div>
+            <div class="metric-card-value">{calc.r_isco/1e6:.4f} million km</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-card-title">Photon Sphere</div>
+            <div class="metric-card-value">{calc.r_photon/1e6:.4f} million km</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-card-title">Hawking Temperature</div>
+            <div class="metric-card-value">{calc.hawking_temp:.3e} K</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-card-title">Spin Parameter</div>
+            <div class="metric-card-value">{params["spin"]:.3f}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    render_mission_panel(calc, params)
+
+@st.fragment
+def render_mission_panel(calc, params):
+    """Twin-paradox mission optimizer at the current mass, θ and observer type"""
+    st.markdown("### 🧭 Twin-Paradox Mission Planner")
+    st.caption("Searches dwell radius, dwell time, speed and spin for the largest Earth time gained, "
+               "keeping the tidal stretch on a 2 m body and the local escape velocity within limits.")
+    with st.form("mission_form", border=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            tidal_limit = st.slider("Max Tidal Stretch (m/s² over 2 m)", 1.0, 1000.0, MISSION_TIDAL_LIMIT, 1.0,
+                                    key="mission_tidal")
+        with col2:
+            max_escape = st.slider("Max Escape Velocity (fraction of c)", 0.05, 0.99, 0.5, 0.01,
+                                   key="mission_escape", help="The ship must be able to leave again")
+        with col3:
+            max_hours = st.select_slider("Max Dwell Time (hours)", [1, 10, 100, 1000, 10000], 1000,
+                                         format_func=lambda h: f"{h:,}", key="mission_hours")
+        col1, col2 = st.columns(2)
+        with col1:
+            population = st.select_slider("Candidates per Island", [512, 2048, 8192], 2048,
+                                          format_func=lambda n: f"{n:,}", key="mission_population")
+        with col2:
+            generations = st.select_slider("Generations", [20, 40, 80], 40, key="mission_generations")
+        submitted = st.form_submit_button("🚀 Optimize Mission")
+    
+    # The search only runs on request; later reruns reuse it while the inputs are unchanged
+    request = (params["mass"], params["theta"], params["observer"], tidal_limit, max_escape,
+               float(max_hours), generations, population)
+    if submitted:
+        st.session_state["mission_request"] = request
+    if st.session_state.get("mission_request") != request:
+        st.info("Press **Optimize Mission** to search at the current mass, θ and observer type.")
+        return
+    with st.spinner("Optimizing mission..."):
+        result = optimize_mission(*request, backend=params["backend"])
+    best = result["best"]
+    if best["violation"] > 0:
+        st.warning("No candidate meets both limits at this mass; relax the tidal or escape-velocity limit.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Earth Time Gained", format_time_elapsed(best["gain"]),
+                delta=f"for {10**best['log10_hours']:,.1f} h aboard")
+    col2.metric("Dwell Radius", f"{1 + 10**best['log10_offset_rs']:.4f} Rs",
+                delta=f"escape {best['escape_velocity']:.3f} c")
+    col3.metric("Speed", f"{best['velocity']:.4f} c",
+                delta="set by the orbit" if params["observer"] in ORBITING_OBSERVERS else OBSERVER_TYPES[params["observer"]])
+    col4.metric("Spin", f"{best['spin']:.3f}", delta=f"tidal {best['stretch']:.2e} m/s²")
+    
+    ranked = result["population"]
+    feasible = ranked["violation"] == 0
+    shown = np.linspace(0, len(feasible) - 1, min(len(feasible), 2000)).astype(int)  # keep the payload small
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Best Gain per Generation", "Final Candidates"))
+    for i, gains in enumerate(result["history"]):
+        fig.add_trace(go.Scatter(y=gains / SECONDS_PER_YEAR, mode='lines', name=f"Island {i + 1}"), row=1, col=1)
+    for mask, name, color in ((feasible[shown], "Feasible", '#00ffcc'), (~feasible[shown], "Over a limit", '#ff3366')):
+        fig.add_trace(go.Scattergl(x=1 + 10**ranked["log10_offset_rs"][shown][mask],
+                                   y=ranked["gain"][shown][mask] / SECONDS_PER_YEAR, mode='markers', name=name,
+                                   marker=dict(color=color, size=4, opacity=0.6)), row=1, col=2)
+    fig.update_xaxes(title_text="Generation", gridcolor='#333', row=1, col=1)
+    fig.update_yaxes(title_text="Earth years gained", gridcolor='#333', row=1, col=1)
+    fig.update_xaxes(title_text="Dwell radius (Rs)", type="log", gridcolor='#333', row=1, col=2)
+    fig.update_yaxes(title_text="Earth years gained", type="log", gridcolor='#333', row=1, col=2)
+    fig.update_layout(paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24', font=dict(color='#00ffcc'),
+                      legend=dict(bgcolor='#1a1c24', bordercolor='#00ffcc'), height=450)
+    st.plotly_chart(fig, width='stretch')
+    st.caption(f"{result['evaluated']:,} candidates scored across {MISSION_ISLANDS} islands.")
+
+@st.fragment
+def render_physics_tab(calc, params):
+    """Physics Analysis: relativistic effects, orbits and tidal stress"""
+    st.markdown("## ⚡ Relativistic Effects Analysis")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Gravitational Dilation", 
+                 f"{1/calc.gravitational_dilation:,.4f}×" if calc.gravitational_dilation > 0 else "∞")
+        st.metric("Kerr Time Dilation",
+                 f"{1/calc.kerr_time_dilation:,.4f}×" if calc.kerr_time_dilation > 0 else "∞")
+        st.metric("Kinematic Dilation (SR)",
+                 f"{1/calc.doppler_shift:,.4f}×")
+    
+    with col2:
+        st.metric("Gravitational Redshift (z)",
+                 f"{calc.gravitational_redshift:.6f}" if calc.gravitational_redshift != float('inf') else "∞")
+        st.metric("Frame Dragging (ω)",
+                 f"{calc.frame_dragging:.3e} rad/s")
+        st.metric("Geodesic Precession",
+                 f"{np.degrees(calc.geodesic_precession):.6f}°/orbit")
+    
+    with col3:
+        st.metric("Kretschmann Scalar",
+                 f"{calc.kretschmann_scalar:.3e} m⁻⁴")
+        st.metric("Bekenstein Entropy",
+                 f"{calc.bekenstein_hawking_entropy:.3e} J/K")
+        st.metric("Hawking Luminosity",
+                 f"{calc.luminosity:.3e} W")
+    
+    st.markdown("---")
+    st.markdown("## 🚀 Orbital Mechanics")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        orbital_period = 2 * np.pi * calc.r / (calc.orbital_velocity * C) if calc.orbital_velocity > 0 else 0
+        orbital_freq = calc.calc_orbital_frequency()
+        
+        st.metric("Circular Orbital Velocity",
+                 f"{calc.orbital_velocity:.6f} c",
+                 delta=f"{calc.orbital_velocity*C:,.0f} m/s")
+        st.metric("Orbital Period",
+                 f"{orbital_period/3600:.3f} hours" if orbital_period > 0 else "N/A")
+        st.metric("Orbital Frequency",
+                 f"{orbital_freq:.6e} Hz" if orbital_freq > 0 else "N/A")
+    
+    with col2:
+        spec_ang_mom = calc.calc_specific_angular_momentum()
+        
+        st.metric("Specific Angular Momentum",
+                 f"{spec_ang_mom:.3e} m²/s")
+        
+        if params["spin"] > 0:
+            penrose_eff = calc.calc_energy_extraction_efficiency()
+            st.metric("Penrose Process Efficiency",
+                     f"{penrose_eff:.2f}%",
+                     delta="Energy extraction from rotation")
+        
+        st.metric("Distance to ISCO",
+                 f"{abs(calc.r - calc.r_isco)/1e3:.2f} km",
+                 delta="Stable orbit boundary")
+    
+    st.markdown("#### ⏱️ Clock Rate by Observer Type")
+    x_obs = calc.r / calc.r_g
+    x, curves = observer_dilation_curves(params["spin"], params["theta"],
+                                         x_max=10.0**np.ceil(np.log10(max(100.0, 2 * x_obs))),
+                                         backend=params["backend"])
+    fig = go.Figure()
+    for (kind, label), color in zip(OBSERVER_TYPES.items(), ['#ffcc00', '#00ffcc', '#ff3366', '#9933ff']):
+        rate = np.where(curves[kind] > 0, curves[kind], np.nan)
+        fig.add_trace(go.Scatter(x=x, y=rate, name=label, line=dict(color=color, width=3)))
+    fig.add_vline(x=x_obs, line_dash="dash", line_color="white", annotation_text="Observer")
+    fig.update_layout(xaxis_title="Radius (r/r_g)", yaxis_title="Clock Rate dτ/dt",
+                      xaxis_type="log", paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24',
+                      font=dict(color='#00ffcc'), height=450, hovermode='x unified')
+    st.plotly_chart(fig, width='stretch')
+    st.caption("Orbit curves end at the photon orbit for each direction; static observers "
+               "cannot exist inside the ergosphere. Velocity-slider boosts are not included.")
+    
+    st.markdown("---")
+    st.markdown("## 💀 Tidal Forces & Structural Stress")
+    spaghettification = calc.tidal_force * 2  # 2m human
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Tidal Gradient",
+                 f"{calc.tidal_force:.3e} m/s²/m")
+        st.metric("Spaghettification Force (2m object)",
+                 f"{spaghettification:.3e} m/s²",
+                 delta=f"{spaghettification/9.81:,.0f} g")
+    
+    with col2:
+        # Calculate stretch for different objects
+        stretch_1m = calc.tidal_force * 1
+        stretch_10m = calc.tidal_force * 10
+        
+        st.metric("Tidal Force (1m separation)",
+                 f"{stretch_1m:.3e} m/s²")
+        st.metric("Tidal Force (10m separation)",
+                 f"{stretch_10m:.3e} m/s²")
+    
+    st.markdown("---")
+    render_signal_panel(calc, params)
+    
+    st.markdown("---")
+    render_tidal_disruption_panel(calc, params)
+
+@st.fragment
+def render_signal_panel(calc, params):
+    """Light-travel time and Shapiro delay of a signal sent from the observer"""
+    st.markdown("### 📡 Signal Travel Time & Shapiro Delay")
+    col1, col2 = st.columns(2)
+    with col1:
+        receiver_log = st.slider("Receiver Distance beyond Observer (log₁₀ m)", 3.0, 22.0, 13.0, 0.1,
+                                 key="signal_receiver_log",
+                                 help="10¹³ m ≈ 67 AU, 10¹⁶ m ≈ 1 light-year, 10²⁰ m ≈ 3 kpc")
+    with col2:
+        psi_deg = st.slider("Receiver Direction (° from radially outward)", 0.0, 180.0, 0.0, 1.0,
+                            key="signal_psi")
+    r_emit = float(calc.r)
+    r_receive_radial = r_emit + 10**receiver_log
+    travel, delay = radial_signal_delay(calc.M, params["spin"], r_emit, r_receive_radial)
+    
+    # Off-radial receiver: same distance from the observer, rotated by ψ about it
+    psi = np.radians(psi_deg)
+    offset = 10**receiver_log
+    r_receive = np.sqrt(r_emit**2 + offset**2 + 2 * r_emit * offset * np.cos(psi))
+    angle = np.arccos(np.clip((r_emit + offset * np.cos(psi)) / r_receive, -1, 1))
+    weak_delay = weak_field_shapiro_delay(calc.M, r_emit, r_receive, angle)
+    closest = path_closest_approach(r_emit, r_receive, angle)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Flat-Space Light Time", f"{format_scientific(offset / C)} s")
+    col2.metric("Coordinate Travel Time (radial)", f"{format_scientific(travel)} s")
+    col3.metric("Shapiro Delay (radial, exact)", f"{format_scientific(delay)} s",
+                delta=f"{delay / travel:.3e} of travel time", delta_color="off")
+    col4.metric(f"Shapiro Delay (ψ = {psi_deg:.0f}°, weak field)", f"{format_scientific(weak_delay)} s",
+                delta=f"closest approach {closest / calc.r_g:.3g} r_g", delta_color="off")
+    if psi_deg > 0 and closest < 10 * calc.r_g:
+        st.warning("The path passes within 10 r_g of the hole: the weak-field delay is only indicative there "
+                   "(and paths inside the photon capture radius never arrive).")
+    
+    # Delay to the same receiver from emitters spread between the horizon and the observer
+    x_plus, _ = kerr_horizons(params["spin"])
+    emitters = calc.r_g * (x_plus + np.logspace(-6, np.log10(max(r_emit / calc.r_g - x_plus, 1e-5)), 400))
+    _, exact = radial_signal_delay(calc.M, params["spin"], emitters, r_receive_radial)
+    weak = weak_field_shapiro_delay(calc.M, emitters, r_receive_radial, 0.0)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=emitters / calc.r_g, y=exact, mode='lines', name='Exact (Kerr, radial)',
+                             line=dict(color='#00ffcc', width=3)))
+    fig.add_trace(go.Scatter(x=emitters / calc.r_g, y=weak, mode='lines', name='Weak-field',
+                             line=dict(color='#ff3366', width=2, dash='dash')))
+    fig.add_vline(x=r_emit / calc.r_g, line_dash="dot", line_color="#ffffff", annotation_text="Observer")
+    fig.update_layout(title="Shapiro Delay to the Receiver vs Emitter Radius",
+                      xaxis=dict(title="Emitter radius (r_g)", type="log", gridcolor='#333'),
+                      yaxis=dict(title="Delay (s)", type="log", gridcolor='#333'),
+                      paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24', font=dict(color='#00ffcc'),
+                      legend=dict(bgcolor='#1a1c24', bordercolor='#00ffcc'), height=420)
+    st.plotly_chart(fig, width='stretch')
+    st.caption("Radial delays integrate the Kerr equatorial principal null ray from a table cached per spin "
+               "(exact for θ = π/2, or any θ when a = 0); off-radial paths use the weak-field Shapiro formula.")
+
+@st.fragment
+def render_tidal_disruption_panel(calc, params):
+    """Disruption vs direct capture over a sampled stellar population"""
+    st.markdown("### ⭐ Tidal Disruption of Stellar Populations")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_stars = st.select_slider("Stars", [1_000_000, 10_000_000, 30_000_000], 10_000_000,
+                                   format_func=lambda n: f"{n:,}", key="tde_stars")
+    with col2:
+        m_max = st.slider("Max Stellar Mass (M☉)", 0.5, 50.0, 1.0, 0.5, key="tde_m_max",
+                          help="Upper end of the Kroupa IMF (≈1 M☉ for an old nuclear cluster)")
+    with col3:
+        scatter_dex = st.slider("Radius Scatter (dex)", 0.0, 0.3, 0.05, 0.01, key="tde_scatter")
+    with st.spinner(f"Sampling {n_stars:,} stars..."):
+        population = tde_population(n_stars, m_max, scatter_dex)
+    
+    fraction = disrupted_fraction(calc.M, params["spin"], population)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Disrupted Outside Horizon", f"{fraction:.2%}")
+    col2.metric("Swallowed Whole", f"{1 - fraction:.2%}")
+    col3.metric("Hills Mass (Sun-like, prograde)",
+                f"{hills_mass(1.0, 1.0, params['spin']) / SOLAR_MASS:.3e} M☉")
+    
+    masses = np.logspace(4, 10, 300) * SOLAR_MASS
+    spins = np.array([0.0, 0.5, 0.9, 0.998, params["spin"]])
+    curves = disrupted_fraction(masses[None, :], spins[:, None], population)
+    edges, _, counts = population
+    # log10(r_t / r_+) is log10 s shifted by the hole's mass and horizon
+    r_plus = calc.r_g * (1 + np.sqrt(1 - params["spin"]**2))
+    centers = (edges[:-1] + edges[1:]) / 2 - np.log10(calc.M) * 2/3 - np.log10(r_plus / calc.r_g)
+    
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Disrupted Fraction vs Black Hole Mass",
+                                                        "Disruption Radius / Horizon (current hole)"))
+    for k, (spin, color) in enumerate(zip(spins, ['#00ffcc', '#3399ff', '#9933ff', '#ff3366', '#ffcc00'])):
+        name = f"a = {spin:.3f}" + (" (current)" if k == len(spins) - 1 else "")
+        fig.add_trace(go.Scatter(x=masses / SOLAR_MASS, y=curves[k], mode='lines', name=name,
+                                 line=dict(color=color, width=3 if k == len(spins) - 1 else 1.5,
+                                           dash='dash' if k == len(spins) - 1 else 'solid')), row=1, col=1)
+    fig.add_vline(x=calc.M / SOLAR_MASS, line_dash="dot", line_color="#ffffff", row=1, col=1)
+    keep = counts > 0
+    fig.add_trace(go.Bar(x=10**centers[keep], y=counts[keep] / counts.sum(), name='Stars',
+                         marker_color='#ff9933', showlegend=False), row=1, col=2)
+    for chi, label in ((params["spin"], "capture (prograde)"), (-params["spin"], "capture (retrograde)")):
+        fig.add_vline(x=marginally_bound_radius(chi) * calc.r_g / r_plus, line_dash="dash",
+                      line_color="#ff3366", annotation_text=label, row=1, col=2)
+    fig.update_xaxes(title_text="Mass (M☉)", type="log", gridcolor='#333', row=1, col=1)
+    fig.update_yaxes(title_text="Fraction disrupted", gridcolor='#333', row=1, col=1)
+    fig.update_xaxes(title_text="r_t / r₊", type="log", gridcolor='#333', row=1, col=2)
+    fig.update_yaxes(title_text="Fraction of stars", gridcolor='#333', row=1, col=2)
+    fig.update_layout(paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24', font=dict(color='#00ffcc'),
+                      legend=dict(bgcolor='#1a1c24', bordercolor='#00ffcc'), height=450)
+    st.plotly_chart(fig, width='stretch')
+    st.caption("Isotropic parabolic orbits: a star is disrupted if its tidal radius lies outside the "
+               "marginally bound periapsis for the spin projected on its orbit, otherwise it is swallowed whole.")
+
+@st.fragment
+def render_visualizations_tab(calc, params, bundle):
+    """Visualizations: geometry panels, 3D embedding and dilation profile"""
+    st.markdown("## 📊 Scientific Visualizations")
+    
+    # Matplotlib visualization
+    if bundle:
+        st.image(bundle["matplotlib_png"], width='stretch')
+    else:
+        with st.spinner("Generating matplotlib visualizations..."):
+            png = geometry_figure_png(*panel_inputs("geometry_figure", params))
+        st.image(png, width='stretch')
+    
+    st.markdown("---")
+    
+    # 3D Plotly visualization
+    st.markdown("### 🌐 Interactive 3D Spacetime Curvature")
+    if bundle:
+        fig_json = bundle["plotly_json"]
+    else:
+        with st.spinner("Generating 3D visualization..."):
+            fig_json = embedding_figure_json(*panel_inputs("embedding_3d", params))
+    st.plotly_chart(pio.from_json(fig_json), width='stretch')
+    
+    # Additional Plotly charts
+    st.markdown("---")
+    st.markdown("### 📈 Interactive Analysis Plots")
+    
+    # Time dilation vs distance
+    fig_dilation = pio.from_json(dilation_profile_json(*panel_inputs("dilation_profile", params)))
+    st.plotly_chart(fig_dilation, width='stretch')
+    
+    st.markdown("---")
+    render_explorer_panel(params)
+    
+    st.markdown("---")
+    render_accretion_disk_panel(calc, params)
+    
+    st.markdown("---")
+    render_lensing_panel(calc, params)
+    
+    st.markdown("---")
+    render_emission_line_panel(calc, params)
+
+def render_explorer_panel(params):
+    """Distance/spin explorer that interpolates a precomputed grid in the browser"""
+    st.markdown("### 🕹️ Instant Explorer")
+    st.caption(f"Core metrics for M = {params['mass']:g}×10⁶ M☉ "
+               f"({OBSERVER_TYPES[params['observer']].lower()}, v = {params['velocity']:.3f}c, "
+               f"θ = {params['theta']:.2f}), bilinearly interpolated from a "
+               f"{EXPLORER_DISTANCE[2]}×{EXPLORER_SPIN[2]} grid in your browser. "
+               f"Moving these sliders never reruns the app; exact values are on the Dashboard."
+               + (" Plotly is loaded from cdn.plot.ly, so the explorer needs network access."
+                  if EXPLORER_PLOTLY_CDN else ""))
+    st.iframe(explorer_html(params), height=560)
+
+@st.fragment
+def render_accretion_disk_panel(calc, params):
+    """Novikov-Thorne disk temperature profile and spectrum"""
+    st.markdown("### 🔥 Accretion Disk (Novikov–Thorne)")
+    eddington_ratio = st.slider("Accretion Rate (fraction of Eddington)", 0.01, 1.0, 0.1, 0.01,
+                                key="disk_eddington_ratio")
+    r, flux, temperature = disk_radial_profile(params["mass"], params["spin"], eddington_ratio)
+    nu = np.geomspace(1e12, 1e20, 4000)
+    L_nu = disk_spectrum(params["mass"], params["spin"], nu, eddington_ratio)
+    
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Effective Temperature", "Disk Spectrum νLν"))
+    fig.add_trace(go.Scatter(x=r/calc.Rs, y=temperature, mode='lines', name='T_eff',
+                             line=dict(color='#ff9933', width=3)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=nu, y=nu*L_nu, mode='lines', name='νLν',
+                             line=dict(color='#00ffcc', width=3)), row=1, col=2)
+    fig.update_xaxes(type="log", gridcolor='#333')
+    fig.update_yaxes(type="log", gridcolor='#333')
+    fig.update_xaxes(title_text="Distance (Schwarzschild Radii)", row=1, col=1)
+    fig.update_yaxes(title_text="Temperature (K)", row=1, col=1)
+    fig.update_xaxes(title_text="Frequency (Hz)", row=1, col=2)
+    fig.update_yaxes(title_text="νLν (W)", range=[np.log10(np.max(nu*L_nu)) - 6, np.log10(np.max(nu*L_nu)) + 0.5],
+                     row=1, col=2)
+    fig.update_layout(paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24', font=dict(color='#00ffcc'),
+                      showlegend=False, height=450)
+    st.plotly_chart(fig, width='stretch')
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Peak Disk Temperature", f"{temperature.max():.3e} K")
+    disk_luminosity = np.sum((L_nu[1:] + L_nu[:-1]) / 2 * np.diff(nu))
+    col2.metric("Disk Luminosity", f"{disk_luminosity:.3e} W")
+    col3.metric("Spectral Peak", f"{nu[np.argmax(nu*L_nu)]:.3e} Hz")
+
+@st.fragment
+def render_lensing_panel(calc, params):
+    """Lensed starfield and magnification map around the hole"""
+    st.markdown("### 🌠 Gravitational Lensing")
+    col1, col2 = st.columns(2)
+    with col1:
+        resolution = st.select_slider("Render Resolution", [128, 256, 384, 512], 256, key="lens_resolution")
+    with col2:
+        fov_shadow = st.slider("Field of View (× shadow radius)", 1.5, 20.0, 4.0, 0.5, key="lens_fov")
+    
+    with st.spinner("Tracing deflection map..."):
+        image, log_mu, half_fov_deg = lensed_starfield(params["mass"], params["spin"], params["distance_log"],
+                                                       params["theta"], resolution, fov_shadow)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.image(image, caption=f"Lensed sky, field of view ±{half_fov_deg:.3g}°", width='stretch')
+    with col2:
+        fig = go.Figure(go.Heatmap(z=log_mu[::-1], colorscale='Inferno', zmin=-1, zmax=2,
+                                   colorbar=dict(title="log₁₀ μ")))
+        fig.update_layout(title="Magnification Map", paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24',
+                          font=dict(color='#00ffcc'), height=450,
+                          xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor="x"))
+        st.plotly_chart(fig, width='stretch')
+
+@st.fragment
+def render_emission_line_panel(calc, params):
+    """Broadened iron Kα line from the inner disk"""
+    st.markdown("### 📡 Relativistic Emission Line (Fe Kα)")
+    col1, col2 = st.columns(2)
+    with col1:
+        inclination = st.slider("Disk Inclination (degrees)", 5.0, 85.0, 30.0, 1.0, key="line_inclination")
+    with col2:
+        emissivity_index = st.slider("Emissivity Index q (ε ∝ r⁻q)", 1.5, 5.0, 3.0, 0.1, key="line_emissivity")
+    
+    energy, profile, newtonian = emission_line_profile(params["spin"], inclination, emissivity_index)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=energy * FE_K_ALPHA_KEV, y=profile, mode='lines', name='Kerr',
+                             line=dict(color='#00ffcc', width=3)))
+    fig.add_trace(go.Scatter(x=energy * FE_K_ALPHA_KEV, y=newtonian, mode='lines', name='Newtonian Doppler',
+                             line=dict(color='#ff3366', width=2, dash='dash')))
+    fig.add_vline(x=FE_K_ALPHA_KEV, line_dash="dot", line_color="#ffcc00", annotation_text="6.4 keV rest")
+    fig.update_layout(
+        title="Line Profile",
+        xaxis_title="Observed Energy (keV)",
+        yaxis_title="Normalized Flux",
+        paper_bgcolor='#0e1117',
+        plot_bgcolor='#1a1c24',
+        font=dict(color='#00ffcc'),
+        xaxis=dict(gridcolor='#333', range=[1, 9]),
+        yaxis=dict(gridcolor='#333'),
+        legend=dict(bgcolor='#1a1c24', bordercolor='#00ffcc')
+    )
+    st.plotly_chart(fig, width='stretch')
+
+@st.fragment
+def render_advanced_metrics_tab(calc, params, bundle):
+    """Advanced Metrics: full metric table and specialized calculations"""
+    st.markdown("## 🧮 Advanced Metrics & Calculations")
+    hour_on_planet = 3600
+    
+    # Comprehensive data table
+    df = bundle["metrics_table"] if bundle else build_metrics_table(calc)
+    st.dataframe(df, width='stretch', height=800)
+    
+    # Additional calculations
+    st.markdown("---")
+    st.markdown("### 🔬 Specialized Calculations")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Coordinate Time Differential")
+        if calc.total_dilation > 0:
+            coord_diff = (hour_on_planet / calc.total_dilation) - hour_on_planet
+            st.write(f"**{coord_diff/86400:.6f}** days")
+            st.write(f"**{coord_diff:,.2f}** seconds")
+        else:
+            st.write("Infinite (inside horizon)")
+        
+        st.markdown("#### Proximity in Planck Lengths")
+        planck_distance = (calc.r - calc.Rs) / PLANCK_LENGTH
+        st.write(f"**{planck_distance:.3e}** ℓₚ")
+        
+        st.markdown("#### Gravitational Binding Energy")
+        binding = -G * calc.M / calc.r
+        st.write(f"**{binding:.3e}** J/kg")
+    
+    with col2:
+        if params["spin"] > 0:
+            st.markdown("#### Penrose Process Analysis")
+            penrose_eff = calc.calc_energy_extraction_efficiency()
+            max_energy = calc.M * C**2 * penrose_eff / 100
+            st.write(f"**Efficiency:** {penrose_eff:.3f}%")
+            st.write(f"**Max Extractable Energy:** {max_energy:.3e} J")
+            st.write(f"**Equivalent Mass:** {max_energy/C**2:.3e} kg")
+        
+        st.markdown("#### Schwarzschild Radius Ratios")
+        st.write(f"**r/Rs:** {calc.r/calc.Rs:.6f}")
+        st.write(f"**r_ISCO/Rs:** {calc.r_isco/calc.Rs:.6f}")
+        st.write(f"**r_photon/Rs:** {calc.r_photon/calc.Rs:.6f}")
+    
+    st.markdown("---")
+    render_uncertainty_panel(calc, params)
+    
+    st.markdown("---")
+    render_sensitivity_panel(calc, params)
+    
+    st.markdown("---")
+    render_catalog_panel(params)
+
+@st.fragment
+def render_catalog_panel(params):
+    """Range queries and rankings over the black hole catalog"""
+    st.markdown("### 🗂️ Black Hole Catalog")
+    catalog = load_catalog()
+    with st.spinner(f"Evaluating {catalog.size:,} catalog entries..."):
+        metrics = catalog_metrics(params["distance_log"], params["velocity"], params["theta"],
+                                  params["observer"], params["backend"])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        low, high = np.floor(np.log10(catalog.sorted["mass_msun"][[0, -1]]) * 10) / 10 + [0, 0.1]
+        log_mass = st.slider("Mass Range (log₁₀ M☉)", float(low), float(high), (float(low), float(high)), 0.1,
+                             key="catalog_mass_range")
+        spin_range = st.slider("Spin Range (a/M)", 0.0, 0.998, (0.0, 0.998), 0.001, key="catalog_spin_range")
+    with col2:
+        sort_by = st.selectbox("Sort By", list(CATALOG_METRICS) + ["mass_msun", "spin", "distance_mpc"],
+                               key="catalog_sort_by")
+        descending = st.toggle("Largest first", True, key="catalog_descending")
+    
+    started = time.perf_counter()
+    rows = catalog.query((10**log_mass[0], 10**log_mass[1]), spin_range)
+    values = metrics[sort_by] if sort_by in metrics else catalog.columns[sort_by]
+    shown = top_rows(values, rows, CATALOG_DISPLAY_ROWS, descending)
+    elapsed = time.perf_counter() - started
+    st.caption(f"{len(rows):,} of {catalog.size:,} entries match ({elapsed*1e3:.1f} ms). Metrics are evaluated "
+               f"for each black hole at the sidebar distance, velocity, θ and observer; "
+               f"showing the top {len(shown)}.")
+    st.dataframe(pd.DataFrame({
+        **{name: values[shown] for name, values in catalog.columns.items()},
+        **{label: values[shown] for label, values in metrics.items()},
+    }).set_index("name"), width='stretch', height=400)
+
+@st.fragment
+def render_uncertainty_panel(calc, params):
+    """Monte Carlo propagation of parameter uncertainties"""
+    st.markdown("### 🎲 Uncertainty Propagation")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sigma_mass = st.slider("σ Mass (relative)", 0.0, 0.5, 0.1, 0.01, key="mc_sigma_mass")
+    with col2:
+        sigma_spin = st.slider("σ Spin", 0.0, 0.3, 0.05, 0.01, key="mc_sigma_spin")
+    with col3:
+        sigma_dist = st.slider("σ Distance (dex)", 0.0, 1.0, 0.05, 0.01, key="mc_sigma_dist")
+    with col4:
+        sigma_theta = st.slider("σ θ (radians)", 0.0, 0.5, 0.05, 0.01, key="mc_sigma_theta")
+    n_samples = st.select_slider("Samples", [100_000, 1_000_000, 5_000_000], 1_000_000,
+                                 format_func=lambda n: f"{n:,}", key="mc_samples")
+    
+    sigmas = {"mass": sigma_mass, "spin": sigma_spin, "distance_log": sigma_dist, "theta": sigma_theta}
+    with st.spinner("Propagating samples..."):
+        summary = propagate_uncertainty(params, sigmas, n_samples)
+    
+    st.dataframe(pd.DataFrame(
+        [[name] + format_scientific(np.asarray(result["quantiles"]), 4).tolist() for name, result in summary.items()],
+        columns=["Metric"] + [f"{100*q:g}%" for q in UNCERTAINTY_QUANTILES]
+    ), width='stretch', hide_index=True)
+    
+    cols = st.columns(len(summary))
+    for col, (name, result) in zip(cols, summary.items()):
+        edges, counts = result["histogram"]
+        fig = go.Figure(go.Bar(x=np.sqrt(edges[1:] * edges[:-1]), y=counts,
+                               marker_color='#00ffcc', width=np.diff(edges)))
+        fig.update_layout(title=name, xaxis_type="log", paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24',
+                          font=dict(color='#00ffcc'), height=300, margin=dict(l=20, r=20, t=40, b=20),
+                          xaxis=dict(gridcolor='#333'), yaxis=dict(gridcolor='#333'))
+        with col:
+            st.plotly_chart(fig, width='stretch')
+
+@st.fragment
+def render_sensitivity_panel(calc, params):
+    """Jacobian table at the current point and a sensitivity heatmap over a grid"""
+    st.markdown("### 📐 Sensitivity Analysis")
+    mode = st.radio("Quantity", ["Log sensitivity ∂log₁₀|y|/∂x", "Partial derivative ∂y/∂x"],
+                    horizontal=True, key="sens_mode")
+    values, jacobian = sensitivity_jacobian(params["mass"], params["distance_log"], params["spin"],
+                                            params["theta"], params["velocity"], observer_type=params["observer"],
+                                            backend=params["backend"])
+    table = log_sensitivity(values, jacobian) if mode.startswith("Log") else jacobian
+    st.dataframe(pd.DataFrame(
+        [[output] + format_scientific(np.array([table[output][name] for name in SENSITIVITY_INPUTS], dtype=float), 3).tolist()
+         for output in table],
+        columns=["Output"] + [f"∂/∂{name}" for name in SENSITIVITY_INPUTS]
+    ), width='stretch', hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        output = st.selectbox("Heatmap Output", RelativisticCalculator.OUTPUTS,
+                              index=RelativisticCalculator.OUTPUTS.index("total_dilation"), key="sens_output")
+    with col2:
+        wrt = st.selectbox("With Respect To", list(SENSITIVITY_INPUTS), index=1, key="sens_input")
+    distance_axis = np.linspace(max(params["distance_log"] - 3, -5), min(params["distance_log"] + 3, 10), 150)
+    spin_axis = np.linspace(0, 0.998, 100)
+    grid_values, grid_jacobian = sensitivity_jacobian(params["mass"], distance_axis[None, :], spin_axis[:, None],
+                                                      params["theta"], params["velocity"], (output,),
+                                                      params["observer"], params["backend"])
+    grid = log_sensitivity(grid_values, grid_jacobian) if mode.startswith("Log") else grid_jacobian
+    fig = go.Figure(go.Heatmap(x=distance_axis, y=spin_axis, z=grid[output][wrt], colorscale='Plasma'))
+    fig.update_layout(title=f"{output} sensitivity to {wrt}", xaxis_title="Distance Offset (log₁₀ m)",
+                      yaxis_title="Spin Parameter (a/M)", paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24',
+                      font=dict(color='#00ffcc'), height=450)
+    st.plotly_chart(fig, width='stretch')
+
+@st.fragment
+def render_export_panel(calc, params):
+    """Sidebar export of the full metric set for the current point or a sweep"""
+    scope = st.radio("Rows", ["Current point", "Parameter sweep"], horizontal=True, key="export_scope")
+    codec = st.selectbox("Compression", list(EXPORT_CODECS), key="export_codec")
+    if scope == "Current point":
+        # Reuses the nodes this run already evaluated
+        n_rows = 1
+        calcs = lambda: [calc]
+    else:
+        name = st.selectbox("Sweep Parameter", list(EXPORT_SWEEPS),
+                            format_func=lambda key: EXPORT_SWEEPS[key][0], key="export_sweep_param")
+        label, low, high, log_spaced = EXPORT_SWEEPS[name]
+        start, stop = st.slider("Sweep Range", low, high, (low, high), key=f"export_sweep_range_{name}")
+        n_rows = int(st.number_input("Sweep Points", min_value=2, max_value=EXPORT_MAX_ROWS,
+                                     value=10_000, step=10_000, key="export_sweep_points"))
+        calcs = lambda: sweep_calculators(params, name, start, stop, n_rows, log_spaced)
+    
+    suffix, mime = EXPORT_CODECS[codec]
+    st.download_button(
+        label="📥 Download Metrics",
+        data=lambda: write_metrics_export(calcs(), codec),
+        file_name=f"spacetime_metrics_{params['observer']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}",
+        mime=mime,
+        on_click="ignore",
+        key="export_download"
+    )
+    st.caption(f"{n_rows:,} rows × {len(EXPORT_INPUT_COLUMNS) + len(METRIC_DEFINITIONS)} columns "
+               f"({EXPORT_PRECISION + 1} significant figures), written in chunks of {EXPORT_CHUNK_ROWS:,}")
+
+@st.fragment
+def render_gravitational_waves_tab(calc, params):
+    """Gravitational Waves: inspiral of a companion down to the ISCO"""
+    st.markdown("## 🌊 Gravitational Waves")
+    st.markdown("### 🌀 Companion Inspiral (leading post-Newtonian order)")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        log_q = st.slider("Mass Ratio log₁₀(m₂/m₁)", -6.0, 0.0, -3.0, 0.1, key="gw_log_q")
+    with col2:
+        r_start = st.slider("Start Radius (× ISCO)", 1.1, 10.0, 3.0, 0.1, key="gw_r_start")
+    with col3:
+        distance_mpc = st.slider("Source Distance (Mpc)", 1.0, 10000.0, 100.0, 1.0, key="gw_distance")
+    
+    wave = InspiralWaveform(params["mass"], params["spin"], 10**log_q, r_start, distance_mpc)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Inspiral Duration", format_time_elapsed(wave.duration))
+    col2.metric("GW Frequency at Start", f"{wave.f_start:.3e} Hz")
+    col3.metric("GW Frequency at ISCO", f"{wave.f_isco:.3e} Hz")
+    col4.metric("Samples", f"{wave.n_samples:,}", delta=f"{wave.sample_rate:.3e} Hz sampling")
+    
+    max_samples = 2**22
+    if wave.n_samples > max_samples:
+        st.info(f"Signal has {wave.n_samples:,} samples; the spectrum uses the final {max_samples:,}.")
+    
+    # Waveform: final stretch before the ISCO
+    (t, h_plus, h_cross), (freqs, asd) = inspiral_plot_data(*panel_inputs("gw_inspiral", params), log_q, r_start,
+                                                            distance_mpc, max_samples=max_samples)
+    
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Strain before ISCO", "Amplitude Spectral Density"))
+    fig.add_trace(go.Scatter(x=t - t[-1], y=h_plus, mode='lines', name='h+',
+                             line=dict(color='#00ffcc', width=2)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=t - t[-1], y=h_cross, mode='lines', name='h×',
+                             line=dict(color='#ff3366', width=1.5)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=freqs[1:], y=asd[1:], mode='lines', name='ASD',
+                             line=dict(color='#ffcc00', width=2)), row=1, col=2)
+    fig.update_xaxes(title_text="Time to ISCO (s)", gridcolor='#333', row=1, col=1)
+    fig.update_yaxes(title_text="Strain", gridcolor='#333', row=1, col=1)
+    fig.update_xaxes(title_text="Frequency (Hz)", type="log", gridcolor='#333', row=1, col=2)
+    fig.update_yaxes(title_text="ASD (1/√Hz)", type="log", gridcolor='#333', row=1, col=2)
+    fig.update_layout(paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24', font=dict(color='#00ffcc'),
+                      legend=dict(bgcolor='#1a1c24', bordercolor='#00ffcc'), height=450)
+    st.plotly_chart(fig, width='stretch')
+    
+    st.markdown("---")
+    render_ringdown_panel(params, wave)
+
+def render_ringdown_panel(params, wave):
+    """Quasi-normal-mode spectrum and ringdown strain of the merger remnant"""
+    st.markdown("### 🔔 Ringdown (Quasi-Normal Modes)")
+    # For small mass ratios the remnant keeps the current spin; radiated mass is neglected
+    M_final = wave.m1 + wave.m2
+    q = wave.m2 / wave.m1
+    eta = q / (1 + q)**2
+    frequency, tau = qnm_spectrum(M_final, params["spin"])
+    st.caption(f"Remnant of {M_final / SOLAR_MASS:.3e} M☉ with a = {params['spin']:.3f}; "
+               f"Berti–Cardoso–Will fits, (2,2,0) amplitude 0.864 η with η = {eta:.2e}.")
+    st.dataframe(pd.DataFrame({
+        "Mode (l, m, n)": [str(mode) for mode in QNM_MODES],
+        "Frequency (Hz)": format_scientific(frequency, 4),
+        "Damping Time (s)": format_scientific(tau, 4),
+        "Quality Factor": np.round(np.pi * frequency * tau, 3),
+        "Relative Amplitude": [RINGDOWN_RELATIVE_AMPLITUDES[mode] for mode in QNM_MODES],
+    }).set_index("Mode (l, m, n)"), width='stretch')
+    
+    t = np.linspace(0, 8 * tau[0], 2000)
+    h_plus, h_cross = ringdown_waveform(t, M_final, params["spin"], 0.864 * eta * G * M_final / (C**2 * wave.distance))
+    spins, m_omega, _ = qnm_spin_table()
+    
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Ringdown Strain", "Mode Frequencies vs Spin"))
+    fig.add_trace(go.Scatter(x=t, y=h_plus, mode='lines', name='h+', line=dict(color='#00ffcc', width=2)),
+                  row=1, col=1)
+    fig.add_trace(go.Scatter(x=t, y=h_cross, mode='lines', name='h×', line=dict(color='#ff3366', width=1.5)),
+                  row=1, col=1)
+    for k, (mode, color) in enumerate(zip(QNM_MODES, ['#ffcc00', '#ff9933', '#9933ff', '#3399ff', '#66ff66'])):
+        fig.add_trace(go.Scatter(x=spins, y=m_omega[:, k], mode='lines', name=f"{mode}",
+                                 line=dict(color=color, width=2)), row=1, col=2)
+    fig.add_vline(x=params["spin"], line_dash="dash", line_color="#ffffff", row=1, col=2)
+    fig.update_xaxes(title_text="Time after peak (s)", gridcolor='#333', row=1, col=1)
+    fig.update_yaxes(title_text="Strain", gridcolor='#333', row=1, col=1)
+    fig.update_xaxes(title_text="Spin (a/M)", gridcolor='#333', row=1, col=2)
+    fig.update_yaxes(title_text="Mω (units of c³/GM)", gridcolor='#333', row=1, col=2)
+    fig.update_layout(paper_bgcolor='#0e1117', plot_bgcolor='#1a1c24', font=dict(color='#00ffcc'),
+                      legend=dict(bgcolor='#1a1c24', bordercolor='#00ffcc'), height=450)
+    st.plotly_chart(fig, width='stretch')
+
+@st.fragment
+def render_education_tab():
+    """Education: static reference material (no inputs)"""
+    st.markdown("## 📚 Educational Resources")
+    
+    st.markdown("""
+    ### 🧮 The Science Behind the Simulator
+    
+    This simulator is based on rigorous calculations from Einstein's **General Theory of Relativity** 
+    and the **Kerr Metric** for rotating black holes.
+    """)
+    
+    # Expanders for educational content
+    with st.expander("📐 Einstein Field Equations"):
+        st.markdown("""
+        The foundation of General Relativity:
+        
+        $$R_{\\mu\\nu} - \\frac{1}{2}g_{\\mu\\nu}R + \\Lambda g_{\\mu\\nu} = \\frac{8\\pi G}{c^4}T_{\\mu\\nu}$$
+        
+        Where:
+        - $R_{\\mu\\nu}$ is the Ricci curvature tensor
+        - $g_{\\mu\\nu}$ is the metric tensor
+        - $R$ is the Ricci scalar
+        - $\\Lambda$ is the cosmological constant
+        - $T_{\\mu\\nu}$ is the stress-energy tensor
+        """)
+    
+    with st.expander("🌀 Schwarzschild Metric"):
+        st.markdown("""
+        For non-rotating black holes:
+        
+        $$ds^2 = -\\left(1 - \\frac{R_s}{r}\\right)c^2dt^2 + \\left(1 - \\frac{R_s}{r}\\right)^{-1}dr^2 + r^2d\\Omega^2$$
+        
+        Schwarzschild radius:
+        
+        $$R_s = \\frac{2GM}{c^2}$$
+        
+        Time dilation factor:
+        
+        $$\\frac{t_{observer}}{t_{Earth}} = \\sqrt{1 - \\frac{R_s}{r}}$$
+        """)
+    
+    with st.expander("⚫ Kerr Metric (Rotating Black Holes)"):
+        st.markdown("""
+        Much more complex! For rotating black holes:
+        
+        $$ds^2 = -\\left(1 - \\frac{R_s r}{\\Sigma^2}\\right)c^2dt^2 - \\frac{R_s r}{\\Sigma^2}a\\sin^2\\theta \\ c \\ dt \\ d\\phi$$
+        $$+ \\frac{\\Sigma^2}{\\Delta}dr^2 + \\Sigma^2 d\\theta^2 + \\frac{\\sin^2\\theta}{\\Sigma^2}[(r^2+a^2)^2 - \\Delta a^2\\sin^2\\theta]d\\phi^2$$
+        
+        Where:
+        - $\\Sigma^2 = r^2 + a^2\\cos^2\\theta$
+        - $\\Delta = r^2 - R_s r + a^2$
+        - $a = J/(Mc)$ is the spin parameter
+        """)
+    
+    with st.expander("💫 Key Physical Concepts"):
+        st.markdown("""
+        **Event Horizon:** Point of no return
+        $$r_{horizon} = R_s = \\frac{2GM}{c^2}$$
+        
+        **ISCO (Innermost Stable Circular Orbit):**
+        - Non-rotating: $r_{ISCO} = 3R_s$
+        - Maximally rotating (prograde): $r_{ISCO} ≈ R_s$
+        
+        **Photon Sphere:** Where light orbits
+        $$r_{photon} = 1.5R_s$$
+        
+        **Frame Dragging:** Spacetime rotation
+        $$\\omega = \\frac{2aGM}{cr^3}$$
+        
+        **Hawking Temperature:**
+        $$T_H = \\frac{\\hbar c^3}{8\\pi k_B GM}$$
+        
+        **Bekenstein-Hawking Entropy:**
+        $$S = \\frac{k_B c^3 A}{4G\\hbar}$$
+        """)
+    
+    with st.expander("🎬 Real-World Black Holes"):
+        st.markdown("""
+        ### Famous Black Holes:
+        
+        **Sagittarius A*** (Milky Way Center)
+        - Mass: ~4.3 million M☉
+        - Schwarzschild Radius: ~12.7 million km
+        - Distance from Earth: ~26,000 light-years
+        
+        **M87*** (First Photographed)
+        - Mass: ~6.5 billion M☉
+        - Schwarzschild Radius: ~19 billion km
+        - Distance from Earth: ~55 million light-years
+        
+        **Gargantua** (Interstellar Movie)
+        - Mass: ~100 million M☉
+        - Near-maximal spin: a ≈ 0.998
+        - Time dilation: ~61,000× near horizon
+        """)
+    
+    st.markdown("---")
+    st.markdown("""
+    ### 📖 References
+    
+    1. Misner, C. W., Thorne, K. S., & Wheeler, J. A. (1973). *Gravitation*
+    2. Carroll, S. M. (2004). *Spacetime and Geometry: An Introduction to General Relativity*
+    3. Thorne, K. S. (2014). *The Science of Interstellar*
+    4. Chandrasekhar, S. (1983). *The Mathematical Theory of Black Holes*
+    """)
+
+
+def get_session_calculator(mass, distance_log, spin, velocity, theta, observer="static"):
+    """Per-session calculator; a rerun only recomputes nodes whose inputs moved"""
+    calc = st.session_state.get("calculator")
+    if calc is None:
+        calc = RelativisticCalculator(mass, distance_log, spin, velocity, theta, observer)
+        st.session_state["calculator"] = calc
+    else:
+        calc.set_inputs(mass_multiplier=mass, distance_offset_log=distance_log,
+                        spin_param=spin, observer_velocity=velocity, theta=theta,
+                        observer_type=observer)
+    return calc
+
+# ============================================================================
+# MEMORY PROFILING
+# ============================================================================
+# Opt-in: SPACETIME_MEMORY_PROFILE=1 traces allocations for every full rerun
+MEMORY_PROFILE = os.environ.get("SPACETIME_MEMORY_PROFILE", "0") not in ("", "0")
+MEMORY_TRACE_FRAMES = 1  # lineno attribution; deeper tracebacks cost memory per block
+MEMORY_TOP_ALLOCATORS = 10
+MEMORY_HISTORY = 200  # profiled reruns kept per session for the trend chart
+MEMORY_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+)
+MEMORY_LOGGER = logging.getLogger("spacetime.memory")
+if not MEMORY_LOGGER.handlers:
+    # One JSON line per rerun; SPACETIME_MEMORY_LOG sends them to a file for trend analysis
+    log_path = os.environ.get("SPACETIME_MEMORY_LOG")
+    MEMORY_LOGGER.addHandler(logging.FileHandler(log_path) if log_path else logging.StreamHandler())
+    MEMORY_LOGGER.setLevel(logging.INFO)
+    MEMORY_LOGGER.propagate = False
+
+def current_rss():
+    """Resident set size in bytes (Linux /proc; elsewhere the peak from getrusage, or 0)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+class MemoryProfiler:
+    """Allocation deltas and resident memory per stage of one full rerun
+    
+    checkpoint(stage) closes the stage that ran since the previous one;
+    finish() diffs tracemalloc snapshots from the start of the rerun to find
+    the top allocating lines and logs the record. A no-op when disabled.
+    tracemalloc is process-wide, so with concurrent sessions a stage also
+    counts what other sessions allocated meanwhile: read trends over many
+    reruns rather than single numbers. Fragment-only reruns are not profiled.
+    """
+    def __init__(self, enabled=MEMORY_PROFILE):
+        self.enabled = enabled
+        self.stages = []
+        if not enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACE_FRAMES)
+        self.start_snapshot = self.snapshot()
+        self.traced = tracemalloc.get_traced_memory()[0]
+        self.rss = current_rss()
+        self.started = self.last_checkpoint = time.perf_counter()
+        tracemalloc.reset_peak()
+    
+    @staticmethod
+    def snapshot():
+        return tracemalloc.take_snapshot().filter_traces(MEMORY_TRACE_FILTERS)
+    
+    def checkpoint(self, stage):
+        if not self.enabled:
+            return
+        traced, peak = tracemalloc.get_traced_memory()
+        rss = current_rss()
+        now = time.perf_counter()
+        self.stages.append({
+            "stage": stage,
+            "allocated_mb": (traced - self.traced) / 2**20,
+            "peak_mb": (peak - self.traced) / 2**20,
+            "rss_mb": rss / 2**20,
+            "rss_delta_mb": (rss - self.rss) / 2**20,
+            "seconds": now - self.last_checkpoint,
+        })
+        self.traced, self.rss, self.last_checkpoint = traced, rss, now
+        tracemalloc.reset_peak()
+    
+    def finish(self):
+        """The rerun's record (stages, totals, top allocators), also logged as JSON"""
+        if not self.enabled:
+            return None
+        growth = self.snapshot().compare_to(self.start_snapshot, "lineno")[:MEMORY_TOP_ALLOCATORS]
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "pid": os.getpid(),
+            "seconds": time.perf_counter() - self.started,
+            "traced_mb": tracemalloc.get_traced_memory()[0] / 2**20,
+            "rss_mb": current_rss() / 2**20,
+            "stages": self.stages,
+            "top_allocators": [{
+                "location": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_diff_kb": stat.size_diff / 1024,
+                "size_kb": stat.size / 1024,
+                "count_diff": stat.count_diff,
+            } for stat in growth],
+        }
+        MEMORY_LOGGER.info(json.dumps(record))
+        return record
+
+def render_memory_panel(record):
+    """Sidebar summary of the last profiled rerun and this session's RSS trend"""
+    history = st.session_state.setdefault("memory_history", deque(maxlen=MEMORY_HISTORY))
+    history.append({"rss_mb": record["rss_mb"], "traced_mb": record["traced_mb"]})
+    st.caption(f"RSS {record['rss_mb']:.1f} MB · traced {record['traced_mb']:.1f} MB · "
+               f"rerun {record['seconds']:.2f} s (profiling overhead included)")
+    st.dataframe(pd.DataFrame(record["stages"]).set_index("stage").round(2), width='stretch')
+    st.markdown("**Top allocators since rerun start**")
+    if record["top_allocators"]:
+        st.dataframe(pd.DataFrame(record["top_allocators"]).set_index("location").round(1), width='stretch')
+    if len(history) > 1:
+        st.line_chart(pd.DataFrame(list(history)), height=160)
+
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 def main():
+    profiler = MemoryProfiler()
+    apply_page_style()
+    
+    profiler.checkpoint("page setup")
+    
     # Hero Section
     st.markdown("""
     <div class="hero-section">
@@ -735,47 +3891,21 @@ def main():
         st.markdown("### 🎬 Preset Scenarios")
         scenario = st.selectbox(
             "Select Scenario",
-            ["Custom", "Miller's Planet (Interstellar)", "Sagittarius A*", "M87*", "Stellar Black Hole", "Maximum Spin Test"]
+            list(PRESET_SCENARIOS)
         )
         
         # Apply presets
-        if scenario == "Miller's Planet (Interstellar)":
-            default_mass = 100.0
-            default_dist = 3.5
-            default_spin = 0.998
-            default_vel = 0.0
-        elif scenario == "Sagittarius A*":
-            default_mass = 4.3
-            default_dist = 8.0
-            default_spin = 0.5
-            default_vel = 0.0
-        elif scenario == "M87*":
-            default_mass = 6500.0
-            default_dist = 10.0
-            default_spin = 0.9
-            default_vel = 0.0
-        elif scenario == "Stellar Black Hole":
-            default_mass = 0.01
-            default_dist = 5.0
-            default_spin = 0.7
-            default_vel = 0.0
-        elif scenario == "Maximum Spin Test":
-            default_mass = 100.0
-            default_dist = 2.0
-            default_spin = 0.998
-            default_vel = 0.0
-        else:
-            default_mass = 100.0
-            default_dist = 3.0
-            default_spin = 0.0
-            default_vel = 0.0
+        preset = PRESET_SCENARIOS[scenario]
+        default_mass = preset["mass"]
+        default_dist = preset["distance_log"]
+        default_spin = preset["spin"]
+        default_vel = preset["velocity"]
         
         st.markdown("### 🌌 Primary Controls")
         
         mass = st.slider(
             "Black Hole Mass (×10⁶ M☉)",
-            min_value=0.001,
-            max_value=10000.0,
+            *INPUT_RANGES["mass"],
             value=default_mass,
             step=0.1,
             help="Mass of the black hole in millions of solar masses"
@@ -783,8 +3913,7 @@ def main():
         
         distance_log = st.slider(
             "Distance Offset (log₁₀ meters)",
-            min_value=-5.0,
-            max_value=10.0,
+            *INPUT_RANGES["distance_log"],
             value=default_dist,
             step=0.01,
             help="Distance from event horizon on logarithmic scale"
@@ -794,528 +3923,102 @@ def main():
         
         spin = st.slider(
             "Spin Parameter (a/M)",
-            min_value=0.0,
-            max_value=0.998,
+            *INPUT_RANGES["spin"],
             value=default_spin,
             step=0.001,
             help="0 = Schwarzschild (non-rotating), 0.998 = near-extremal Kerr"
         )
         
+        observer = st.selectbox(
+            "Observer Type",
+            list(OBSERVER_TYPES),
+            format_func=OBSERVER_TYPES.get,
+            help="Whose clock the time dilation refers to. Circular orbits are equatorial "
+                 "geodesics at the current radius; their velocity follows from the orbit."
+        )
+        
         velocity = st.slider(
             "Observer Velocity (fraction of c)",
-            min_value=0.0,
-            max_value=0.99,
+            *INPUT_RANGES["velocity"],
             value=default_vel,
             step=0.001,
-            help="Velocity as fraction of speed of light"
+            disabled=observer in ORBITING_OBSERVERS,
+            help="Velocity as fraction of speed of light (relative to the static or ZAMO frame)"
         )
         
         theta = st.slider(
             "Polar Angle θ (radians)",
-            min_value=0.0,
-            max_value=np.pi,
+            *INPUT_RANGES["theta"],
             value=np.pi/2,
             step=0.01,
             help="Angle from rotation axis (π/2 = equatorial plane)"
         )
         
-        st.markdown("---")
-        st.markdown("### 📊 Export Options")
+        st.markdown("### ⚙️ Compute")
         
-        if st.button("📥 Export Data as CSV"):
-            calc = RelativisticCalculator(mass, distance_log, spin, velocity, theta)
-            data = {
-                "Parameter": ["Mass (×10⁶ M☉)", "Distance (Rs)", "Spin", "Velocity (c)", 
-                             "Time Dilation", "Escape Velocity", "Orbital Velocity",
-                             "Tidal Force", "Hawking Temp"],
-                "Value": [mass, calc.r/calc.Rs, spin, velocity,
-                         1/calc.total_dilation if calc.total_dilation > 0 else float('inf'),
-                         calc.escape_velocity, calc.orbital_velocity,
-                         calc.tidal_force, calc.hawking_temp]
-            }
-            df = pd.DataFrame(data)
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"spacetime_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
-    
-    # Calculate physics
-    calc = RelativisticCalculator(mass, distance_log, spin, velocity, theta)
-    
-    # Main content tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📊 Dashboard", "🔬 Physics Analysis", "📈 Visualizations", 
-        "🧮 Advanced Metrics", "📚 Education"
-    ])
-    
-    with tab1:
-        # Time displacement highlight
-        hour_on_planet = 3600
-        if calc.total_dilation > 0:
-            earth_seconds = hour_on_planet / calc.total_dilation
-            earth_time_str = format_time_elapsed(earth_seconds)
-            
-            st.markdown(f"""
-            <div class="highlight-box">
-                <div style="font-size: 1.5rem; color: #ffcc00; font-weight: 700;">
-                    ⏱️ TEMPORAL DISPLACEMENT CALCULATION
-                </div>
-                <div style="margin: 1rem 0; color: white; font-size: 1.2rem;">
-                    For every <span style="color: #00ffcc; font-weight: 900;">1 HOUR</span> experienced by the observer:
-                </div>
-                <div class="highlight-value">
-                    {earth_time_str}
-                </div>
-                <div style="color: #ffcc00; font-size: 1.2rem; margin-top: 0.5rem;">
-                    passes on Earth
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.error("⚠️ SINGULARITY REACHED: Inside event horizon - time dilation is infinite!")
-        
-        # Key metrics grid
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "Time Dilation Factor",
-                f"{1/calc.total_dilation:,.2f}×" if calc.total_dilation > 0 else "∞",
-                delta="Gravitational + Kinematic"
-            )
-        
-        with col2:
-            st.metric(
-                "Distance from Center",
-                f"{calc.r/calc.Rs:.6f} Rs",
-                delta=f"{(calc.r-calc.Rs)/1e3:.2f} km from horizon"
-            )
-        
-        with col3:
-            st.metric(
-                "Escape Velocity",
-                f"{calc.escape_velocity:.6f} c",
-                delta=f"{calc.escape_velocity*C/1e3:.0f} km/s"
-            )
-        
-        with col4:
-            st.metric(
-                "Tidal Gradient",
-                f"{calc.tidal_force:.2e} m/s²/m",
-                delta="Spaghettification"
-            )
-        
-        # Danger warning
-        spaghettification = calc.tidal_force * 2  # 2m human
-        if spaghettification > 100:
-            st.markdown(f"""
-            <div class="warning-box">
-                <div class="warning-box-title">⚠️ EXTREME DANGER ZONE</div>
-                <p style="color: #ff6666; font-size: 1.1rem;">
-                    Tidal forces exceed survivable limits! Structural integrity of any object would be compromised.
-                    A 2-meter tall human would experience <strong>{spaghettification:.2e} m/s²</strong> differential force.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Black hole parameters
-        st.markdown("### 🌌 Black Hole Parameters")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-card-title">Total Mass</div>
-                <div class="metric-card-value">{calc.M:.3e} kg</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-card-title">Schwarzschild Radius</div>
-                <div class="metric-card-value">{calc.Rs/1e6:.4f} million km</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-card-title">ISCO Radius</div>
-                <div class="metric-card-value">{calc.r_isco/1e6:.4f} million km</div>
-            </div>
-            """, unsafe_allow_html=True)
+        backend = st.selectbox(
+            "Compute Backend",
+            list(BACKENDS),
+            index=list(BACKENDS).index(DEFAULT_BACKEND),
+            help=f"How large grids (uncertainty samples, sensitivity maps) are evaluated. "
+                 f"'threaded' splits them across {BACKEND_THREADS} worker threads; 'numexpr' "
+                 f"also fuses the Kerr observer kernels. Default set by SPACETIME_BACKEND."
+        )
         
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-card-title">Photon Sphere</div>
-                <div class="metric-card-value">{calc.r_photon/1e6:.4f} million km</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-card-title">Hawking Temperature</div>
-                <div class="metric-card-value">{calc.hawking_temp:.3e} K</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-card-title">Spin Parameter</div>
-                <div class="metric-card-value">{spin:.3f}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    profiler.checkpoint("sidebar controls")
     
-    with tab2:
-        st.markdown("## ⚡ Relativistic Effects Analysis")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Gravitational Dilation", 
-                     f"{1/calc.gravitational_dilation:,.4f}×" if calc.gravitational_dilation > 0 else "∞")
-            st.metric("Kerr Time Dilation",
-                     f"{1/calc.kerr_time_dilation:,.4f}×" if calc.kerr_time_dilation > 0 else "∞")
-            st.metric("Kinematic Dilation (SR)",
-                     f"{1/calc.doppler_shift:,.4f}×")
-        
-        with col2:
-            st.metric("Gravitational Redshift (z)",
-                     f"{calc.gravitational_redshift:.6f}" if calc.gravitational_redshift != float('inf') else "∞")
-            st.metric("Frame Dragging (ω)",
-                     f"{calc.frame_dragging:.3e} rad/s")
-            st.metric("Geodesic Precession",
-                     f"{np.degrees(calc.geodesic_precession):.6f}°/orbit")
-        
-        with col3:
-            st.metric("Kretschmann Scalar",
-                     f"{calc.kretschmann_scalar:.3e} m⁻⁴")
-            st.metric("Bekenstein Entropy",
-                     f"{calc.bekenstein_hawking_entropy:.3e} J/K")
-            st.metric("Hawking Luminosity",
-                     f"{calc.luminosity:.3e} W")
-        
-        st.markdown("---")
-        st.markdown("## 🚀 Orbital Mechanics")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            orbital_period = 2 * np.pi * calc.r / (calc.orbital_velocity * C) if calc.orbital_velocity > 0 else 0
-            orbital_freq = calc.calc_orbital_frequency()
-            
-            st.metric("Circular Orbital Velocity",
-                     f"{calc.orbital_velocity:.6f} c",
-                     delta=f"{calc.orbital_velocity*C:,.0f} m/s")
-            st.metric("Orbital Period",
-                     f"{orbital_period/3600:.3f} hours" if orbital_period > 0 else "N/A")
-            st.metric("Orbital Frequency",
-                     f"{orbital_freq:.6e} Hz" if orbital_freq > 0 else "N/A")
-        
-        with col2:
-            spec_ang_mom = calc.calc_specific_angular_momentum()
-            
-            st.metric("Specific Angular Momentum",
-                     f"{spec_ang_mom:.3e} m²/s")
-            
-            if spin > 0:
-                penrose_eff = calc.calc_energy_extraction_efficiency()
-                st.metric("Penrose Process Efficiency",
-                         f"{penrose_eff:.2f}%",
-                         delta="Energy extraction from rotation")
-            
-            st.metric("Distance to ISCO",
-                     f"{abs(calc.r - calc.r_isco)/1e3:.2f} km",
-                     delta="Stable orbit boundary")
-        
-        st.markdown("---")
-        st.markdown("## 💀 Tidal Forces & Structural Stress")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.metric("Tidal Gradient",
-                     f"{calc.tidal_force:.3e} m/s²/m")
-            st.metric("Spaghettification Force (2m object)",
-                     f"{spaghettification:.3e} m/s²",
-                     delta=f"{spaghettification/9.81:,.0f} g")
-        
-        with col2:
-            # Calculate stretch for different objects
-            stretch_1m = calc.tidal_force * 1
-            stretch_10m = calc.tidal_force * 10
-            
-            st.metric("Tidal Force (1m separation)",
-                     f"{stretch_1m:.3e} m/s²")
-            st.metric("Tidal Force (10m separation)",
-                     f"{stretch_10m:.3e} m/s²")
-    
-    with tab3:
-        st.markdown("## 📊 Scientific Visualizations")
-        
-        # Matplotlib visualization
-        with st.spinner("Generating matplotlib visualizations..."):
-            fig_mpl = create_matplotlib_visualization(calc)
-            st.pyplot(fig_mpl)
-            plt.close()
-        
-        st.markdown("---")
-        
-        # 3D Plotly visualization
-        st.markdown("### 🌐 Interactive 3D Spacetime Curvature")
-        with st.spinner("Generating 3D visualization..."):
-            fig_3d = create_plotly_3d_visualization(calc)
-            st.plotly_chart(fig_3d, width='stretch')
-        
-        # Additional Plotly charts
-        st.markdown("---")
-        st.markdown("### 📈 Interactive Analysis Plots")
-        
-        # Time dilation vs distance
-        r_range = np.linspace(calc.Rs * 1.01, calc.Rs * 50, 1000)
-        dilation_vals = []
-        for r in r_range:
-            if r > calc.Rs:
-                dilation_vals.append(1 / np.sqrt(1 - calc.Rs / r))
-            else:
-                dilation_vals.append(np.nan)
-        
-        fig_dilation = go.Figure()
-        fig_dilation.add_trace(go.Scatter(
-            x=r_range/calc.Rs,
-            y=dilation_vals,
-            mode='lines',
-            name='Time Dilation',
-            line=dict(color='#00ffcc', width=3)
-        ))
-        fig_dilation.add_vline(x=calc.r/calc.Rs, line_dash="dash", line_color="#ff3366",
-                              annotation_text="Current Position")
-        fig_dilation.update_layout(
-            title="Time Dilation vs Distance",
-            xaxis_title="Distance (Schwarzschild Radii)",
-            yaxis_title="Time Dilation Factor",
-            yaxis_type="log",
-            paper_bgcolor='#0e1117',
-            plot_bgcolor='#1a1c24',
-            font=dict(color='#00ffcc'),
-            xaxis=dict(gridcolor='#333'),
-            yaxis=dict(gridcolor='#333')
-        )
-        st.plotly_chart(fig_dilation, width='stretch')
+    # Calculate physics (presets are served from the pinned cache)
+    bundle = get_preset_bundle(scenario, mass, distance_log, spin, velocity, theta, observer)
+    if bundle:
+        calc = bundle["calc"]
+    else:
+        calc = get_session_calculator(mass, distance_log, spin, velocity, theta, observer)
+    params = {"mass": mass, "distance_log": distance_log, "spin": spin,
+              "velocity": velocity, "theta": theta, "observer": observer, "backend": backend}
     
-    with tab4:
-        st.markdown("## 🧮 Advanced Metrics & Calculations")
-        
-        # Comprehensive data table
-        data = {
-            "Metric": [
-                "Black Hole Mass",
-                "Schwarzschild Radius",
-                "ISCO Radius",
-                "Photon Sphere Radius",
-                "Ergosphere Radius (θ=π/2)",
-                "Observer Distance",
-                "Distance in Rs",
-                "Proximity to Horizon",
-                "Gravitational Time Dilation",
-                "Kerr Time Dilation",
-                "Total Time Dilation",
-                "Gravitational Redshift",
-                "Frame Dragging Frequency",
-                "Geodesic Precession",
-                "Escape Velocity",
-                "Orbital Velocity",
-                "Orbital Period",
-                "Orbital Frequency",
-                "Tidal Gradient",
-                "Kretschmann Scalar",
-                "Hawking Temperature",
-                "Bekenstein-Hawking Entropy",
-                "Hawking Luminosity",
-                "Specific Angular Momentum"
-            ],
-            "Value": [
-                f"{calc.M:.6e} kg",
-                f"{calc.Rs:.6e} m",
-                f"{calc.r_isco:.6e} m",
-                f"{calc.r_photon:.6e} m",
-                f"{calc.r_ergosphere:.6e} m",
-                f"{calc.r:.6e} m",
-                f"{calc.r/calc.Rs:.8f}",
-                f"{(calc.r-calc.Rs):.6e} m",
-                f"{1/calc.gravitational_dilation:.6e}×" if calc.gravitational_dilation > 0 else "∞",
-                f"{1/calc.kerr_time_dilation:.6e}×" if calc.kerr_time_dilation > 0 else "∞",
-                f"{1/calc.total_dilation:.6e}×" if calc.total_dilation > 0 else "∞",
-                f"{calc.gravitational_redshift:.6e}" if calc.gravitational_redshift != float('inf') else "∞",
-                f"{calc.frame_dragging:.6e} rad/s",
-                f"{calc.geodesic_precession:.6e} rad/orbit",
-                f"{calc.escape_velocity:.8f} c",
-                f"{calc.orbital_velocity:.8f} c",
-                f"{2*np.pi*calc.r/(calc.orbital_velocity*C):.6e} s" if calc.orbital_velocity > 0 else "N/A",
-                f"{calc.calc_orbital_frequency():.6e} Hz",
-                f"{calc.tidal_force:.6e} m/s²/m",
-                f"{calc.kretschmann_scalar:.6e} m⁻⁴",
-                f"{calc.hawking_temp:.6e} K",
-                f"{calc.bekenstein_hawking_entropy:.6e} J/K",
-                f"{calc.luminosity:.6e} W",
-                f"{calc.calc_specific_angular_momentum():.6e} m²/s"
-            ],
-            "Unit": [
-                "kg", "m", "m", "m", "m", "m", "Rs", "m",
-                "dimensionless", "dimensionless", "dimensionless",
-                "dimensionless", "rad/s", "rad/orbit", "c", "c",
-                "s", "Hz", "m/s²/m", "m⁻⁴", "K", "J/K", "W", "m²/s"
-            ]
-        }
-        
-        df = pd.DataFrame(data)
-        st.dataframe(df, width='stretch', height=800)
-        
-        # Additional calculations
-        st.markdown("---")
-        st.markdown("### 🔬 Specialized Calculations")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Coordinate Time Differential")
-            if calc.total_dilation > 0:
-                coord_diff = (hour_on_planet / calc.total_dilation) - hour_on_planet
-                st.write(f"**{coord_diff/86400:.6f}** days")
-                st.write(f"**{coord_diff:,.2f}** seconds")
-            else:
-                st.write("Infinite (inside horizon)")
-            
-            st.markdown("#### Proximity in Planck Lengths")
-            planck_distance = (calc.r - calc.Rs) / PLANCK_LENGTH
-            st.write(f"**{planck_distance:.3e}** ℓₚ")
-            
-            st.markdown("#### Gravitational Binding Energy")
-            binding = -G * calc.M / calc.r
-            st.write(f"**{binding:.3e}** J/kg")
-        
-        with col2:
-            if spin > 0:
-                st.markdown("#### Penrose Process Analysis")
-                penrose_eff = calc.calc_energy_extraction_efficiency()
-                max_energy = calc.M * C**2 * penrose_eff / 100
-                st.write(f"**Efficiency:** {penrose_eff:.3f}%")
-                st.write(f"**Max Extractable Energy:** {max_energy:.3e} J")
-                st.write(f"**Equivalent Mass:** {max_energy/C**2:.3e} kg")
-            
-            st.markdown("#### Schwarzschild Radius Ratios")
-            st.write(f"**r/Rs:** {calc.r/calc.Rs:.6f}")
-            st.write(f"**r_ISCO/Rs:** {calc.r_isco/calc.Rs:.6f}")
-            st.write(f"**r_photon/Rs:** {calc.r_photon/calc.Rs:.6f}")
-    
-    with tab5:
-        st.markdown("## 📚 Educational Resources")
-        
-        st.markdown("""
-        ### 🧮 The Science Behind the Simulator
-        
-        This simulator is based on rigorous calculations from Einstein's **General Theory of Relativity** 
-        and the **Kerr Metric** for rotating black holes.
-        """)
-        
-        # Expanders for educational content
-        with st.expander("📐 Einstein Field Equations"):
-            st.markdown("""
-            The foundation of General Relativity:
-            
-            $$R_{\\mu\\nu} - \\frac{1}{2}g_{\\mu\\nu}R + \\Lambda g_{\\mu\\nu} = \\frac{8\\pi G}{c^4}T_{\\mu\\nu}$$
-            
-            Where:
-            - $R_{\\mu\\nu}$ is the Ricci curvature tensor
-            - $g_{\\mu\\nu}$ is the metric tensor
-            - $R$ is the Ricci scalar
-            - $\\Lambda$ is the cosmological constant
-            - $T_{\\mu\\nu}$ is the stress-energy tensor
-            """)
-        
-        with st.expander("🌀 Schwarzschild Metric"):
-            st.markdown("""
-            For non-rotating black holes:
-            
-            $$ds^2 = -\\left(1 - \\frac{R_s}{r}\\right)c^2dt^2 + \\left(1 - \\frac{R_s}{r}\\right)^{-1}dr^2 + r^2d\\Omega^2$$
-            
-            Schwarzschild radius:
-            
-            $$R_s = \\frac{2GM}{c^2}$$
-            
-            Time dilation factor:
-            
-            $$\\frac{t_{observer}}{t_{Earth}} = \\sqrt{1 - \\frac{R_s}{r}}$$
-            """)
-        
-        with st.expander("⚫ Kerr Metric (Rotating Black Holes)"):
-            st.markdown("""
-            Much more complex! For rotating black holes:
-            
-            $$ds^2 = -\\left(1 - \\frac{R_s r}{\\Sigma^2}\\right)c^2dt^2 - \\frac{R_s r}{\\Sigma^2}a\\sin^2\\theta \\ c \\ dt \\ d\\phi$$
-            $$+ \\frac{\\Sigma^2}{\\Delta}dr^2 + \\Sigma^2 d\\theta^2 + \\frac{\\sin^2\\theta}{\\Sigma^2}[(r^2+a^2)^2 - \\Delta a^2\\sin^2\\theta]d\\phi^2$$
-            
-            Where:
-            - $\\Sigma^2 = r^2 + a^2\\cos^2\\theta$
-            - $\\Delta = r^2 - R_s r + a^2$
-            - $a = J/(Mc)$ is the spin parameter
-            """)
-        
-        with st.expander("💫 Key Physical Concepts"):
-            st.markdown("""
-            **Event Horizon:** Point of no return
-            $$r_{horizon} = R_s = \\frac{2GM}{c^2}$$
-            
-            **ISCO (Innermost Stable Circular Orbit):**
-            - Non-rotating: $r_{ISCO} = 3R_s$
-            - Maximally rotating (prograde): $r_{ISCO} ≈ R_s$
-            
-            **Photon Sphere:** Where light orbits
-            $$r_{photon} = 1.5R_s$$
-            
-            **Frame Dragging:** Spacetime rotation
-            $$\\omega = \\frac{2aGM}{cr^3}$$
-            
-            **Hawking Temperature:**
-            $$T_H = \\frac{\\hbar c^3}{8\\pi k_B GM}$$
-            
-            **Bekenstein-Hawking Entropy:**
-            $$S = \\frac{k_B c^3 A}{4G\\hbar}$$
-            """)
-        
-        with st.expander("🎬 Real-World Black Holes"):
-            st.markdown("""
-            ### Famous Black Holes:
-            
-            **Sagittarius A*** (Milky Way Center)
-            - Mass: ~4.3 million M☉
-            - Schwarzschild Radius: ~12.7 million km
-            - Distance from Earth: ~26,000 light-years
-            
-            **M87*** (First Photographed)
-            - Mass: ~6.5 billion M☉
-            - Schwarzschild Radius: ~19 billion km
-            - Distance from Earth: ~55 million light-years
-            
-            **Gargantua** (Interstellar Movie)
-            - Mass: ~100 million M☉
-            - Near-maximal spin: a ≈ 0.998
-            - Time dilation: ~61,000× near horizon
-            """)
-        
+    profiler.checkpoint("calculator")
+    
+    with st.sidebar:
         st.markdown("---")
-        st.markdown("""
-        ### 📖 References
-        
-        1. Misner, C. W., Thorne, K. S., & Wheeler, J. A. (1973). *Gravitation*
-        2. Carroll, S. M. (2004). *Spacetime and Geometry: An Introduction to General Relativity*
-        3. Thorne, K. S. (2014). *The Science of Interstellar*
-        4. Chandrasekhar, S. (1983). *The Mathematical Theory of Black Holes*
-        """)
+        st.markdown("### 📊 Export Options")
+        render_export_panel(calc, params)
+    profiler.checkpoint("export panel")
+    
+    # Main content tabs. Only the selected tab runs: a sidebar change
+    # recomputes one tab instead of all six, and switching tabs reruns the
+    # script to fill the newly opened one.
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(MAIN_TABS, key="main_tab", on_change="rerun")
+    keep_closed_tab_state(st.session_state["main_tab"])
+    
+    if tab1.open:
+        with tab1:
+            render_dashboard_tab(calc, params)
+            profiler.checkpoint("dashboard")
+    
+    if tab2.open:
+        with tab2:
+            render_physics_tab(calc, params)
+            profiler.checkpoint("physics")
+    
+    if tab3.open:
+        with tab3:
+            render_visualizations_tab(calc, params, bundle)
+            profiler.checkpoint("visualizations")
+    
+    if tab4.open:
+        with tab4:
+            render_advanced_metrics_tab(calc, params, bundle)
+            profiler.checkpoint("advanced metrics")
+    
+    if tab5.open:
+        with tab5:
+            render_gravitational_waves_tab(calc, params)
+            profiler.checkpoint("gravitational waves")
+    
+    if tab6.open:
+        with tab6:
+            render_education_tab()
+            profiler.checkpoint("education")
     
     # Footer
     st.markdown("---")
@@ -1330,6 +4033,13 @@ def main():
         </p>
     </div>
     """, unsafe_allow_html=True)
+    
+    record = profiler.finish()
+    if record:
+        with st.sidebar:
+            st.markdown("---")
+            st.markdown("### 🧠 Memory Profile")
+            render_memory_panel(record)
 
 if __name__ == "__main__":
     main()
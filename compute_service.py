@@ -0,0 +1,265 @@
+"""
+Local HTTP/JSON compute service for RelativisticCalculator
+
+Concurrent requests are coalesced into micro-batches and evaluated in a
+single vectorized calculator pass.
+
+    python compute_service.py --port 8765 --max-batch-size 2048 --max-wait-ms 2
+
+Endpoints:
+    POST /calculate   {"mass": 100, "distance_log": 3.5, "spin": 0.998, "velocity": 0, "theta": 1.5708}
+    POST /batch       {"points": [{"mass": 4.3, "distance_log": 8}, ...]}
+    GET  /metrics     batch statistics and per-endpoint latency percentiles
+    GET  /health
+
+Only mass and distance_log are required; spin, velocity and theta default
+to 0, 0 and π/2 like the app, and observer_type ("static", "zamo",
+"prograde" or "retrograde") to "static". Inputs must be numbers within
+the app's slider ranges (400 otherwise); non-finite results (e.g.
+redshift at the horizon) are returned as null.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from InTeRsTelLaR import INPUT_RANGES, OBSERVER_TYPES, RelativisticCalculator
+
+INPUT_DEFAULTS = {"mass": None, "distance_log": None, "spin": 0.0, "velocity": 0.0, "theta": np.pi/2}
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+NOT_FOUND_ROUTE = "(not found)"  # one latency key for every unknown path
+
+
+def parse_input(name, value):
+    """One numeric input as a float within its slider range (ValueError otherwise)"""
+    if value is None:
+        raise ValueError(f"missing required input: {name}")
+    try:
+        number = float(value)
+    except OverflowError:
+        raise ValueError(f"{name} is out of range") from None
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number") from None
+    if not np.isfinite(number):
+        raise ValueError(f"{name} must be finite")
+    low, high = INPUT_RANGES[name]
+    if not low <= number <= high:
+        raise ValueError(f"{name} must be between {low:g} and {high:g}")
+    return number
+
+
+def parse_observer_type(value):
+    """Observer type name (ValueError if unknown)"""
+    if value not in OBSERVER_TYPES:
+        raise ValueError(f"observer_type must be one of: {', '.join(OBSERVER_TYPES)}")
+    return value
+
+
+def evaluate_points(points):
+    """Evaluate a list of input dicts in one vectorized calculator pass"""
+    if not points:
+        return []
+    columns = {}
+    for name, default in INPUT_DEFAULTS.items():
+        columns[name] = np.array([parse_input(name, point.get(name, default)) for point in points])
+    observer_type = np.asarray([parse_observer_type(point.get("observer_type", "static")) for point in points])
+    calc = RelativisticCalculator(columns["mass"], columns["distance_log"], columns["spin"],
+                                  columns["velocity"], columns["theta"], observer_type)
+    outputs = {name: np.broadcast_to(value, (len(points),))
+               for name, value in calc.evaluate().items()}
+    return [{name: (float(value[i]) if np.isfinite(value[i]) else None) for name, value in outputs.items()}
+            for i in range(len(points))]
+
+
+class LatencyRecorder:
+    """Rolling per-endpoint latency window"""
+    def __init__(self, window=10000):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, endpoint, seconds):
+        self.samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def summary(self):
+        report = {}
+        for endpoint, samples in self.samples.items():
+            ms = np.asarray(samples) * 1e3
+            report[endpoint] = {
+                "requests": self.counts[endpoint],
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p90_ms": float(np.percentile(ms, 90)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "max_ms": float(ms.max()),
+            }
+        return report
+
+
+class MicroBatcher:
+    """Coalesce concurrent submissions into one evaluation
+
+    A batch closes when it reaches max_batch_size points or max_wait seconds
+    after its first submission, whichever comes first.
+    """
+    def __init__(self, max_batch_size=2048, max_wait=0.002):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.points = 0
+        self.largest_batch = 0
+
+    async def submit(self, points):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((points, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            points = [point for item_points, _ in pending for point in item_points]
+            try:
+                results = await loop.run_in_executor(None, evaluate_points, points)
+            except Exception:
+                # One bad submission must not fail the rest of the batch (or stop this loop)
+                for item_points, future in pending:
+                    try:
+                        future.set_result(await loop.run_in_executor(None, evaluate_points, item_points))
+                    except Exception as exc:
+                        future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.points += len(points)
+            self.largest_batch = max(self.largest_batch, len(points))
+            offset = 0
+            for item_points, future in pending:
+                future.set_result(results[offset:offset + len(item_points)])
+                offset += len(item_points)
+
+    def summary(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1e3,
+            "batches": self.batches,
+            "points": self.points,
+            "mean_batch_size": self.points / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
+
+
+class ComputeService:
+    """Minimal HTTP/1.1 (keep-alive) JSON server on asyncio streams"""
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.latency = LatencyRecorder()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                route = path.split("?", 1)[0]
+                started = time.perf_counter()
+                status, payload = await self.dispatch(method, route, body)
+                self.latency.record(route if status != 404 else NOT_FOUND_ROUTE, time.perf_counter() - started)
+
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, {"batching": self.batcher.summary(), "latency": self.latency.summary()}
+        if path not in ("/calculate", "/batch"):
+            return 404, {"error": f"unknown endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            request = json.loads(body or b"{}")
+            points = request["points"] if path == "/batch" else [request]
+            if not isinstance(points, list) or not all(isinstance(p, dict) for p in points):
+                raise ValueError("points must be a list of objects")
+            results = await self.batcher.submit(points)
+        except (ValueError, TypeError, KeyError) as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+        return 200, results[0] if path == "/calculate" else {"results": results}
+
+
+async def serve(host, port, max_batch_size, max_wait_ms):
+    batcher = MicroBatcher(max_batch_size, max_wait_ms / 1e3)
+    service = ComputeService(batcher)
+    batch_task = asyncio.create_task(batcher.run())
+    server = await asyncio.start_server(service.handle_connection, host, port, backlog=1024)
+    print(f"Compute service listening on http://{host}:{port} "
+          f"(max batch {max_batch_size}, max wait {max_wait_ms} ms)")
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON service for RelativisticCalculator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=2048,
+                        help="points evaluated per vectorized pass")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0,
+                        help="how long a batch waits for more requests after the first")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Concurrent-session load test for the Streamlit app
+
+Drives InTeRsTelLaR.py headlessly through streamlit.testing.v1.AppTest.
+N sessions run concurrently in one process (sharing the app's caches, as
+a real server process does) and replay interaction traces: sidebar slider
+drags, scenario switches and panel-local widgets. Every rerun is timed.
+
+    python load_test.py --sessions 8 --steps 30
+    python load_test.py --sessions 16 --traces loadtest/traces/default.json
+
+Traces are saved to loadtest/traces/ (replay them with --traces to
+compare releases on identical workloads). Results are written as JSON to
+loadtest/results/, stamped with the time and git revision.
+"""
+import argparse
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from InTeRsTelLaR import PRESET_SCENARIOS, current_rss
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "InTeRsTelLaR.py")
+LOADTEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest")
+
+# label: (low, high, typical drag step) for widgets a user actually moves
+SIDEBAR_SLIDERS = {
+    "Black Hole Mass (×10⁶ M☉)": (0.001, 10000.0, 25.0),
+    "Distance Offset (log₁₀ meters)": (-5.0, 10.0, 0.25),
+    "Spin Parameter (a/M)": (0.0, 0.998, 0.05),
+    "Observer Velocity (fraction of c)": (0.0, 0.99, 0.05),
+    "Polar Angle θ (radians)": (0.0, np.pi, 0.1),
+}
+PANEL_SLIDERS = {
+    "Accretion Rate (fraction of Eddington)": (0.01, 1.0, 0.05),
+    "Disk Inclination (degrees)": (5.0, 85.0, 5.0),
+    "Field of View (× shadow radius)": (1.5, 20.0, 1.0),
+    "Start Radius (× ISCO)": (1.1, 10.0, 0.5),
+}
+SCENARIOS = list(PRESET_SCENARIOS)
+# Where the app puts each slider: the sidebar follows the selected scenario
+SCENARIO_SLIDERS = {
+    "Black Hole Mass (×10⁶ M☉)": "mass",
+    "Distance Offset (log₁₀ meters)": "distance_log",
+    "Spin Parameter (a/M)": "spin",
+    "Observer Velocity (fraction of c)": "velocity",
+}
+SLIDER_DEFAULTS = {
+    "Polar Angle θ (radians)": float(np.pi / 2),
+    "Accretion Rate (fraction of Eddington)": 0.1,
+    "Disk Inclination (degrees)": 30.0,
+    "Field of View (× shadow radius)": 4.0,
+    "Start Radius (× ISCO)": 3.0,
+}
+SLIDER_STEPS = {
+    "Black Hole Mass (×10⁶ M☉)": 0.1,
+    "Distance Offset (log₁₀ meters)": 0.01,
+    "Spin Parameter (a/M)": 0.001,
+    "Observer Velocity (fraction of c)": 0.001,
+    "Polar Angle θ (radians)": 0.01,
+}
+
+
+def generate_trace(rng, n_steps, name):
+    """A realistic session: mostly small slider drags, some scenario switches
+    
+    Sliders start where a fresh session has them, and a scenario switch
+    moves the sidebar sliders to that scenario's values, as in the app.
+    """
+    position = dict(SLIDER_DEFAULTS)
+    position.update({label: PRESET_SCENARIOS["Custom"][key] for label, key in SCENARIO_SLIDERS.items()})
+    steps = []
+    for _ in range(n_steps):
+        roll = rng.random()
+        if roll < 0.1:
+            scenario = str(rng.choice(SCENARIOS))
+            position.update({label: PRESET_SCENARIOS[scenario][key] for label, key in SCENARIO_SLIDERS.items()})
+            steps.append({"widget": "selectbox", "label": "Select Scenario", "value": scenario})
+            continue
+        sliders = SIDEBAR_SLIDERS if roll < 0.75 else PANEL_SLIDERS
+        label = str(rng.choice(list(sliders)))
+        low, high, drag = sliders[label]
+        value = float(np.clip(position[label] + rng.normal(0, drag), low, high))
+        resolution = SLIDER_STEPS.get(label, 0.01)
+        value = round(round(value / resolution) * resolution, 6)
+        position[label] = value
+        steps.append({"widget": "slider", "label": label, "value": value})
+    return {"name": name, "steps": steps}
+
+
+def find_widget(app, kind, label):
+    for container in (app.sidebar, app):
+        for widget in getattr(container, kind):
+            if widget.label == label:
+                return widget
+    raise LookupError(f"{kind} {label!r} not found")
+
+
+def run_session(trace, timeout):
+    """Replay one trace; returns per-rerun latencies (seconds) and errors"""
+    latencies, errors = [], []
+    started = time.perf_counter()
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    first_load = time.perf_counter() - started
+    for step in trace["steps"]:
+        try:
+            widget = find_widget(app, step["widget"], step["label"])
+            if step["widget"] == "selectbox":
+                widget.select(step["value"])
+            else:
+                widget.set_value(max(min(step["value"], widget.max), widget.min))
+            started = time.perf_counter()
+            app.run()
+            latencies.append(time.perf_counter() - started)
+            errors.extend(str(exc.value) for exc in app.exception)
+        except Exception as exc:  # keep the session going; report the failure
+            errors.append(f"{step['label']}: {exc}")
+    return {"trace": trace["name"], "first_load": first_load, "latencies": latencies, "errors": errors}
+
+
+class RssSampler(threading.Thread):
+    """Samples resident memory to catch the peak during the run"""
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(APP_PATH), text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarize(sessions, wall_time, baseline_rss, peak_rss):
+    latencies = np.array([lat for session in sessions for lat in session["latencies"]])
+    first_loads = np.array([session["first_load"] for session in sessions])
+    percentiles = {f"p{p}_ms": float(np.percentile(latencies, p) * 1e3) for p in (50, 90, 95, 99)} if len(latencies) else {}
+    return {
+        "reruns": int(len(latencies)),
+        "errors": sum(len(session["errors"]) for session in sessions),
+        "throughput_reruns_per_s": len(latencies) / wall_time,
+        "rerun_latency": {**percentiles, "max_ms": float(latencies.max() * 1e3) if len(latencies) else 0.0},
+        "first_load_ms": {"p50": float(np.median(first_loads) * 1e3), "max": float(first_loads.max() * 1e3)},
+        "baseline_rss_mb": baseline_rss / 2**20,
+        "peak_rss_mb": peak_rss / 2**20,
+        "wall_time_s": wall_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit app")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--steps", type=int, default=30, help="interactions per generated trace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--traces", help="replay traces from this JSON file instead of generating")
+    parser.add_argument("--timeout", type=float, default=300, help="per-rerun timeout (s)")
+    parser.add_argument("--output-dir", default=LOADTEST_DIR)
+    args = parser.parse_args()
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if args.traces:
+        with open(args.traces, encoding="utf-8") as f:
+            traces = json.load(f)
+    else:
+        rng = np.random.default_rng(args.seed)
+        traces = [generate_trace(rng, args.steps, f"session-{i}") for i in range(args.sessions)]
+        os.makedirs(os.path.join(args.output_dir, "traces"), exist_ok=True)
+        with open(os.path.join(args.output_dir, "traces", f"{stamp}.json"), "w", encoding="utf-8") as f:
+            json.dump(traces, f, indent=1, ensure_ascii=False)
+    # Reuse traces round-robin if more sessions than traces were requested
+    traces = [traces[i % len(traces)] for i in range(args.sessions)]
+
+    baseline_rss = current_rss()
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        sessions = list(pool.map(lambda trace: run_session(trace, args.timeout), traces))
+    wall_time = time.perf_counter() - started
+    sampler.stopped.set()
+    sampler.join()
+
+    summary = summarize(sessions, wall_time, baseline_rss, max(sampler.peak, current_rss()))
+    result = {
+        "timestamp": stamp,
+        "git_revision": git_revision(),
+        "sessions": args.sessions,
+        "traces": args.traces or "generated",
+        "summary": summary,
+        "per_session": [{"trace": s["trace"], "first_load_s": s["first_load"],
+                         "latencies_s": s["latencies"], "errors": s["errors"]} for s in sessions],
+    }
+    os.makedirs(os.path.join(args.output_dir, "results"), exist_ok=True)
+    path = os.path.join(args.output_dir, "results", f"{stamp}_{args.sessions}sessions.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=1)
+
+    print(json.dumps(summary, indent=2))
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()